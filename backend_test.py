@@ -4,16 +4,25 @@ Backend API Testing for Next.js Portfolio Application
 Tests the PDF API endpoint functionality and root redirect
 """
 
+import argparse
+import random
+import threading
 import requests
+import http_client
+import proc_stats
+import server_metrics
+import server_timing
+from perf_stats import percentile
+from suite_report import SuiteReport, add_report_arguments, finish_report, positive_int
+from procedures import (LINEARIZATION_WINDOW, PROCEDURES_DIR, list_procedure_files, load_generated_manifest,
+                        manifest_entry_is_current, parse_linearization, procedure_manifest, procedure_path,
+                        verify_pdf_download)
 import json
 import sys
 import os
 import time
-from urllib.parse import urljoin
-
-# Configuration
-BASE_URL = "http://localhost:3000"
-API_BASE = f"{BASE_URL}/api"
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
 
 def test_root_redirect():
     """Test the root page redirect functionality"""
@@ -21,7 +30,7 @@ def test_root_redirect():
     
     try:
         # Test root redirect with allow_redirects=False to see the redirect response
-        response = requests.get(BASE_URL, allow_redirects=False, timeout=10)
+        response = http_client.get("/", allow_redirects=False)
         
         # Check if it's a proper server-side redirect (307 for Next.js)
         if response.status_code in [301, 302, 307, 308]:
@@ -30,7 +39,7 @@ def test_root_redirect():
             # Check if redirecting to /accueil
             if location.endswith('/accueil') or '/accueil' in location:
                 # Follow the redirect to ensure /accueil loads
-                final_response = requests.get(BASE_URL, allow_redirects=True, timeout=10)
+                final_response = http_client.get("/", allow_redirects=True, cached=True)
                 if final_response.status_code == 200 and '/accueil' in final_response.url:
                     print("  ✅ Server-side redirect working correctly")
                     return {
@@ -56,17 +65,8 @@ def test_pdf_api_endpoint():
     """Test the PDF API endpoint functionality"""
     print("🔍 Testing PDF API Endpoint...")
     
-    # Test files that should exist based on the directory listing
-    test_files = [
-        "VLAN_Interco.pdf",
-        "Zabbix.pdf", 
-        "Active_Directory.pdf",
-        "GLPI.pdf",
-        "Proxmox.pdf",
-        "GPO.pdf",
-        "MITM_Ettercap.pdf",
-        "MITM_DNS_Spoofing.pdf"
-    ]
+    # Every PDF of the asset manifest (public/procedures)
+    test_files = list(procedure_manifest())
     
     results = {
         "endpoint_accessible": False,
@@ -74,26 +74,45 @@ def test_pdf_api_endpoint():
         "total_files": len(test_files),
         "errors": [],
         "successful_files": [],
-        "failed_files": []
+        "failed_files": [],
+        "downloads": {}
     }
     
     for filename in test_files:
         try:
-            url = f"{API_BASE}/pdf/{filename}"
+            url = http_client.api_url(f"pdf/{filename}")
             print(f"  Testing: {url}")
             
-            response = requests.get(url, timeout=10)
+            # Streamed and hashed chunk by chunk, compared with the files on disk
+            download = verify_pdf_download(url, filename)
+            response = download["response"]
+            results["downloads"][filename] = {
+                key: download[key] for key in ("bytes", "sha256", "throughput_mbps", "chunk_throughput_mbps")
+            }
+            # Where the time went: route handler (Server-Timing) vs network/routing vs body transfer
+            split = server_timing.breakdown(download)
+            results["downloads"][filename]["timing"] = split
             
             if response.status_code == 200:
                 # Check if it's actually a PDF
                 content_type = response.headers.get('Content-Type', '')
-                if 'application/pdf' in content_type:
-                    results["files_served"] += 1
-                    results["successful_files"].append(filename)
-                    print(f"    ✅ {filename} - OK (PDF served correctly)")
-                else:
+                if 'application/pdf' not in content_type:
                     results["failed_files"].append(f"{filename} - Wrong content type: {content_type}")
                     print(f"    ❌ {filename} - Wrong content type: {content_type}")
+                elif not download["verified"]:
+                    problem = ("not a PDF (missing %PDF- header)" if not download["is_pdf"]
+                               else f"size mismatch ({download['bytes']} bytes)" if not download["size_matches"]
+                               else "SHA-256 mismatch with the file on disk")
+                    results["failed_files"].append(f"{filename} - {problem}")
+                    print(f"    ❌ {filename} - {problem}")
+                else:
+                    results["files_served"] += 1
+                    results["successful_files"].append(filename)
+                    throughput = download["throughput_mbps"]
+                    print(f"    ✅ {filename} - OK (PDF verified, {download['bytes']} bytes"
+                          f"{f', {throughput:.1f}MB/s' if throughput else ''})")
+                    if split:
+                        print(f"       {server_timing.describe(split)}")
             else:
                 results["failed_files"].append(f"{filename} - HTTP {response.status_code}")
                 print(f"    ❌ {filename} - HTTP {response.status_code}")
@@ -104,6 +123,170 @@ def test_pdf_api_endpoint():
     
     # Check if endpoint is accessible (at least one file worked)
     results["endpoint_accessible"] = results["files_served"] > 0
+    results["success"] = results["files_served"] >= 0.75 * results["total_files"]
+    
+    return results
+
+def test_pdf_manifest_in_sync():
+    """Test that the generated PDF manifest matches public/procedures"""
+    print("🔍 Testing PDF Manifest (public/procedures/manifest.json)...")
+    
+    generated = load_generated_manifest()
+    if generated is None:
+        print("  ⚠️  Manifest not generated, run `npm run manifest:pdfs` (done automatically before builds)")
+        return {"success": True, "skipped": True, "issues": []}
+    
+    on_disk = list_procedure_files()
+    issues = [f"{filename} - missing from the manifest" for filename in on_disk if filename not in generated]
+    issues += [f"{filename} - listed but not on disk" for filename in generated if filename not in on_disk]
+    
+    for filename in sorted(set(on_disk) & set(generated)):
+        entry = generated[filename]
+        if not manifest_entry_is_current(entry, os.stat(procedure_path(filename))):
+            issues.append(f"{filename} - stale entry (size/mtime changed since generation)")
+        elif not entry.get("pages"):
+            issues.append(f"{filename} - page count could not be determined")
+    
+    for issue in issues:
+        print(f"  ❌ {issue}")
+    if not issues:
+        print(f"  ✅ Manifest up to date ({len(generated)} files)")
+    
+    return {"success": not issues, "skipped": False, "files": len(generated), "issues": issues}
+
+def test_pdf_linearization():
+    """Test that served PDFs are linearized so viewers can render page 1 before the download ends"""
+    print("🔍 Testing PDF Linearization (fast web view)...")
+    
+    results = {"success": False, "linearized": 0, "files_tested": 0, "first_page_bytes": {}, "issues": []}
+    
+    for filename, entry in procedure_manifest().items():
+        results["files_tested"] += 1
+        try:
+            # The linearization dictionary is the first object of the file
+            response = http_client.get(
+                http_client.api_url(f"pdf/{filename}"),
+                headers={"Range": f"bytes=0-{LINEARIZATION_WINDOW - 1}", "Accept-Encoding": "identity"},
+            )
+        except requests.exceptions.RequestException as e:
+            results["issues"].append(f"{filename} - Connection error: {str(e)}")
+            continue
+        
+        linearization = parse_linearization(response.content) if response.status_code in (200, 206) else None
+        if linearization is None:
+            results["issues"].append(f"{filename} - not linearized (run optimize_pdfs.py --in-place)")
+            print(f"  ❌ {filename} - not linearized")
+        elif linearization["length"] != entry["size"]:
+            # Modified after linearization: viewers fall back to a full download
+            results["issues"].append(f"{filename} - linearization stale (/L {linearization['length']} != {entry['size']} bytes)")
+            print(f"  ❌ {filename} - linearization stale")
+        else:
+            results["linearized"] += 1
+            results["first_page_bytes"][filename] = linearization["first_page_end"]
+            print(f"  ✅ {filename} - page 1 after {linearization['first_page_end'] / 1024:.1f}KB "
+                  f"of {entry['size'] / 1024:.1f}KB")
+    
+    results["success"] = results["files_tested"] > 0 and results["linearized"] == results["files_tested"]
+    return results
+
+def benchmark_event_loop_under_pdf_storm(concurrency=20, duration=15.0, probe_interval=0.1):
+    """
+    Measure /accueil latency and server RSS while concurrent PDF downloads run.
+    
+    A blocking PDF route (readFileSync) stalls every other route of the Node
+    process; with streamed responses /accueil latency should stay close to idle.
+    """
+    print(f"\n🔍 Benchmarking /accueil latency during a PDF download storm ({concurrency} workers, {duration:.0f}s)...")
+    
+    port = urlparse(http_client.BASE_URL).port or 80
+    pid = proc_stats.find_server_pid(port)
+    if pid is None:
+        print(f"  ⚠️  Server process on port {port} not found, RSS will not be sampled (set SERVER_PID)")
+    
+    def probe_accueil(count):
+        latencies = []
+        errors = 0
+        for _ in range(count):
+            try:
+                fetched = http_client.fetch_timed("/accueil")
+                if fetched["response"].status_code == 200:
+                    latencies.append(fetched["total"])
+                else:
+                    errors += 1
+            except requests.exceptions.RequestException:
+                errors += 1
+            time.sleep(probe_interval)
+        return sorted(latencies), errors
+    
+    # Idle baseline
+    http_client.fetch_timed("/accueil")
+    idle_rss = proc_stats.read_rss_bytes(pid) if pid else None
+    idle_latencies, idle_errors = probe_accueil(20)
+    
+    # Storm: PDF downloads in the background, RSS sampled alongside the probes
+    filenames = list_procedure_files()
+    rss_samples = []
+    stop_sampling = threading.Event()
+    
+    def sample_rss():
+        while not stop_sampling.is_set():
+            rss = proc_stats.read_rss_bytes(pid) if pid else None
+            if rss:
+                rss_samples.append(rss)
+            stop_sampling.wait(0.25)
+    
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    deadline = time.monotonic() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(_load_worker, deadline, filenames, [1.0] * len(filenames), seed)
+            for seed in range(concurrency)
+        ]
+        storm_latencies = []
+        storm_errors = 0
+        while time.monotonic() < deadline:
+            latencies, errors = probe_accueil(1)
+            storm_latencies.extend(latencies)
+            storm_errors += errors
+        storm_samples = [future.result() for future in futures]
+    stop_sampling.set()
+    sampler.join()
+    storm_latencies.sort()
+    
+    pdf_requests = sum(len(samples) for samples, _ in storm_samples)
+    pdf_bytes = sum(size for samples, _ in storm_samples for _, _, size in samples)
+    
+    def summarize(latencies):
+        return {
+            "count": len(latencies),
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+    
+    results = {
+        "idle": summarize(idle_latencies),
+        "storm": summarize(storm_latencies),
+        "probe_errors": idle_errors + storm_errors,
+        "pdf_requests": pdf_requests,
+        "pdf_bytes": pdf_bytes,
+        "server_pid": pid,
+        "idle_rss_bytes": idle_rss,
+        "peak_rss_bytes": max(rss_samples) if rss_samples else None,
+    }
+    idle_p50 = results["idle"]["p50_ms"] or 1e-9
+    results["p50_slowdown"] = results["storm"]["p50_ms"] / idle_p50
+    
+    print(f"  PDF storm: {pdf_requests} downloads, {pdf_bytes / 1e6:.1f} MB")
+    for label in ("idle", "storm"):
+        stats = results[label]
+        print(f"  /accueil {label:<6} p50 {stats['p50_ms']:7.1f}ms  p95 {stats['p95_ms']:7.1f}ms  "
+              f"max {stats['max_ms']:7.1f}ms  ({stats['count']} probes)")
+    print(f"  /accueil p50 slowdown under storm: x{results['p50_slowdown']:.1f}")
+    if idle_rss and results["peak_rss_bytes"]:
+        print(f"  Server RSS: idle {idle_rss / 2**20:.0f} MB → peak {results['peak_rss_bytes'] / 2**20:.0f} MB "
+              f"(+{(results['peak_rss_bytes'] - idle_rss) / 2**20:.0f} MB)")
     
     return results
 
@@ -113,8 +296,7 @@ def test_pdf_api_error_handling():
     
     try:
         # Test with non-existent file
-        url = f"{API_BASE}/pdf/nonexistent.pdf"
-        response = requests.get(url, timeout=10)
+        response = http_client.get(http_client.api_url("pdf/nonexistent.pdf"))
         
         if response.status_code == 404:
             print("  ✅ 404 error handling working correctly")
@@ -127,12 +309,172 @@ def test_pdf_api_error_handling():
         print(f"  ❌ Connection error: {str(e)}")
         return False
 
+def test_pdf_range_requests():
+    """Test HTTP Range / partial content handling on every procedure PDF"""
+    print("\n🔍 Testing PDF API Range Requests...")
+    
+    results = {"success": True, "files_tested": 0, "failures": []}
+    
+    def check(condition, filename, message):
+        if not condition:
+            results["success"] = False
+            results["failures"].append(f"{filename} - {message}")
+            print(f"    ❌ {message}")
+        return condition
+    
+    for filename in list_procedure_files():
+        print(f"  Testing ranges: {filename}")
+        url = http_client.api_url(f"pdf/{filename}")
+        with open(os.path.join(PROCEDURES_DIR, filename), "rb") as f:
+            local = f.read()
+        size = len(local)
+        results["files_tested"] += 1
+        
+        try:
+            cases = [
+                ("first 1024 bytes", "bytes=0-1023", 0, 1023),
+                ("last 1024 bytes", "bytes=-1024", size - 1024, size - 1),
+                ("open-ended tail", f"bytes={size - 100}-", size - 100, size - 1),
+                ("end clamped to size", f"bytes={size - 10}-{size + 1000}", size - 10, size - 1),
+            ]
+            for label, range_header, start, end in cases:
+                response = http_client.get(url, headers={"Range": range_header})
+                if not check(response.status_code == 206, filename, f"{label}: expected 206, got {response.status_code}"):
+                    continue
+                check(response.headers.get("Content-Range") == f"bytes {start}-{end}/{size}",
+                      filename, f"{label}: bad Content-Range {response.headers.get('Content-Range')}")
+                check(response.content == local[start:end + 1], filename, f"{label}: body does not match file on disk")
+            
+            response = http_client.get(url, headers={"Range": f"bytes={size}-"})
+            if check(response.status_code == 416, filename, f"unsatisfiable range: expected 416, got {response.status_code}"):
+                check(response.headers.get("Content-Range") == f"bytes */{size}",
+                      filename, f"416 without 'bytes */{size}' Content-Range")
+            
+            # Multi-range requests are ignored: full 200 response
+            fetched = http_client.fetch_timed(url, headers={"Range": "bytes=0-99,200-299"})
+            check(fetched["response"].status_code == 200 and fetched["bytes"] == size,
+                  filename, f"multi-range: expected full 200, got {fetched['response'].status_code}")
+            
+            probe = http_client.get(url, headers={"Range": "bytes=0-0"})
+            check(probe.headers.get("Accept-Ranges") == "bytes", filename, "missing Accept-Ranges: bytes")
+            
+            # If-Range: a matching validator keeps the range, a stale one gets the full file
+            last_modified = probe.headers.get("Last-Modified")
+            if check(bool(last_modified), filename, "missing Last-Modified (needed for If-Range)"):
+                response = http_client.get(url, headers={"Range": "bytes=0-99", "If-Range": last_modified})
+                check(response.status_code == 206, filename, f"fresh If-Range: expected 206, got {response.status_code}")
+                fetched = http_client.fetch_timed(
+                    url, headers={"Range": "bytes=0-99", "If-Range": "Thu, 01 Jan 1970 00:00:00 GMT"})
+                check(fetched["response"].status_code == 200 and fetched["bytes"] == size,
+                      filename, f"stale If-Range: expected full 200, got {fetched['response'].status_code}")
+        except requests.exceptions.RequestException as e:
+            check(False, filename, f"Connection error: {str(e)}")
+    
+    if results["success"]:
+        print(f"  ✅ Range handling correct on {results['files_tested']} files")
+    
+    return results
+
+def benchmark_range_ttfb(repeats=3, range_bytes=64 * 1024):
+    """Compare time-to-first-byte and total time of full vs ranged fetches for every PDF"""
+    print(f"\n🔍 Comparing full vs ranged (first {range_bytes // 1024} KB) fetches...")
+    
+    results = {}
+    for filename in list_procedure_files():
+        url = http_client.api_url(f"pdf/{filename}")
+        full = []
+        ranged = []
+        try:
+            for _ in range(repeats):
+                full.append(http_client.fetch_timed(url))
+                ranged.append(http_client.fetch_timed(url, headers={"Range": f"bytes=0-{range_bytes - 1}"}))
+        except requests.exceptions.RequestException as e:
+            print(f"  ❌ {filename} - Connection error: {str(e)}")
+            continue
+        
+        def median(samples, key):
+            return sorted(sample[key] for sample in samples)[len(samples) // 2]
+        
+        results[filename] = {
+            "full_ttfb_ms": median(full, "ttfb") * 1000,
+            "full_total_ms": median(full, "total") * 1000,
+            "full_bytes": full[0]["bytes"],
+            "range_ttfb_ms": median(ranged, "ttfb") * 1000,
+            "range_total_ms": median(ranged, "total") * 1000,
+            "range_bytes": ranged[0]["bytes"],
+            "range_status": ranged[0]["response"].status_code,
+        }
+    
+    print(f"  {'File':<24}{'Full TTFB':>11}{'Full total':>12}{'Range TTFB':>12}{'Range total':>13}{'Status':>8}")
+    for filename, stats in results.items():
+        print(
+            f"  {filename:<24}{stats['full_ttfb_ms']:>9.1f}ms{stats['full_total_ms']:>10.1f}ms"
+            f"{stats['range_ttfb_ms']:>10.1f}ms{stats['range_total_ms']:>11.1f}ms{stats['range_status']:>8}"
+        )
+    
+    return results
+
+def benchmark_cache_cold_vs_warm(repeats=5):
+    """
+    Compare cold (cache miss) and warm (cache hit) latency of /api/pdf/[filename] per file.
+    
+    A cold fetch is forced with the X-Cache-Bypass header, which makes the server
+    drop its cached copy and read the file again; it is only honoured with the
+    /api/metrics credentials (METRICS_TOKEN). The X-Cache header tells which path was taken.
+    """
+    print(f"\n🔍 Benchmarking PDF cache: cold vs warm ({repeats} warm fetches per file)...")
+    
+    results = {}
+    bypass = {"X-Cache-Bypass": "1", **server_metrics.auth_headers()}
+    for filename in list_procedure_files():
+        url = http_client.api_url(f"pdf/{filename}")
+        try:
+            cold = http_client.fetch_timed(url, headers=bypass)
+            warm = [http_client.fetch_timed(url) for _ in range(repeats)]
+        except requests.exceptions.RequestException as e:
+            print(f"  ❌ {filename} - Connection error: {str(e)}")
+            continue
+        
+        warm_total = sorted(sample["total"] for sample in warm)[len(warm) // 2]
+        results[filename] = {
+            "cold_ms": cold["total"] * 1000,
+            "cold_cache": cold["response"].headers.get("X-Cache", "n/a"),
+            "warm_ms": warm_total * 1000,
+            "warm_cache": warm[-1]["response"].headers.get("X-Cache", "n/a"),
+            "speedup": cold["total"] / warm_total if warm_total else 0.0,
+        }
+    
+    # Negative cache: repeated lookups of an unknown name
+    try:
+        missing = [http_client.fetch_timed(http_client.api_url("pdf/nonexistent-cache-probe.pdf"))
+                   for _ in range(repeats + 1)]
+    except requests.exceptions.RequestException as e:
+        print(f"  ❌ <404> - Connection error: {str(e)}")
+    else:
+        warm_missing = sorted(sample["total"] for sample in missing[1:])[repeats // 2]
+        results["<404>"] = {
+            "cold_ms": missing[0]["total"] * 1000,
+            "cold_cache": str(missing[0]["response"].status_code),
+            "warm_ms": warm_missing * 1000,
+            "warm_cache": str(missing[-1]["response"].status_code),
+            "speedup": missing[0]["total"] / warm_missing if warm_missing else 0.0,
+        }
+    
+    print(f"  {'File':<24}{'Cold':>10}{'':>3}{'X-Cache':<9}{'Warm':>10}{'':>3}{'X-Cache':<9}{'Speedup':>8}")
+    for filename, stats in results.items():
+        print(
+            f"  {filename:<24}{stats['cold_ms']:>8.1f}ms   {stats['cold_cache']:<9}"
+            f"{stats['warm_ms']:>8.1f}ms   {stats['warm_cache']:<9}x{stats['speedup']:>6.1f}"
+        )
+    
+    return results
+
 def test_application_health():
     """Test if the Next.js application is running and accessible"""
     print("🔍 Testing Application Health...")
     
     try:
-        response = requests.get(BASE_URL, timeout=10)
+        response = http_client.get("/", cached=True)
         if response.status_code == 200:
             print("  ✅ Application is accessible")
             return True
@@ -143,25 +485,252 @@ def test_application_health():
         print(f"  ❌ Application not accessible: {str(e)}")
         return False
 
-def main():
+def parse_request_mix(spec, available_files):
+    """Parse a request mix such as 'Active_Directory.pdf=3,GLPI.pdf=1' into {filename: weight}"""
+    if not spec:
+        return {filename: 1.0 for filename in available_files}
+    
+    mix = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        filename, _, weight = item.partition("=")
+        filename = filename.strip()
+        if filename not in available_files:
+            raise ValueError(f"Unknown procedure in request mix: {filename}")
+        mix[filename] = float(weight) if weight else 1.0
+        if mix[filename] <= 0:
+            raise ValueError(f"Weight must be positive for {filename}")
+    return mix
+
+def _load_worker(deadline, filenames, weights, seed):
+    """Fetch weighted-random PDFs on one keep-alive connection until the deadline"""
+    rng = random.Random(seed)
+    # No retries: a failed request must count as an error, not be hidden
+    session = http_client.new_session(retries=0, pool_size=1)
+    samples = []
+    errors = []
+    
+    try:
+        while time.monotonic() < deadline:
+            filename = rng.choices(filenames, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = session.get(http_client.api_url(f"pdf/{filename}"), timeout=30)
+                size = len(response.content)
+                latency = time.perf_counter() - start
+                if response.status_code == 200:
+                    samples.append((filename, latency, size))
+                else:
+                    errors.append((filename, f"HTTP {response.status_code}"))
+            except requests.exceptions.RequestException as e:
+                errors.append((filename, str(e)))
+    finally:
+        session.close()
+    
+    return samples, errors
+
+def run_load_test(concurrency=10, duration=30.0, mix=None):
+    """Hammer /api/pdf/[filename] from concurrent workers and collect per-file statistics"""
+    print(f"🔥 Load testing PDF API ({concurrency} workers, {duration:.0f}s)...")
+    
+    mix = mix or parse_request_mix(None, list_procedure_files())
+    filenames = list(mix)
+    weights = [mix[f] for f in filenames]
+    
+    start = time.perf_counter()
+    deadline = time.monotonic() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(_load_worker, deadline, filenames, weights, seed)
+            for seed in range(concurrency)
+        ]
+        worker_results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    
+    per_file = {filename: {"latencies": [], "bytes": 0, "errors": 0} for filename in filenames}
+    for samples, errors in worker_results:
+        for filename, latency, size in samples:
+            per_file[filename]["latencies"].append(latency)
+            per_file[filename]["bytes"] += size
+        for filename, _ in errors:
+            per_file[filename]["errors"] += 1
+    
+    def summarize(latencies, total_bytes, errors):
+        latencies = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "requests_per_sec": len(latencies) / elapsed,
+            "bytes_per_sec": total_bytes / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+    
+    results = {
+        "concurrency": concurrency,
+        "duration": elapsed,
+        "files": {
+            filename: summarize(stats["latencies"], stats["bytes"], stats["errors"])
+            for filename, stats in per_file.items()
+        },
+        "total": summarize(
+            [latency for stats in per_file.values() for latency in stats["latencies"]],
+            sum(stats["bytes"] for stats in per_file.values()),
+            sum(stats["errors"] for stats in per_file.values()),
+        ),
+        "error_samples": [error for _, errors in worker_results for error in errors][:10],
+    }
+    
+    return results
+
+def print_load_report(results):
+    """Print the per-file load test table"""
+    print("\n" + "=" * 96)
+    print(f"📊 PDF API LOAD TEST ({results['concurrency']} workers, {results['duration']:.1f}s)")
+    print("=" * 96)
+    print(f"{'File':<24}{'Reqs':>7}{'Err':>5}{'Req/s':>9}{'MB/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    
+    rows = list(results["files"].items()) + [("TOTAL", results["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<24}{stats['requests']:>7}{stats['errors']:>5}"
+            f"{stats['requests_per_sec']:>9.1f}{stats['bytes_per_sec'] / 1e6:>9.2f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    
+    if results["error_samples"]:
+        print(f"\n❌ Sample errors:")
+        for filename, error in results["error_samples"]:
+            print(f"  - {filename}: {error}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Backend API tests for the Next.js portfolio")
+    parser.add_argument("--load", action="store_true",
+                        help="run the concurrent load test against /api/pdf/[filename] instead of the functional checks")
+    parser.add_argument("--storm", action="store_true",
+                        help="measure /accueil latency and server RSS during a PDF download storm")
+    parser.add_argument("--cache-bench", action="store_true",
+                        help="compare cold (cache miss) and warm (cache hit) PDF latency per file")
+    parser.add_argument("--concurrency", type=positive_int, default=10,
+                        help="number of concurrent workers in load/storm mode (default: 10)")
+    parser.add_argument("--duration", type=positive_int, default=30,
+                        help="load/storm duration in seconds (default: 30)")
+    parser.add_argument("--mix", default=None,
+                        help="weighted request mix, e.g. 'Active_Directory.pdf=3,GLPI.pdf=1' (default: all PDFs equally)")
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def load_main(args):
+    """Entry point for --load mode"""
+    print("🚀 Starting PDF API Load Test for Next.js Portfolio")
+    print("=" * 60)
+    
+    if not test_application_health():
+        print("\n❌ Application is not running. Cannot proceed with load testing.")
+        return False
+    
+    try:
+        mix = parse_request_mix(args.mix, list_procedure_files())
+    except ValueError as e:
+        print(f"❌ Invalid request mix: {e}")
+        return False
+    
+    report = SuiteReport("backend-load")
+    report.start_server_metrics()
+    results = report.run("run_load_test", run_load_test, args.concurrency, args.duration, mix)
+    print_load_report(results)
+    for filename, stats in list(results["files"].items()) + [("total", results["total"])]:
+        report.add_metric(f"load.{filename}.p50_ms", stats["p50_ms"])
+        report.add_metric(f"load.{filename}.p95_ms", stats["p95_ms"])
+    
+    load_ok = results["total"]["requests"] > 0 and results["total"]["errors"] == 0
+    report.checks[-1]["passed"] = load_ok
+    print(f"\n🎯 LOAD TEST STATUS: {'✅ NO ERRORS' if load_ok else '❌ ERRORS DETECTED'}")
+    return finish_report(report, args, load_ok)
+
+def storm_main(args):
+    """Entry point for --storm mode"""
+    print("🚀 Starting PDF Download Storm Benchmark for Next.js Portfolio")
+    print("=" * 60)
+    
+    report = SuiteReport("backend-storm")
+    report.start_server_metrics()
+    if not report.run("test_application_health", test_application_health):
+        print("\n❌ Application is not running. Cannot proceed with the benchmark.")
+        return finish_report(report, args, False)
+    
+    results = report.run("pdf_storm", benchmark_event_loop_under_pdf_storm, args.concurrency, args.duration)
+    storm_ok = results.get("probe_errors") == 0 and results.get("storm", {}).get("count", 0) > 0
+    report.checks[-1]["passed"] = storm_ok
+    if "storm" in results:
+        for label in ("idle", "storm"):
+            report.add_metric(f"storm.accueil.{label}.p50_ms", results[label]["p50_ms"])
+            report.add_metric(f"storm.accueil.{label}.p95_ms", results[label]["p95_ms"])
+        if results["peak_rss_bytes"]:
+            report.add_metric("storm.peak_rss_bytes", results["peak_rss_bytes"], unit="bytes")
+    return finish_report(report, args, storm_ok)
+
+def cache_bench_main(args):
+    """Entry point for --cache-bench mode"""
+    print("🚀 Starting PDF Cache Benchmark for Next.js Portfolio")
+    print("=" * 60)
+    
+    report = SuiteReport("backend-cache")
+    report.start_server_metrics()
+    if not report.run("test_application_health", test_application_health):
+        print("\n❌ Application is not running. Cannot proceed with the benchmark.")
+        return finish_report(report, args, False)
+    
+    results = report.run("cache_cold_vs_warm", benchmark_cache_cold_vs_warm)
+    bench_ok = any(filename != "<404>" for filename in results) and "error" not in results
+    report.checks[-1]["passed"] = bench_ok
+    if "error" not in results:
+        for filename, stats in results.items():
+            report.add_metric(f"cache.{filename}.cold_ms", stats["cold_ms"])
+            report.add_metric(f"cache.{filename}.warm_ms", stats["warm_ms"])
+    return finish_report(report, args, bench_ok)
+
+def main(args=None):
     """Main testing function"""
+    args = args or parse_args([])
+    report = SuiteReport("backend")
+    report.start_server_metrics()
+    
     print("🚀 Starting Backend API Testing for Next.js Portfolio")
     print("=" * 60)
     
     # Test application health first
-    app_healthy = test_application_health()
+    app_healthy = report.run("test_application_health", test_application_health)
     if not app_healthy:
         print("\n❌ Application is not running. Cannot proceed with API testing.")
-        return False
+        return finish_report(report, args, False)
     
     # Test root redirect functionality
-    redirect_results = test_root_redirect()
+    redirect_results = report.run("test_root_redirect", test_root_redirect)
     
     # Test PDF API endpoint
-    pdf_results = test_pdf_api_endpoint()
+    pdf_results = report.run("test_pdf_api_endpoint", test_pdf_api_endpoint)
+    
+    # Test the generated asset manifest
+    manifest_results = report.run("test_pdf_manifest_in_sync", test_pdf_manifest_in_sync)
+    
+    # Test fast web view
+    linearization_results = report.run("test_pdf_linearization", test_pdf_linearization)
     
     # Test error handling
-    error_handling_ok = test_pdf_api_error_handling()
+    error_handling_ok = report.run("test_pdf_api_error_handling", test_pdf_api_error_handling)
+    
+    # Test partial content support
+    range_results = report.run("test_pdf_range_requests", test_pdf_range_requests)
+    ttfb_results = benchmark_range_ttfb()
+    for filename, stats in ttfb_results.items():
+        report.add_metric(f"ttfb.full.{filename}", stats["full_ttfb_ms"])
+        report.add_metric(f"ttfb.range.{filename}", stats["range_ttfb_ms"])
     
     # Summary
     print("\n" + "=" * 60)
@@ -174,7 +743,10 @@ def main():
         print(f"  - Server-side: {'✅ YES' if redirect_results.get('server_side') else '❌ NO'}")
         print(f"  - Status Code: {redirect_results.get('redirect_status')}")
     print(f"PDF API Endpoint: {'✅ WORKING' if pdf_results['endpoint_accessible'] else '❌ FAILING'}")
+    print(f"PDF Manifest: {'⚠️ NOT GENERATED' if manifest_results['skipped'] else '✅ IN SYNC' if manifest_results['success'] else '❌ OUT OF SYNC'}")
+    print(f"PDF Linearization: {linearization_results['linearized']}/{linearization_results['files_tested']} files")
     print(f"Error Handling: {'✅ WORKING' if error_handling_ok else '❌ FAILING'}")
+    print(f"Range Requests: {'✅ WORKING' if range_results['success'] else '❌ FAILING'}")
     print(f"PDF Files Served: {pdf_results['files_served']}/{pdf_results['total_files']}")
     
     if pdf_results['successful_files']:
@@ -187,13 +759,21 @@ def main():
         for file in pdf_results['failed_files']:
             print(f"  - {file}")
     
+    if range_results['failures']:
+        print(f"\n❌ Range request failures:")
+        for failure in range_results['failures']:
+            print(f"  - {failure}")
+    
     # Overall assessment
     overall_success = (
         app_healthy and 
         redirect_results.get('success', False) and
         pdf_results['endpoint_accessible'] and 
         error_handling_ok and
-        pdf_results['files_served'] >= 6  # At least 75% of files should work
+        range_results['success'] and
+        manifest_results['success'] and
+        linearization_results['success'] and
+        pdf_results['success']  # At least 75% of files should work
     )
     
     print(f"\n🎯 OVERALL BACKEND STATUS: {'✅ WORKING' if overall_success else '❌ FAILING'}")
@@ -208,17 +788,36 @@ def main():
             print("  - PDF API endpoint is not working")
         if not error_handling_ok:
             print("  - Error handling is not working properly")
-        if pdf_results['files_served'] < 6:
-            print(f"  - Only {pdf_results['files_served']}/8 PDF files are being served correctly")
+        if not range_results['success']:
+            print("  - Range / partial content handling is not working properly")
+        if not pdf_results['success']:
+            print(f"  - Only {pdf_results['files_served']}/{pdf_results['total_files']} PDF files are being served correctly")
+        if not manifest_results['success']:
+            print("  - PDF manifest is out of sync with public/procedures (run `npm run manifest:pdfs`):")
+            for issue in manifest_results.get('issues') or [manifest_results.get('error', 'Unknown error')]:
+                print(f"    - {issue}")
+        if not linearization_results['success']:
+            print("  - PDFs are not all linearized for fast web view:")
+            for issue in linearization_results.get('issues') or [linearization_results.get('error', 'Unknown error')]:
+                print(f"    - {issue}")
     else:
         print("\n🎉 ALL BACKEND TESTS PASSED:")
         print("  - Application is healthy and accessible")
         print("  - Root redirect working with server-side implementation")
         print("  - PDF API serving all files correctly")
         print("  - Error handling working properly")
+        print("  - Range requests served as 206 partial content")
     
-    return overall_success
+    return finish_report(report, args, overall_success)
 
 if __name__ == "__main__":
-    success = main()
+    args = parse_args()
+    if args.load:
+        success = load_main(args)
+    elif args.storm:
+        success = storm_main(args)
+    elif args.cache_bench:
+        success = cache_bench_main(args)
+    else:
+        success = main(args)
     sys.exit(0 if success else 1)
\ No newline at end of file
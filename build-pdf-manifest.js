@@ -0,0 +1,126 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const proceduresDir = path.join(__dirname, 'public', 'procedures');
+const manifestPath = path.join(proceduresDir, 'manifest.json');
+
+// Variantes précompressées produites par compress-pdfs.js
+const VARIANT_EXTENSIONS = ['.br', '.gz'];
+
+// Les objets compressés (PDF 1.5+) ne sont visibles qu'une fois les /ObjStm décompressés
+function inflateObjectStreams(text, buffer) {
+  const inflated = [];
+  const objStm = /\/Type\s*\/ObjStm\b[\s\S]*?stream\r?\n/g;
+  let match;
+  while ((match = objStm.exec(text)) !== null) {
+    const start = match.index + match[0].length;
+    const end = text.indexOf('endstream', start);
+    if (end === -1) break;
+    try {
+      inflated.push(zlib.inflateSync(buffer.subarray(start, end)).toString('latin1'));
+    } catch (error) {
+      // Flux non Flate ou tronqué : ignoré
+    }
+  }
+  return inflated;
+}
+
+// Nombre de pages : /Count du nœud /Pages racine (le plus grand), sinon nombre d'objets /Page
+function countPages(sources) {
+  let count = 0;
+  let leaves = 0;
+  for (const source of sources) {
+    for (const match of source.matchAll(/\/Type\s*\/Pages\b/g)) {
+      const window = source.slice(Math.max(0, match.index - 300), match.index + 300);
+      const found = window.match(/\/Count\s+(\d+)/);
+      if (found) count = Math.max(count, Number(found[1]));
+    }
+    leaves += (source.match(/\/Type\s*\/Page(?![a-zA-Z])/g) || []).length;
+  }
+  return count || leaves || null;
+}
+
+// Dictionnaire de linéarisation : premier objet du fichier (dans le premier Ko)
+function linearization(text) {
+  const head = text.slice(0, 1024);
+  if (!/\/Linearized\b/.test(head)) return null;
+  const number = key => {
+    const found = head.match(new RegExp(`/${key}\\s+(\\d+)`));
+    return found ? Number(found[1]) : null;
+  };
+  return { firstPageObject: number('O'), firstPageEnd: number('E') };
+}
+
+// Décalage en octets de l'objet de la première page, s'il est stocké hors /ObjStm
+function firstPageOffset(text, linearized) {
+  let objectNumber = linearized && linearized.firstPageObject;
+  if (!objectNumber) {
+    const kids = text.match(/\/Type\s*\/Pages\b[\s\S]{0,300}?\/Kids\s*\[\s*(\d+)\s+\d+\s+R/)
+      || text.match(/\/Kids\s*\[\s*(\d+)\s+\d+\s+R[\s\S]{0,300}?\/Type\s*\/Pages\b/);
+    objectNumber = kids && Number(kids[1]);
+  }
+  if (!objectNumber) return null;
+
+  const object = new RegExp(`(^|[\\r\\n\\s])${objectNumber}\\s+0\\s+obj\\b`).exec(text);
+  if (!object) return null;
+  const offset = object.index + object[1].length;
+  const end = text.indexOf('endobj', offset);
+  // Un nœud /Pages intermédiaire n'est pas une page
+  return /\/Type\s*\/Page(?![a-zA-Z])/.test(text.slice(offset, end === -1 ? offset + 4096 : end)) ? offset : null;
+}
+
+function describePdf(file) {
+  const filePath = path.join(proceduresDir, file);
+  const stats = fs.statSync(filePath);
+  const buffer = fs.readFileSync(filePath);
+  const text = buffer.toString('latin1');
+  const linearized = linearization(text);
+
+  const variants = {};
+  for (const extension of VARIANT_EXTENSIONS) {
+    const variantPath = filePath + extension;
+    if (!fs.existsSync(variantPath)) continue;
+    const variantStats = fs.statSync(variantPath);
+    // Une variante plus ancienne que le PDF ne sera pas servie par la route
+    if (variantStats.mtimeMs < stats.mtimeMs) continue;
+    variants[extension] = { size: variantStats.size, mtimeMs: variantStats.mtimeMs };
+  }
+
+  return {
+    size: stats.size,
+    mtimeMs: stats.mtimeMs,
+    sha256: crypto.createHash('sha256').update(buffer).digest('hex'),
+    pages: countPages([text, ...inflateObjectStreams(text, buffer)]),
+    linearized: Boolean(linearized),
+    firstPageOffset: firstPageOffset(text, linearized),
+    firstPageEnd: linearized ? linearized.firstPageEnd : null,
+    variants
+  };
+}
+
+function buildPdfManifest() {
+  const files = fs.readdirSync(proceduresDir)
+    .filter(file => file.toLowerCase().endsWith('.pdf'))
+    .sort();
+
+  console.log('📇 GÉNÉRATION DU MANIFESTE DES PDF...\n');
+
+  const manifest = { version: 1, generatedAt: new Date().toISOString(), files: {} };
+  for (const file of files) {
+    try {
+      const entry = describePdf(file);
+      manifest.files[file] = entry;
+      const variants = Object.keys(entry.variants).join(' ') || 'aucune variante';
+      console.log(`📄 ${file} (${(entry.size / 1024).toFixed(1)}KB, ${entry.pages ?? '?'} pages, ${entry.linearized ? 'linéarisé' : 'non linéarisé'}, ${variants})`);
+    } catch (error) {
+      console.log(`❌ Erreur ${file}: ${error.message}`);
+    }
+  }
+
+  fs.writeFileSync(manifestPath, JSON.stringify(manifest, null, 2) + '\n');
+  console.log(`\n🎯 MANIFESTE ÉCRIT : ${path.relative(__dirname, manifestPath)} (${Object.keys(manifest.files).length} fichiers)`);
+}
+
+buildPdfManifest();
@@ -0,0 +1,232 @@
+const fs = require('fs');
+const path = require('path');
+
+// Assemble la version statique du site dans out/ à partir d'un `next build`
+// lancé avec STATIC_BUILD=1 (npm run build:static) :
+//   - pages pré-rendues par Next (.next/server/app/*.html) → out/<route>.html
+//   - assets (.next/static, public/) copiés tels quels
+//   - /api/pdf/<nom>.pdf (+ .br/.gz) en fichiers, mêmes en-têtes que la route
+//   - /api/pdf/<nom>.pdf/pages/<n> réécrit vers public/procedures/pages (un fichier ne
+//     peut pas être aussi un dossier), PDF ou page inconnus → mêmes erreurs JSON que les routes
+//   - redirection / → /accueil et en-têtes de next.config.js dans _redirects/_headers
+//     (format Netlify, lu aussi par serve-static.js)
+//
+// output: 'export' n'est pas utilisable ici : /api/pdf et /api/metrics dépendent
+// de la requête (Range, Accept-Encoding, If-None-Match), ce que l'export refuse.
+// Écarts restants avec le serveur : /api/metrics et /api/search n'existent pas, et un
+// numéro de page non numérique (pages/abc) répond 404 « Page not found » au lieu de 400.
+
+const rootDir = __dirname;
+const nextConfig = require('./next.config.js');
+
+// Même dossier de build que next.config.js (NEXT_DIST_DIR)
+const nextDir = path.join(rootDir, nextConfig.distDir || '.next');
+const appDir = path.join(nextDir, 'server', 'app');
+const publicDir = path.join(rootDir, 'public');
+const proceduresDir = path.join(publicDir, 'procedures');
+const pagesDir = path.join(proceduresDir, 'pages');
+const outDir = path.join(rootDir, 'out');
+
+// Variantes précompressées produites par compress-pdfs.js
+const VARIANT_EXTENSIONS = ['.br', '.gz'];
+
+// En-têtes de src/app/api/pdf/[filename]/route.js
+const PDF_HEADERS = {
+  'Content-Type': 'application/pdf',
+  'Cache-Control': 'public, max-age=3600',
+  'Vary': 'Accept-Encoding'
+};
+
+// Corps des erreurs JSON des routes PDF, servis par les règles 4xx de _redirects
+const ERROR_BODIES = {
+  '/_errors/pdf-not-found.json': { error: 'PDF not found' },
+  '/_errors/page-not-found.json': { error: 'Page not found' },
+  '/_errors/invalid-page.json': { error: 'Invalid page number' }
+};
+
+function copyDir(source, destination) {
+  fs.mkdirSync(destination, { recursive: true });
+  for (const entry of fs.readdirSync(source, { withFileTypes: true })) {
+    const from = path.join(source, entry.name);
+    const to = path.join(destination, entry.name);
+    if (entry.isDirectory()) {
+      copyDir(from, to);
+    } else {
+      // copyFile conserve le contenu ; utimes conserve le mtime (ETag / Last-Modified stables)
+      fs.copyFileSync(from, to);
+      const stats = fs.statSync(from);
+      fs.utimesSync(to, stats.atime, stats.mtime);
+    }
+  }
+}
+
+function copyFile(from, to) {
+  fs.mkdirSync(path.dirname(to), { recursive: true });
+  fs.copyFileSync(from, to);
+  const stats = fs.statSync(from);
+  fs.utimesSync(to, stats.atime, stats.mtime);
+}
+
+// Routes de pages pré-rendues au build (hors / qui ne fait que rediriger)
+function prerenderedPages() {
+  const manifest = JSON.parse(fs.readFileSync(path.join(nextDir, 'prerender-manifest.json'), 'utf8'));
+  return Object.keys(manifest.routes)
+    .filter(route => route !== '/' && !route.startsWith('/_') && fs.existsSync(path.join(appDir, `${route}.html`)))
+    .sort();
+}
+
+// Pages de src/app (chaque dossier contenant un page.js), pour vérifier qu'aucune ne manque
+function appPages() {
+  const pages = [];
+  const walk = directory => {
+    for (const entry of fs.readdirSync(directory, { withFileTypes: true })) {
+      if (!entry.isDirectory()) continue;
+      const child = path.join(directory, entry.name);
+      if (fs.existsSync(path.join(child, 'page.js'))) {
+        pages.push('/' + path.relative(path.join(rootDir, 'src', 'app'), child).split(path.sep).join('/'));
+      }
+      walk(child);
+    }
+  };
+  walk(path.join(rootDir, 'src', 'app'));
+  return pages.sort();
+}
+
+// '/(.*)' → '/*', '/images/:path*' → '/images/*'
+function toStaticPattern(source) {
+  return source.replace(/\(\.\*\)$/, '*').replace(/:\w+\*$/, '*');
+}
+
+// Pages découpées par split_pdf_pages.py : { '/api/pdf/GLPI.pdf/pages/3': 'GLPI-3.pdf' }
+function pdfPages() {
+  let index;
+  try {
+    index = JSON.parse(fs.readFileSync(path.join(pagesDir, 'index.json'), 'utf8'));
+  } catch (error) {
+    return {};
+  }
+  const pages = {};
+  for (const [file, entry] of Object.entries(index.files).sort()) {
+    for (const [name, output] of Object.entries(entry.outputs)) {
+      if (fs.existsSync(path.join(pagesDir, name))) pages[`/api/pdf/${file}/pages/${output.page}`] = name;
+    }
+  }
+  return pages;
+}
+
+async function headerRules(pdfFiles, pages) {
+  const rules = [];
+  for (const rule of await nextConfig.headers()) {
+    rules.push({ path: toStaticPattern(rule.source), headers: Object.fromEntries(rule.headers.map(h => [h.key, h.value])) });
+  }
+  // Fichiers fingerprintés par Next : cache permanent
+  rules.push({ path: '/_next/static/*', headers: { 'Cache-Control': 'public, max-age=31536000, immutable' } });
+  for (const file of pdfFiles) {
+    rules.push({
+      path: `/api/pdf/${file}`,
+      headers: { ...PDF_HEADERS, 'Content-Disposition': `inline; filename="${file}"` }
+    });
+  }
+  for (const [route, name] of Object.entries(pages)) {
+    rules.push({ path: route, headers: { ...PDF_HEADERS, 'Content-Disposition': `inline; filename="${name}"` } });
+  }
+  return rules;
+}
+
+function writeHeaders(rules) {
+  const lines = [];
+  for (const rule of rules) {
+    lines.push(rule.path);
+    for (const [key, value] of Object.entries(rule.headers)) lines.push(`  ${key}: ${value}`);
+  }
+  fs.writeFileSync(path.join(outDir, '_headers'), lines.join('\n') + '\n');
+}
+
+// Page de repli pour les hébergeurs qui ignorent _redirects
+function writeRootRedirect() {
+  fs.writeFileSync(path.join(outDir, 'index.html'),
+    '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">' +
+    '<meta http-equiv="refresh" content="0;url=/accueil"><link rel="canonical" href="/accueil">' +
+    '<title>Portfolio - Hocine IRATNI</title></head><body><a href="/accueil">Accueil</a></body></html>\n');
+}
+
+// Redirection / (même statut que redirect() côté serveur), réécriture des pages de PDF,
+// puis les erreurs JSON : les règles plus précises d'abord
+function writeRedirects(pages) {
+  const lines = ['/  /accueil  307'];
+  for (const [route, name] of Object.entries(pages)) lines.push(`${route}  /procedures/pages/${name}  200`);
+  // 0, 01... : refusés en 400 par la route (numéro décimal sans zéro initial)
+  lines.push('/api/pdf/*/pages/0*  /_errors/invalid-page.json  400');
+  lines.push('/api/pdf/*/pages/*  /_errors/page-not-found.json  404');
+  lines.push('/api/pdf/*  /_errors/pdf-not-found.json  404');
+  fs.writeFileSync(path.join(outDir, '_redirects'), lines.join('\n') + '\n');
+
+  for (const [file, body] of Object.entries(ERROR_BODIES)) {
+    fs.mkdirSync(path.dirname(path.join(outDir, file)), { recursive: true });
+    fs.writeFileSync(path.join(outDir, file), JSON.stringify(body));
+  }
+}
+
+async function buildStatic() {
+  console.log('📦 ASSEMBLAGE DU SITE STATIQUE...\n');
+
+  if (!fs.existsSync(path.join(nextDir, 'BUILD_ID'))) {
+    console.log('❌ Aucun build Next.js : lancer `npm run build:static`');
+    process.exitCode = 1;
+    return;
+  }
+  const serverFiles = JSON.parse(fs.readFileSync(path.join(nextDir, 'required-server-files.json'), 'utf8'));
+  if (!serverFiles.config.images.unoptimized) {
+    // Sans serveur, /_next/image n'existe pas : les pages doivent pointer vers les fichiers
+    console.log('❌ Build fait sans STATIC_BUILD=1 : les images passent par /_next/image');
+    process.exitCode = 1;
+    return;
+  }
+
+  const pages = prerenderedPages();
+  const missing = appPages().filter(page => !pages.includes(page));
+  if (missing.length) {
+    console.log(`❌ Pages non pré-rendues (rendu dynamique) : ${missing.join(', ')}`);
+    process.exitCode = 1;
+    return;
+  }
+
+  fs.rmSync(outDir, { recursive: true, force: true });
+  copyDir(publicDir, outDir);
+  copyDir(path.join(nextDir, 'static'), path.join(outDir, '_next', 'static'));
+
+  for (const page of pages) {
+    copyFile(path.join(appDir, `${page}.html`), path.join(outDir, `${page}.html`));
+    console.log(`📄 ${page} → out${page}.html`);
+  }
+  const notFound = path.join(appDir, '_not-found.html');
+  if (fs.existsSync(notFound)) copyFile(notFound, path.join(outDir, '404.html'));
+
+  const pdfFiles = fs.readdirSync(proceduresDir).filter(file => file.toLowerCase().endsWith('.pdf')).sort();
+  for (const file of pdfFiles) {
+    const source = path.join(proceduresDir, file);
+    copyFile(source, path.join(outDir, 'api', 'pdf', file));
+    for (const extension of VARIANT_EXTENSIONS) {
+      const variant = source + extension;
+      // Une variante plus ancienne que le PDF ne serait pas servie par la route
+      if (fs.existsSync(variant) && fs.statSync(variant).mtimeMs >= fs.statSync(source).mtimeMs) {
+        copyFile(variant, path.join(outDir, 'api', 'pdf', file + extension));
+      }
+    }
+  }
+  console.log(`📚 ${pdfFiles.length} PDF → out/api/pdf/`);
+
+  const splitPages = pdfPages();
+  console.log(`📑 ${Object.keys(splitPages).length} pages de PDF → /api/pdf/<nom>/pages/<n>`);
+
+  writeRootRedirect();
+  writeRedirects(splitPages);
+  writeHeaders(await headerRules(pdfFiles, splitPages));
+
+  console.log(`\n🎯 SITE STATIQUE PRÊT : out/ (${pages.length} pages, servir avec \`npm run serve:static\`)`);
+}
+
+buildStatic().catch(error => {
+  console.error(error);
+  process.exitCode = 1;
+});
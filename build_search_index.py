@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Search Index Builder for public/procedures
+Extracts the text of every page of every procedure PDF, one process per file,
+and writes the inverted index read by /api/search. Only the PDFs whose content
+changed since the last run are extracted again; the postings are rebuilt from
+the stored page texts every time
+
+Requires PyMuPDF (pip install pymupdf)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from procedures import file_sha256, list_procedure_files, procedure_path
+from search_index import (
+    INDEX_PATH, INDEX_VERSION, MIN_TOKEN_LENGTH, STOPWORDS, build_postings, clean_text, document_title, load_index,
+)
+
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+def extract_pages(filename):
+    """
+    Text of every page of one PDF.
+    Runs in a worker process; returns the page texts and the extraction time.
+    """
+    start = time.perf_counter()
+    with pymupdf.open(procedure_path(filename)) as document:
+        pages = [clean_text(page.get_text()) for page in document]
+    return {"pages": pages, "extract_ms": (time.perf_counter() - start) * 1000}
+
+def previous_documents(path):
+    """{filename: document} of the last index, reusable while the sha256 matches"""
+    index = load_index(path)
+    if index is None or index.get("version") != INDEX_VERSION:
+        return {}
+    return {document["file"]: document for document in index["documents"]}
+
+def build(jobs=os.cpu_count() or 1, force=False, path=INDEX_PATH):
+    """
+    Extract every changed PDF in a process pool and rewrite the index.
+    Returns {"extracted", "reused", "errors", "terms", "bytes"}.
+    """
+    previous = {} if force else previous_documents(path)
+    documents = {}
+    todo = {}
+    for filename in list_procedure_files():
+        sha256 = file_sha256(procedure_path(filename))
+        known = previous.get(filename)
+        if known is not None and known["sha256"] == sha256:
+            print(f"⏭️  {filename} up to date")
+            documents[filename] = known
+            continue
+        todo[filename] = sha256
+
+    errors = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(extract_pages, filename): filename for filename in todo}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                errors.append(filename)
+                print(f"❌ {filename} - {str(e)}")
+                continue
+            documents[filename] = {
+                "file": filename,
+                "title": document_title(filename),
+                "sha256": todo[filename],
+                "pages": entry["pages"],
+            }
+            characters = sum(len(page) for page in entry["pages"])
+            empty = sum(1 for page in entry["pages"] if not page)
+            print(f"✅ {filename} - {len(entry['pages'])} pages, {characters} characters"
+                  f"{f', {empty} without text' if empty else ''}, {entry['extract_ms']:.0f}ms")
+
+    ordered = [documents[filename] for filename in sorted(documents)]
+    terms, lengths = build_postings(ordered)
+    for document, page_lengths in zip(ordered, lengths):
+        document["lengths"] = page_lengths
+
+    index = {
+        "version": INDEX_VERSION,
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tokenizer": {"minLength": MIN_TOKEN_LENGTH, "stopwords": STOPWORDS},
+        "documents": ordered,
+        "terms": terms,
+    }
+    # Compact separators: the route parses this file on its first request
+    with open(path, "w") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    return {
+        "extracted": len(todo) - len(errors),
+        "reused": len(ordered) - (len(todo) - len(errors)),
+        "errors": errors,
+        "terms": len(terms),
+        "bytes": os.path.getsize(path),
+    }
+
+def main():
+    """Main builder function"""
+    parser = argparse.ArgumentParser(description="Build the full-text search index of the procedure PDFs")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="extract every PDF again, even unchanged ones")
+    args = parser.parse_args()
+
+    print("🚀 Search Index Builder")
+    print("=" * 60)
+
+    if pymupdf is None:
+        print("❌ PyMuPDF is required: pip install pymupdf")
+        return False
+
+    start = time.perf_counter()
+    result = build(args.jobs, args.force)
+    print(f"\n🎯 SEARCH INDEX: {os.path.relpath(INDEX_PATH)} - {result['extracted']} extracted, "
+          f"{result['reused']} reused, {result['terms']} terms, {result['bytes'] / 1024:.1f}KB "
+          f"in {time.perf_counter() - start:.2f}s"
+          f"{', ' + str(len(result['errors'])) + ' failed' if result['errors'] else ''}")
+    return not result["errors"]
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
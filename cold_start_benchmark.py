@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Benchmark for Next.js Portfolio Application
+Starts the server from scratch N times, in dev and production, and measures
+the time until it listens, then the first response of every route (the one
+that compiles or loads its module) against a second, warm one. Each mode runs
+with and without optimizePackageImports for lucide-react, each in its own
+build directory, to quantify the import cost
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import http_client
+import run_all_tests
+import server_metrics
+from perf_stats import summarize
+from procedures import list_procedure_files
+from server_fixture import ROOT_DIR, NextServer
+from suite_report import SuiteReport, add_report_arguments, finish_report, positive_int
+
+# Build directories of the benchmark (NEXT_DIST_DIR in next.config.js), one per mode and variant
+BUILD_ROOT = ".next-cold-start"
+
+# optimizePackageImports: ['lucide-react'] (the committed config) or nothing
+VARIANTS = {"optimized": "1", "plain": "0"}
+
+def cold_routes():
+    """/, every page of src/app and each API route, in the order a first visitor could hit them"""
+    routes = [route for route in run_all_tests.discover_routes() if not route.startswith("/procedures/")]
+    procedures = list_procedure_files()
+    if procedures:
+        routes.append(f"/api/pdf/{procedures[0]}/pages/1")
+    routes += ["/api/search?q=vlan", "/api/metrics"]
+    return routes
+
+def variant_env(mode, variant):
+    return {
+        "NEXT_DIST_DIR": os.path.join(BUILD_ROOT, f"{mode}-{variant}"),
+        "OPTIMIZE_PACKAGE_IMPORTS": VARIANTS[variant],
+    }
+
+def next_binary():
+    local = os.path.join(ROOT_DIR, "node_modules", ".bin", "next")
+    return [local] if os.path.exists(local) else ["npx", "--no-install", "next"]
+
+def build(variant, timeout=900):
+    """`next build` of one variant into its own directory"""
+    env = variant_env("start", variant)
+    print(f"🏗️  next build ({variant}) → {env['NEXT_DIST_DIR']}...")
+    start = time.perf_counter()
+    completed = subprocess.run(
+        next_binary() + ["build"], cwd=ROOT_DIR, capture_output=True, text=True, timeout=timeout,
+        env={**os.environ, **env, "NEXT_TELEMETRY_DISABLED": "1"},
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        tail = "\n".join((completed.stdout + completed.stderr).strip().splitlines()[-10:])
+        raise RuntimeError(f"next build ({variant}) failed:\n{tail}")
+    print(f"  ✅ built in {elapsed:.1f}s")
+    return {"success": True, "seconds": elapsed}
+
+def fetch(path, timeout):
+    """One request on a new connection: (seconds to the full response, status)"""
+    http_client.close()
+    # /api/metrics answers 404 in production without the token NextServer gives the child
+    headers = server_metrics.auth_headers() if path == "/api/metrics" else {}
+    fetched = http_client.fetch_timed(path, decode=False, allow_redirects=False, timeout=timeout, headers=headers)
+    return fetched["total"], fetched["response"].status_code
+
+def cold_run(mode, variant, routes, timeout):
+    """
+    One server start: time to listening, then every route once cold and once
+    warm. Dev starts from an empty build directory (no compilation cache).
+    """
+    env = variant_env(mode, variant)
+    if mode == "dev":
+        shutil.rmtree(os.path.join(ROOT_DIR, env["NEXT_DIST_DIR"]), ignore_errors=True)
+
+    server = NextServer(mode=mode, timeout=timeout, env=env, wait_for="listening")
+    previous = http_client.BASE_URL
+    server.start()
+    http_client.set_base_url(server.base_url)
+    try:
+        first, warm, failures = {}, {}, []
+        for path in routes:
+            # A first hit in dev compiles the route: allow it as long as the startup
+            first[path], status = fetch(path, timeout)
+            if status >= 500:
+                failures.append(f"{path} HTTP {status}")
+        for path in routes:
+            warm[path], _ = fetch(path, timeout)
+    finally:
+        http_client.close()
+        http_client.set_base_url(previous)
+        server.stop()
+    return {"listening": server.startup_time, "first": first, "warm": warm, "failures": failures}
+
+def measure(mode, variant, routes, runs, timeout):
+    """runs cold starts of one mode/variant, summarized per route"""
+    print(f"\n🧊 {mode} / {variant}: {runs} cold starts, {len(routes)} routes each")
+    samples = []
+    for run in range(runs):
+        sample = cold_run(mode, variant, routes, timeout)
+        samples.append(sample)
+        print(f"  run {run + 1}: listening in {sample['listening'] * 1000:.0f}ms, "
+              f"first responses {sum(sample['first'].values()) * 1000:.0f}ms, "
+              f"warm {sum(sample['warm'].values()) * 1000:.0f}ms")
+        for failure in sample["failures"]:
+            print(f"    ❌ {failure}")
+
+    per_route = {}
+    for path in routes:
+        first = summarize([sample["first"][path] for sample in samples])
+        warm = summarize([sample["warm"][path] for sample in samples])
+        per_route[path] = {
+            "first_p50_ms": first["p50"] * 1000,
+            "first_max_ms": first["max"] * 1000,
+            "warm_p50_ms": warm["p50"] * 1000,
+            "penalty_ms": (first["p50"] - warm["p50"]) * 1000,
+        }
+
+    print(f"    {'route':<44}{'first':>10}{'warm':>10}{'penalty':>10}")
+    for path, entry in sorted(per_route.items(), key=lambda item: item[1]["penalty_ms"], reverse=True):
+        print(f"    {path:<44}{entry['first_p50_ms']:>8.0f}ms{entry['warm_p50_ms']:>8.1f}ms"
+              f"{entry['penalty_ms']:>8.0f}ms")
+
+    listening = summarize([sample["listening"] for sample in samples])
+    cold_total = summarize([sum(sample["first"].values()) for sample in samples])
+    return {
+        "success": not any(sample["failures"] for sample in samples),
+        "listening_p50_ms": listening["p50"] * 1000,
+        "listening_max_ms": listening["max"] * 1000,
+        "first_responses_p50_ms": cold_total["p50"] * 1000,
+        "routes": per_route,
+        "failures": sorted({failure for sample in samples for failure in sample["failures"]}),
+    }
+
+def print_comparison(results):
+    """optimized vs plain per mode: what optimizePackageImports saves at startup and on first hits"""
+    print("\n" + "=" * 60)
+    print("📊 COLD START (p50 over the runs)")
+    print("=" * 60)
+    print(f"{'mode / variant':<24}{'build':>10}{'listening':>12}{'first hits':>12}")
+    for (mode, variant), result in results.items():
+        if "listening_p50_ms" not in result:
+            continue
+        built = f"{result['build_s']:.1f}s" if result.get("build_s") else "-"
+        print(f"{mode + ' / ' + variant:<24}{built:>10}{result['listening_p50_ms']:>10.0f}ms"
+              f"{result['first_responses_p50_ms']:>10.0f}ms")
+
+    for mode in sorted({mode for mode, _ in results}):
+        optimized, plain = results.get((mode, "optimized"), {}), results.get((mode, "plain"), {})
+        if "routes" not in optimized or "routes" not in plain:
+            continue
+        print(f"\n{mode}: optimizePackageImports saves "
+              f"{plain['listening_p50_ms'] - optimized['listening_p50_ms']:+.0f}ms to listening, "
+              f"{plain['first_responses_p50_ms'] - optimized['first_responses_p50_ms']:+.0f}ms over the first hits")
+        gains = sorted(
+            ((path, plain["routes"][path]["first_p50_ms"] - entry["first_p50_ms"])
+             for path, entry in optimized["routes"].items()),
+            key=lambda item: item[1], reverse=True,
+        )
+        for path, gain in gains[:5]:
+            print(f"    {path:<44}{gain:>+8.0f}ms")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Cold-start and first-request compilation benchmark")
+    parser.add_argument("--runs", type=positive_int, default=3, help="cold starts per mode and variant (default: 3)")
+    parser.add_argument("--modes", default="dev,start",
+                        help="comma-separated Next.js modes to measure (default: dev,start)")
+    parser.add_argument("--variants", default=",".join(VARIANTS),
+                        help=f"comma-separated optimizePackageImports variants (default: {','.join(VARIANTS)})")
+    parser.add_argument("--skip-build", action="store_true",
+                        help=f"reuse the production builds already in {BUILD_ROOT}/ instead of rebuilding")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="seconds a server may take to listen (default: 120)")
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Main benchmark function"""
+    args = args or parse_args([])
+    print("🚀 Starting Cold-Start Benchmark for Next.js Portfolio")
+    print("=" * 60)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    variants = [variant.strip() for variant in args.variants.split(",") if variant.strip()]
+    unknown = [mode for mode in modes if mode not in ("dev", "start")] + \
+              [variant for variant in variants if variant not in VARIANTS]
+    if unknown:
+        print(f"  ❌ Unknown mode or variant: {', '.join(unknown)}")
+        return False
+
+    routes = cold_routes()
+    report = SuiteReport("cold-start")
+    results = {}
+    for mode in modes:
+        for variant in variants:
+            key = f"{mode}.{variant}"
+            build_s = None
+            if mode == "start" and not args.skip_build:
+                built = report.run(f"{key}.build", build, variant)
+                if not built["success"]:
+                    print(f"  ❌ {built.get('error')}")
+                    results[(mode, variant)] = built
+                    continue
+                build_s = built["seconds"]
+                report.add_metric(f"cold_start.{key}.build_ms", build_s * 1000)
+
+            result = report.run(key, measure, mode, variant, routes, args.runs, args.timeout)
+            result["build_s"] = build_s
+            results[(mode, variant)] = result
+            if "listening_p50_ms" in result:
+                report.add_metric(f"cold_start.{key}.listening_ms", result["listening_p50_ms"])
+                report.add_metric(f"cold_start.{key}.first_responses_ms", result["first_responses_p50_ms"])
+            else:
+                print(f"  ❌ {mode} / {variant}: {result.get('error')}")
+
+    print_comparison(results)
+
+    success = report.passed
+    print(f"\n🎯 COLD START: {'✅ EVERY ROUTE ANSWERED' if success else '❌ CHECK THE FAILURES ABOVE'}")
+    return finish_report(report, args, success)
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const { promisify } = require('util');
+
+const brotliCompress = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+// Une variante n'est conservée que si elle économise au moins ce ratio
+const MIN_SAVINGS = 0.05;
+
+// Variantes écartées pour gain insuffisant, par source (taille/mtime) : pas recompressées
+// tant que le PDF et le seuil ne changent pas
+const skipsPath = path.join(__dirname, 'public', 'procedures', 'compression-skips.json');
+
+function loadSkips() {
+  try {
+    return JSON.parse(fs.readFileSync(skipsPath, 'utf8'));
+  } catch (error) {
+    return {};
+  }
+}
+
+const ENCODERS = [
+  {
+    extension: '.br',
+    compress: (buffer) => brotliCompress(buffer, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: buffer.length
+      }
+    })
+  },
+  {
+    extension: '.gz',
+    compress: (buffer) => gzip(buffer, { level: zlib.constants.Z_BEST_COMPRESSION })
+  }
+];
+
+async function compressPdfs() {
+  const proceduresDir = path.join(__dirname, 'public', 'procedures');
+  const files = fs.readdirSync(proceduresDir).filter(file => file.toLowerCase().endsWith('.pdf'));
+
+  const previousSkips = loadSkips();
+  const skips = {};
+
+  console.log('🗜️  PRÉCOMPRESSION DES PDF (brotli + gzip)...\n');
+
+  for (const file of files) {
+    const inputPath = path.join(proceduresDir, file);
+    const stats = fs.statSync(inputPath);
+    let buffer = null;
+
+    console.log(`📄 ${file} (${(stats.size / 1024).toFixed(1)}KB)`);
+
+    for (const { extension, compress } of ENCODERS) {
+      const outputPath = inputPath + extension;
+      const variant = file + extension;
+
+      // Variante déjà à jour : rien à refaire
+      if (fs.existsSync(outputPath) && fs.statSync(outputPath).mtimeMs >= stats.mtimeMs) {
+        console.log(`   ⏭️  ${extension} à jour`);
+        continue;
+      }
+
+      // Déjà écartée pour ce contenu et ce seuil
+      const skipped = previousSkips[variant];
+      if (skipped && skipped.size === stats.size && skipped.mtimeMs === stats.mtimeMs && skipped.minSavings === MIN_SAVINGS) {
+        skips[variant] = skipped;
+        console.log(`   ⏭️  ${extension} ignoré (${(skipped.savings * 100).toFixed(1)}% seulement, inchangé)`);
+        continue;
+      }
+
+      try {
+        buffer = buffer || fs.readFileSync(inputPath);
+        const compressed = await compress(buffer);
+        const savings = 1 - compressed.length / buffer.length;
+
+        if (savings < MIN_SAVINGS) {
+          // Gain négligeable : la route servira le PDF brut
+          if (fs.existsSync(outputPath)) fs.unlinkSync(outputPath);
+          skips[variant] = { size: stats.size, mtimeMs: stats.mtimeMs, minSavings: MIN_SAVINGS, savings };
+          console.log(`   ➖ ${extension} ignoré (${(savings * 100).toFixed(1)}% seulement)`);
+          continue;
+        }
+
+        fs.writeFileSync(outputPath, compressed);
+        console.log(`   ✅ ${extension} ${(compressed.length / 1024).toFixed(1)}KB (${(savings * 100).toFixed(1)}% réduction)`);
+      } catch (error) {
+        console.log(`   ❌ Erreur ${extension}: ${error.message}`);
+      }
+    }
+  }
+
+  fs.writeFileSync(skipsPath, JSON.stringify(skips, null, 2) + '\n');
+  console.log('\n🎯 PRÉCOMPRESSION TERMINÉE!');
+}
+
+compressPdfs().catch(console.error);
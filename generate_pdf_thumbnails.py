@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+PDF Thumbnail Generator for public/procedures
+Renders page 1 of every procedure PDF into WebP and AVIF previews at the
+widths of images.deviceSizes (next.config.js), one process per file, and only
+re-renders the PDFs whose content changed since the last run
+
+Requires PyMuPDF (pip install pymupdf) and Pillow
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import next_config
+from procedures import THUMBNAILS_DIR, generate_outputs, procedure_path
+
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+# Used when next.config.js cannot be evaluated (keep in sync with images.deviceSizes)
+FALLBACK_WIDTHS = [640, 750, 828, 1080, 1200, 1920]
+
+# Encoder settings per output format
+FORMATS = {
+    "webp": {"format": "WEBP", "quality": 75, "method": 6},
+    "avif": {"format": "AVIF", "quality": 50, "speed": 6},
+}
+
+def thumbnail_name(filename, width, extension):
+    """GLPI.pdf, 640, webp → GLPI-640.webp (the same scheme as src/lib/pdfThumbnails.js)"""
+    return f"{os.path.splitext(filename)[0]}-{width}.{extension}"
+
+def available_formats():
+    """Output formats this Pillow build can encode"""
+    return [name for name in FORMATS if features.check(name)]
+
+def render_thumbnails(filename, widths, formats):
+    """
+    Render page 1 of one PDF and write every width/format.
+    Runs in a worker process; returns the index entry for the file.
+    """
+    start = time.perf_counter()
+    with pymupdf.open(procedure_path(filename)) as document:
+        page = document[0]
+        # Rendered once at the largest width, then downscaled for the others
+        scale = max(widths) / page.rect.width
+        pixmap = page.get_pixmap(matrix=pymupdf.Matrix(scale, scale), alpha=False)
+        rendered = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+    outputs = {}
+    for width in sorted(widths, reverse=True):
+        height = round(rendered.height * width / rendered.width)
+        image = rendered if width == rendered.width else rendered.resize((width, height), Image.LANCZOS)
+        for extension in formats:
+            options = dict(FORMATS[extension])
+            name = thumbnail_name(filename, width, extension)
+            image.save(os.path.join(THUMBNAILS_DIR, name), options.pop("format"), **options)
+            outputs[name] = {"width": width, "height": height, "bytes": os.path.getsize(os.path.join(THUMBNAILS_DIR, name))}
+
+    return {
+        "width": rendered.width,
+        "height": rendered.height,
+        "outputs": outputs,
+        "render_ms": (time.perf_counter() - start) * 1000,
+    }
+
+def describe(filename, entry):
+    """Line printed once a PDF is rendered"""
+    total = sum(output["bytes"] for output in entry["outputs"].values())
+    return f"{len(entry['outputs'])} thumbnails, {total / 1024:.1f}KB, {entry['render_ms']:.0f}ms"
+
+def main():
+    """Main generator function"""
+    parser = argparse.ArgumentParser(description="Render first-page thumbnails of the procedure PDFs")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="re-render every PDF, even unchanged ones")
+    parser.add_argument("--widths", default=None,
+                        help="comma-separated widths (default: images.deviceSizes from next.config.js)")
+    args = parser.parse_args()
+
+    print("🚀 PDF Thumbnail Generator")
+    print("=" * 60)
+
+    if pymupdf is None or Image is None:
+        print("❌ PyMuPDF and Pillow are required: pip install pymupdf Pillow")
+        return False
+
+    if args.widths:
+        widths = [int(width) for width in args.widths.split(",")]
+    else:
+        try:
+            widths = next_config.device_sizes() or FALLBACK_WIDTHS
+        except RuntimeError as e:
+            print(f"⚠️  Could not read deviceSizes from next.config.js ({e}), using {FALLBACK_WIDTHS}")
+            widths = FALLBACK_WIDTHS
+    formats = available_formats()
+    if "avif" not in formats:
+        print("⚠️  This Pillow build cannot encode AVIF, only WebP is generated")
+    print(f"📐 Widths: {', '.join(map(str, widths))} - formats: {', '.join(formats)} - {args.jobs} workers\n")
+
+    start = time.perf_counter()
+    rendered, errors = generate_outputs(
+        THUMBNAILS_DIR, render_thumbnails, args=(widths, formats),
+        settings={"widths": sorted(widths), "formats": formats},
+        jobs=args.jobs, force=args.force, kind="thumbnails", describe=describe,
+    )
+    print(f"\n🎯 THUMBNAILS: {rendered} PDFs rendered in {time.perf_counter() - start:.1f}s"
+          f"{', ' + str(len(errors)) + ' failed' if errors else ''}")
+    return not errors
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
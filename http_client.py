@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the portfolio test scripts
+Keep-alive connection pooling, configurable BASE_URL, retries with backoff
+and per-request timing hooks
+"""
+
+import itertools
+import os
+import threading
+import time
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import server_timing
+
+# Configuration (overridable through the environment)
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000").rstrip("/")
+DEFAULT_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "10"))
+POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "20"))
+RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.environ.get("HTTP_BACKOFF", "0.3"))
+
+_local = threading.local()
+_hooks = []
+_hooks_lock = threading.Lock()
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+def set_base_url(base_url):
+    """Point every script at another server (e.g. a fixture on a free port)"""
+    global BASE_URL
+    BASE_URL = base_url.rstrip("/")
+    clear_response_cache()
+
+def url(path=""):
+    """Build an absolute URL from a path, leaving absolute URLs untouched"""
+    if path.startswith(("http://", "https://")):
+        return path
+    if path and not path.startswith("/"):
+        path = "/" + path
+    return f"{BASE_URL}{path}"
+
+def api_url(path):
+    """Build an absolute URL under /api"""
+    return url(f"/api/{path.lstrip('/')}")
+
+def new_session(retries=RETRIES, pool_size=POOL_SIZE):
+    """Create a keep-alive session with a connection pool and retry policy"""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def get_session():
+    """Return the calling thread's pooled session (requests.Session is not thread-safe)"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = new_session()
+        _local.session = session
+    return session
+
+def close():
+    """Close the calling thread's session"""
+    session = getattr(_local, "session", None)
+    if session is not None:
+        session.close()
+        _local.session = None
+
+def add_timing_hook(hook):
+    """Register hook(record) called after every request with a timing record dict"""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+def remove_timing_hook(hook):
+    """Unregister a timing hook"""
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+def _emit_timing(record):
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(record)
+
+def record_timing(record):
+    """Report a request made outside the pooled session (e.g. a fresh-connection probe) to the hooks"""
+    _emit_timing(record)
+
+def response_timing(response):
+    """Server-Timing phases and X-Request-Id of a response, for the timing records"""
+    return {
+        "server_timing": server_timing.parse(response.headers.get("Server-Timing")),
+        "request_id": response.headers.get("X-Request-Id"),
+    }
+
+def clear_response_cache():
+    """Forget responses memoized with cached=True"""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+def request(method, path, cached=False, **kwargs):
+    """
+    Send a request through the pooled session and report its timing to the hooks.
+
+    With cached=True, an identical earlier GET in this run is reused instead of
+    downloading the same document again.
+    """
+    full_url = url(path)
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    streamed = kwargs.get("stream", False)
+    cache_key = (method, full_url, kwargs.get("allow_redirects", True))
+    cacheable = cached and method == "GET" and not streamed and not kwargs.get("headers")
+
+    if cacheable:
+        with _response_cache_lock:
+            if cache_key in _response_cache:
+                return _response_cache[cache_key]
+
+    start = time.perf_counter()
+    response = get_session().request(method, full_url, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    _emit_timing({
+        "method": method,
+        "url": full_url,
+        "status": response.status_code,
+        "elapsed": elapsed,
+        "ttfb": response.elapsed.total_seconds(),
+        "bytes": None if streamed else len(response.content),
+        "started": start,
+        **response_timing(response),
+    })
+
+    if cacheable and response.status_code == 200:
+        with _response_cache_lock:
+            _response_cache[cache_key] = response
+    return response
+
+def get(path, cached=False, **kwargs):
+    """GET a path (or absolute URL) through the shared pool"""
+    return request("GET", path, cached=cached, **kwargs)
+
+def head(path, **kwargs):
+    """HEAD a path (or absolute URL) through the shared pool"""
+    kwargs.setdefault("allow_redirects", False)
+    return request("HEAD", path, **kwargs)
+
+def fetch_timed(path, chunk_size=64 * 1024, decode=True, on_chunk=None, **kwargs):
+    """
+    GET a path streaming the body and discarding it, returning a dict with the
+    response, time to first body byte, total time and bytes received, plus the
+    Server-Timing phases and request ID the server sent.
+
+    With decode=False the body is read as sent on the wire (no gzip/br decoding),
+    so bytes reflects the transferred size. on_chunk(chunk, elapsed) is called
+    for every chunk, e.g. to hash the body without keeping it in memory.
+    """
+    full_url = url(path)
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    kwargs["stream"] = True
+
+    start = time.perf_counter()
+    ttfb = None
+    received = 0
+    with get_session().get(full_url, **kwargs) as response:
+        # The first read returns as soon as any body byte arrives instead of
+        # waiting for a full chunk, which on a slow link would inflate the TTFB
+        try:
+            first = response.raw.read1(chunk_size, decode_content=decode)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+        if decode:
+            rest = response.iter_content(chunk_size=chunk_size)
+        else:
+            rest = response.raw.stream(chunk_size, decode_content=False)
+        for chunk in itertools.chain([first] if first else [], rest):
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            received += len(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk, time.perf_counter() - start)
+    total = time.perf_counter() - start
+
+    _emit_timing({
+        "method": "GET",
+        "url": full_url,
+        "status": response.status_code,
+        "elapsed": total,
+        "ttfb": ttfb if ttfb is not None else total,
+        "bytes": received,
+        "started": start,
+        **response_timing(response),
+    })
+
+    return {
+        "response": response,
+        "ttfb": ttfb if ttfb is not None else total,
+        "total": total,
+        "bytes": received,
+        **response_timing(response),
+    }
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Network shaping proxy for the portfolio test scripts
+A local TCP proxy in front of the server under test that imposes the
+bandwidth, latency and packet loss of a mobile connection (3G, 4G, slow
+Wi-Fi), so the suites can measure what a phone would see instead of loopback
+"""
+
+import argparse
+import random
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import http_client
+
+# down/up in kbit/s, round trip in ms, loss as a fraction of segments
+# (3G and 4G as in the WebPageTest connectivity presets)
+NETWORK_PROFILES = {
+    "3g": {"down_kbps": 1600, "up_kbps": 768, "rtt_ms": 300, "loss": 0.0,
+           "description": "3G, 1.6Mbps down, 768Kbps up, 300ms RTT"},
+    "4g": {"down_kbps": 9000, "up_kbps": 9000, "rtt_ms": 170, "loss": 0.0,
+           "description": "4G, 9Mbps, 170ms RTT"},
+    "slow-wifi": {"down_kbps": 2000, "up_kbps": 1000, "rtt_ms": 40, "loss": 0.02,
+                  "description": "congested Wi-Fi, 2Mbps down, 1Mbps up, 40ms RTT, 2% loss"},
+    # No shaping at all, the reference the other profiles are compared to
+    "loopback": {"down_kbps": None, "up_kbps": None, "rtt_ms": 0, "loss": 0.0,
+                 "description": "loopback, no shaping"},
+}
+
+MOBILE_PROFILES = ["3g", "4g", "slow-wifi"]
+
+# Size of the TCP segments the loss is drawn for
+SEGMENT_SIZE = 1460
+
+# Linux never retransmits sooner than this after a timeout
+MIN_RTO_MS = 200
+
+RECV_SIZE = 64 * 1024
+
+def parse_profile(spec):
+    """
+    A profile name, or a custom one as down_kbps/up_kbps/rtt_ms[/loss_pct]
+    (e.g. 5000/1000/80/1). Returns (name, profile).
+    """
+    if spec in NETWORK_PROFILES:
+        return spec, NETWORK_PROFILES[spec]
+    parts = spec.split("/")
+    try:
+        if len(parts) not in (3, 4):
+            raise ValueError
+        down, up, rtt = (float(part) for part in parts[:3])
+        loss = float(parts[3]) / 100 if len(parts) == 4 else 0.0
+    except ValueError:
+        raise ValueError(f"unknown network profile {spec!r}, expected one of "
+                         f"{', '.join(NETWORK_PROFILES)} or down_kbps/up_kbps/rtt_ms[/loss_pct]") from None
+    return spec, {"down_kbps": down, "up_kbps": up, "rtt_ms": rtt, "loss": loss,
+                  "description": f"{down:g}Kbps down, {up:g}Kbps up, {rtt:g}ms RTT, {loss * 100:g}% loss"}
+
+def parse_profiles(value):
+    """Comma-separated profiles for --network, 'mobile' standing for 3g,4g,slow-wifi"""
+    names = []
+    for spec in value.split(","):
+        spec = spec.strip()
+        names.extend(MOBILE_PROFILES if spec == "mobile" else [spec] if spec else [])
+    return [parse_profile(spec) for spec in names]
+
+class Link:
+    """
+    One direction of the shaped connection, shared by every proxied connection
+    like the radio link of a phone: bytes are serialized at the link rate
+    one after the other, then take half the round trip to arrive.
+    """
+
+    def __init__(self, kbps, rtt_ms, loss, rng):
+        self.rate = kbps * 1000 / 8 if kbps else None
+        self.delay = rtt_ms / 2000
+        self.rtt = rtt_ms / 1000
+        self.loss = loss
+        self.rng = rng
+        self.free_at = 0.0
+        self.bytes = 0
+        self.lost = 0
+        self._lock = threading.Lock()
+
+    def schedule(self, size, extra_delay=0.0):
+        """
+        Delivery time of a segment of size bytes handed to the link now.
+
+        A lost segment is resent after the fast-retransmit round trip (or the
+        minimum RTO when the RTT is shorter), and holds up everything behind
+        it as TCP does.
+        """
+        with self._lock:
+            now = time.perf_counter()
+            start = max(now, self.free_at)
+            sent = start + (size / self.rate if self.rate else 0.0)
+            if self.loss and self.rng.random() < self.loss:
+                sent += max(self.rtt, MIN_RTO_MS / 1000)
+                self.lost += 1
+            self.free_at = sent
+            self.bytes += size
+            return sent + self.delay + extra_delay
+
+class Pipe:
+    """
+    Copies one direction of a connection through a Link: a reader thread
+    schedules every segment as it arrives, a writer thread sends each one
+    at its delivery time, so the latency does not cap the throughput.
+    """
+
+    def __init__(self, source, destination, link, handshake=0.0, on_close=None):
+        self.source = source
+        self.destination = destination
+        self.link = link
+        self.handshake = handshake
+        self.on_close = on_close
+        self._queue = deque()
+        self._ready = threading.Condition()
+
+    def start(self):
+        threading.Thread(target=self._read, daemon=True).start()
+        threading.Thread(target=self._write, daemon=True).start()
+
+    def _push(self, due, data):
+        with self._ready:
+            self._queue.append((due, data))
+            self._ready.notify()
+
+    def _read(self):
+        try:
+            while True:
+                data = self.source.recv(RECV_SIZE)
+                if not data:
+                    break
+                for offset in range(0, len(data), SEGMENT_SIZE):
+                    segment = data[offset:offset + SEGMENT_SIZE]
+                    # The first request on a connection also pays for the TCP handshake
+                    self._push(self.link.schedule(len(segment), self.handshake), segment)
+                    self.handshake = 0.0
+        except OSError:
+            pass
+        self._push(self.link.schedule(0), None)
+
+    def _write(self):
+        try:
+            while True:
+                with self._ready:
+                    while not self._queue:
+                        self._ready.wait()
+                    due, data = self._queue.popleft()
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                if data is None:
+                    self.destination.shutdown(socket.SHUT_WR)
+                    break
+                self.destination.sendall(data)
+        except OSError:
+            # The other side went away, drop the whole connection
+            for sock in (self.source, self.destination):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        if self.on_close:
+            self.on_close()
+
+def close_when_done(*sockets, directions=2):
+    """Callback closing the sockets once both directions of the connection are done"""
+    remaining = [directions]
+    lock = threading.Lock()
+
+    def closed():
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        for sock in sockets:
+            sock.close()
+    return closed
+
+class ShapingProxy:
+    """TCP proxy on a free local port forwarding to upstream through a network profile"""
+
+    def __init__(self, upstream, profile, port=None, seed=0):
+        parsed = urlparse(upstream)
+        self.upstream = (parsed.hostname, parsed.port or 80)
+        self.profile = profile
+        rng = random.Random(seed)
+        self.down = Link(profile["down_kbps"], profile["rtt_ms"], profile["loss"], rng)
+        self.up = Link(profile["up_kbps"], profile["rtt_ms"], profile["loss"], rng)
+        self.connections = 0
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(("127.0.0.1", port or 0))
+        self.port = self._listener.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._thread = None
+        self._closed = threading.Event()
+
+    def start(self):
+        self._listener.listen(128)
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._closed.set()
+        try:
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+
+    def stats(self):
+        """Connections opened, bytes carried each way and segments lost"""
+        return {
+            "connections": self.connections,
+            "bytes_down": self.down.bytes,
+            "bytes_up": self.up.bytes,
+            "lost_segments": self.down.lost + self.up.lost,
+        }
+
+    def _accept(self):
+        while not self._closed.is_set():
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                break
+            try:
+                server = socket.create_connection(self.upstream)
+            except OSError:
+                client.close()
+                continue
+            self.connections += 1
+            for sock in (client, server):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            closed = close_when_done(client, server)
+            handshake = self.profile["rtt_ms"] / 1000
+            Pipe(client, server, self.up, handshake, closed).start()
+            Pipe(server, client, self.down, on_close=closed).start()
+
+@contextmanager
+def throttled(name, profile):
+    """
+    Put a shaping proxy in front of the current BASE_URL for the duration of
+    the block and point http_client at it. Yields the proxy.
+    """
+    previous = http_client.BASE_URL
+    proxy = ShapingProxy(previous, profile).start()
+    print(f"📶 {name}: {profile['description']} ({proxy.base_url} → {previous})")
+    http_client.close()
+    http_client.set_base_url(proxy.base_url)
+    try:
+        yield proxy
+    finally:
+        http_client.close()
+        http_client.set_base_url(previous)
+        proxy.stop()
+
+def profiles_argument(value):
+    """argparse type for --network, reporting which profile is unknown"""
+    try:
+        return parse_profiles(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+def add_network_arguments(parser):
+    """Add the network shaping option to a script's argument parser"""
+    group = parser.add_argument_group("network")
+    group.add_argument("--network", metavar="PROFILES", type=profiles_argument, default=None,
+                       help=f"run through a shaping proxy, once per profile: {', '.join(NETWORK_PROFILES)}, "
+                            "'mobile' (3g,4g,slow-wifi) or down_kbps/up_kbps/rtt_ms[/loss_pct]")
+    return parser
+
+def main():
+    """Run a proxy in the foreground so individual scripts can go through it with BASE_URL"""
+    parser = argparse.ArgumentParser(description="Shape the traffic to a portfolio server like a mobile network")
+    parser.add_argument("--profile", default="3g",
+                        help=f"{', '.join(NETWORK_PROFILES)} or down_kbps/up_kbps/rtt_ms[/loss_pct] (default: 3g)")
+    parser.add_argument("--upstream", default=http_client.BASE_URL,
+                        help=f"server to forward to (default: BASE_URL, {http_client.BASE_URL})")
+    parser.add_argument("--port", type=int, default=None, help="port to listen on (default: a free one)")
+    args = parser.parse_args()
+
+    try:
+        name, profile = parse_profile(args.profile)
+    except ValueError as e:
+        print(f"  ❌ {e}")
+        return False
+    proxy = ShapingProxy(args.upstream, profile, args.port).start()
+    print(f"📶 {name}: {profile['description']}")
+    print(f"  BASE_URL={proxy.base_url}  (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+        print(f"  {proxy.stats()}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
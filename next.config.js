@@ -1,10 +1,20 @@
+// Build pré-rendu (npm run build:static, voir build-static.js) : servi sans Node,
+// donc sans l'optimiseur /_next/image
+const STATIC_BUILD = process.env.STATIC_BUILD === '1'
+
+// Réglages du benchmark de démarrage à froid (cold_start_benchmark.py) : build sans
+// optimizePackageImports, dans son propre dossier pour ne pas écraser .next
+const OPTIMIZE_PACKAGE_IMPORTS = process.env.OPTIMIZE_PACKAGE_IMPORTS !== '0'
+const DIST_DIR = process.env.NEXT_DIST_DIR || '.next'
+
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   // Configuration stable et optimisée
+  distDir: DIST_DIR,
 
   // Optimisations légères de performance
   experimental: {
-    optimizePackageImports: ['lucide-react'],
+    optimizePackageImports: OPTIMIZE_PACKAGE_IMPORTS ? ['lucide-react'] : [],
   },
 
   // Configuration des images (conservée, elle fonctionne bien)
@@ -24,6 +34,7 @@ const nextConfig = {
     dangerouslyAllowSVG: true,
     contentSecurityPolicy: "default-src 'self'; script-src 'none'; sandbox;",
     loader: 'default',
+    unoptimized: STATIC_BUILD,
   },
 
   // Compression de base
@@ -68,6 +79,16 @@ const nextConfig = {
           }
         ],
       },
+      // Miniatures des procédures : noms stables, régénérées quand le PDF change
+      {
+        source: '/procedures/thumbnails/:path*',
+        headers: [
+          {
+            key: 'Cache-Control',
+            value: 'public, max-age=86400, stale-while-revalidate=604800'
+          }
+        ],
+      },
       // Cache optimisé pour les images
       {
         source: '/images/:path*',
@@ -83,7 +104,8 @@ const nextConfig = {
 
   // Configuration de base sécurisée
   poweredByHeader: false,
-  generateEtags: false,
+  // ETags sur les pages : les visiteurs qui reviennent reçoivent un 304 au lieu de la page complète
+  generateEtags: true,
   
   // Pas de rewrites complexes
   async rewrites() {
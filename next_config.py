@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Read values from next.config.js
+The config is evaluated with node so the scripts always see what Next.js sees
+"""
+
+import json
+import os
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def evaluate(expression):
+    """
+    Evaluate a JavaScript expression against the config (bound to `config`)
+    and return its JSON value; promises are awaited.
+
+    Raises RuntimeError if node is missing or the expression fails.
+    """
+    script = (
+        "const config = require('./next.config.js');"
+        f"Promise.resolve({expression})"
+        ".then(value => process.stdout.write(JSON.stringify(value ?? null)))"
+    )
+    try:
+        output = subprocess.run(["node", "-e", script], cwd=ROOT_DIR, capture_output=True,
+                                text=True, timeout=30, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"node failed: {e.stderr.strip().splitlines()[-1] if e.stderr.strip() else e}") from e
+    except (OSError, subprocess.SubprocessError) as e:
+        raise RuntimeError(str(e)) from e
+    return json.loads(output)
+
+def headers():
+    """The rules returned by headers()"""
+    return evaluate("config.headers ? config.headers() : []")
+
+def device_sizes():
+    """images.deviceSizes (the widths next/image generates)"""
+    return evaluate("config.images && config.images.deviceSizes") or []
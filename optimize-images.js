@@ -1,53 +1,153 @@
 const sharp = require('sharp');
+const crypto = require('crypto');
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
 
-async function optimizeImages() {
-  const imagesDir = path.join(__dirname, 'public', 'images', 'procedures');
-  const files = fs.readdirSync(imagesDir);
-  
-  console.log('🚀 OPTIMISATION DES IMAGES POUR PERFORMANCE WEB VITALS...\n');
-  
-  for (const file of files) {
-    if (file.match(/\.(jpg|jpeg|png)$/i)) {
-      const inputPath = path.join(imagesDir, file);
-      const outputPath = path.join(imagesDir, `optimized_${file.replace(/\.(jpg|jpeg|png)$/i, '.webp')}`);
-      
-      try {
-        const stats = fs.statSync(inputPath);
-        const originalSize = (stats.size / 1024).toFixed(1);
-        
-        await sharp(inputPath)
-          .webp({ 
-            quality: 75, 
-            effort: 6,
-            preset: 'photo'
-          })
-          .resize(1200, 800, { 
-            fit: 'inside',
-            withoutEnlargement: true 
-          })
-          .toFile(outputPath);
-          
-        const newStats = fs.statSync(outputPath);
-        const newSize = (newStats.size / 1024).toFixed(1);
-        const savings = ((stats.size - newStats.size) / stats.size * 100).toFixed(1);
-        
-        console.log(`✅ ${file}`);
-        console.log(`   📊 ${originalSize}KB → ${newSize}KB (${savings}% réduction)`);
-        console.log(`   📁 Nouveau fichier : optimized_${file.replace(/\.(jpg|jpeg|png)$/i, '.webp')}\n`);
-        
-      } catch (error) {
-        console.log(`❌ Erreur avec ${file}: ${error.message}`);
-      }
+const imagesDir = path.join(__dirname, 'public', 'images', 'procedures');
+const manifestPath = path.join(__dirname, 'src', 'lib', 'optimized-images.json');
+
+// Largeurs du jeu responsive (sous-ensemble de images.deviceSizes de next.config.js)
+const RESPONSIVE_WIDTHS = [640, 828, 1200, 1920];
+
+const FORMATS = {
+  webp: { quality: 75, effort: 4 },
+  avif: { quality: 50, effort: 4 }
+};
+
+// Version historique référencée par les pages : optimized_<nom>.webp, 1200x800 max
+const LEGACY = { width: 1200, height: 800, webp: { quality: 75, effort: 6, preset: 'photo' } };
+
+// Toute modification des réglages invalide le cache
+const SETTINGS_HASH = crypto.createHash('sha256')
+  .update(JSON.stringify({ RESPONSIVE_WIDTHS, FORMATS, LEGACY }))
+  .digest('hex')
+  .slice(0, 12);
+
+// Chaque opération sharp reste sur un thread, le parallélisme se fait entre fichiers
+const CONCURRENCY = Number(process.env.IMAGE_CONCURRENCY) || os.cpus().length;
+sharp.concurrency(1);
+
+function sha256(filePath) {
+  return crypto.createHash('sha256').update(fs.readFileSync(filePath)).digest('hex');
+}
+
+function loadManifest() {
+  try {
+    return JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+  } catch (error) {
+    return { images: {} };
+  }
+}
+
+// Le manifeste sert aussi de cache : même source, mêmes réglages, sorties présentes
+function isUpToDate(entry, hash) {
+  return entry
+    && entry.sourceHash === hash
+    && entry.settings === SETTINGS_HASH
+    && [entry.legacy, ...entry.variants.map(variant => variant.file)]
+      .every(file => fs.existsSync(path.join(imagesDir, file)));
+}
+
+async function optimizeImage(file, hash) {
+  const inputPath = path.join(imagesDir, file);
+  const baseName = file.replace(/\.(jpg|jpeg|png)$/i, '');
+  const source = sharp(inputPath);
+  const { width: sourceWidth, height: sourceHeight } = await source.metadata();
+
+  const legacy = `optimized_${baseName}.webp`;
+  await sharp(inputPath)
+    .resize(LEGACY.width, LEGACY.height, { fit: 'inside', withoutEnlargement: true })
+    .webp(LEGACY.webp)
+    .toFile(path.join(imagesDir, legacy));
+
+  // Jamais d'agrandissement : la plus petite largeur est bornée par la source
+  const widths = [...new Set(RESPONSIVE_WIDTHS.map(width => Math.min(width, sourceWidth)))];
+  const variants = [];
+  for (const width of widths) {
+    const resized = sharp(inputPath).resize({ width, withoutEnlargement: true });
+    for (const [format, options] of Object.entries(FORMATS)) {
+      const output = `optimized_${baseName}-${width}.${format}`;
+      const info = await resized.clone()[format](options).toFile(path.join(imagesDir, output));
+      variants.push({ file: output, format, width: info.width, height: info.height, bytes: info.size });
     }
   }
-  
-  console.log('🎯 OPTIMISATION TERMINÉE!\n');
-  console.log('📈 GAINS ATTENDUS:');
-  console.log('   • LCP (Largest Contentful Paint): 40-60% plus rapide');
-  console.log('   • Économie de bande passante: 60-80%');
-  console.log('   • Score PageSpeed Insights: +20-30 points');
+
+  return {
+    source: file,
+    sourceHash: hash,
+    settings: SETTINGS_HASH,
+    sourceBytes: fs.statSync(inputPath).size,
+    width: sourceWidth,
+    height: sourceHeight,
+    legacy,
+    legacyBytes: fs.statSync(path.join(imagesDir, legacy)).size,
+    variants
+  };
+}
+
+// Exécute les tâches avec au plus `limit` en parallèle
+async function runPool(tasks, limit) {
+  const results = [];
+  let next = 0;
+  const workers = Array.from({ length: Math.min(limit, tasks.length) }, async () => {
+    while (next < tasks.length) {
+      const index = next++;
+      results[index] = await tasks[index]();
+    }
+  });
+  await Promise.all(workers);
+  return results;
+}
+
+async function optimizeImages() {
+  const force = process.argv.includes('--force');
+  const files = fs.readdirSync(imagesDir).filter(file => /\.(jpg|jpeg|png)$/i.test(file)).sort();
+  const manifest = loadManifest();
+  const images = {};
+  const start = Date.now();
+
+  console.log(`🚀 OPTIMISATION DES IMAGES POUR PERFORMANCE WEB VITALS (${CONCURRENCY} en parallèle)...\n`);
+
+  const tasks = files.map(file => async () => {
+    const hash = sha256(path.join(imagesDir, file));
+    const cached = manifest.images[file];
+    if (!force && isUpToDate(cached, hash)) {
+      console.log(`⏭️  ${file} inchangé`);
+      images[file] = cached;
+      return 'skipped';
+    }
+
+    try {
+      const entry = await optimizeImage(file, hash);
+      images[file] = entry;
+      const savings = ((entry.sourceBytes - entry.legacyBytes) / entry.sourceBytes * 100).toFixed(1);
+      console.log(`✅ ${file}`);
+      console.log(`   📊 ${(entry.sourceBytes / 1024).toFixed(1)}KB → ${(entry.legacyBytes / 1024).toFixed(1)}KB (${savings}% réduction)`);
+      console.log(`   📁 ${entry.legacy} + ${entry.variants.length} variantes (${[...new Set(entry.variants.map(v => v.width))].join(', ')}px, webp/avif)\n`);
+      return 'optimized';
+    } catch (error) {
+      console.log(`❌ Erreur avec ${file}: ${error.message}`);
+      // L'ancienne entrée est conservée pour ne pas casser les références
+      if (cached) images[file] = cached;
+      return 'failed';
+    }
+  });
+
+  const results = await runPool(tasks, CONCURRENCY);
+
+  fs.mkdirSync(path.dirname(manifestPath), { recursive: true });
+  fs.writeFileSync(manifestPath, JSON.stringify({ settings: SETTINGS_HASH, images }, null, 2) + '\n');
+
+  const count = status => results.filter(result => result === status).length;
+  console.log(`🎯 OPTIMISATION TERMINÉE en ${((Date.now() - start) / 1000).toFixed(1)}s : ` +
+    `${count('optimized')} optimisées, ${count('skipped')} inchangées, ${count('failed')} en erreur`);
+  console.log(`📇 Manifeste : ${path.relative(__dirname, manifestPath)}`);
+
+  if (count('failed') > 0) process.exitCode = 1;
 }
 
-optimizeImages().catch(console.error);
\ No newline at end of file
+optimizeImages().catch(error => {
+  console.error(error);
+  process.exitCode = 1;
+});
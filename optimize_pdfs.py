@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+PDF Optimization Pipeline for public/procedures
+Linearizes each procedure PDF ("fast web view"), recompresses embedded JPEG
+images, deduplicates identical images and reports sizes and estimated
+first-page latency, like optimize-images.js does for the procedure images
+
+Requires pikepdf (pip install pikepdf); Pillow is optional and only used to
+recompress JPEG images
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from procedures import PROCEDURES_DIR, list_procedure_files, parse_linearization, procedure_path
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "optimized_pdfs")
+
+# A recompressed image is only kept if it saves at least this ratio
+MIN_IMAGE_SAVINGS = 0.10
+
+# Network profile used to estimate when page 1 can render
+DEFAULT_BANDWIDTH_MBPS = 10.0
+DEFAULT_RTT_MS = 50.0
+
+def current_umask():
+    """Process umask (os.umask can only be read by setting it)"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def image_key(image):
+    """Identity of an image XObject: its encoded bytes and the entries that change how they decode"""
+    digest = hashlib.sha256(image.read_raw_bytes())
+    for key in ("/Width", "/Height", "/BitsPerComponent", "/ColorSpace", "/Filter", "/DecodeParms", "/Decode", "/ImageMask"):
+        if key in image:
+            digest.update(f"{key}={image[key]!r}".encode())
+    if "/SMask" in image:
+        digest.update(image_key(image.SMask).encode())
+    return digest.hexdigest()
+
+def iter_image_xobjects(pdf):
+    """Yield (resources XObject dict, name, image) for every image placed on a page or in a form"""
+    seen = set()
+
+    def walk(resources):
+        xobjects = resources.get("/XObject") if resources is not None else None
+        if xobjects is None or xobjects.objgen in seen and xobjects.objgen != (0, 0):
+            return
+        seen.add(xobjects.objgen)
+        for name in list(xobjects.keys()):
+            xobject = xobjects[name]
+            if xobject.get("/Subtype") == "/Image":
+                yield xobjects, name, xobject
+            elif xobject.get("/Subtype") == "/Form":
+                yield from walk(xobject.get("/Resources"))
+
+    for page in pdf.pages:
+        yield from walk(page.obj.get("/Resources"))
+
+def deduplicate_images(pdf):
+    """Point every copy of an identical image at a single object, returning the number of copies dropped"""
+    first = {}
+    dropped = set()
+    for xobjects, name, image in iter_image_xobjects(pdf):
+        key = image_key(image)
+        original = first.setdefault(key, image)
+        if original.objgen != image.objgen:
+            xobjects[name] = original
+            dropped.add(image.objgen)
+    return len(dropped)
+
+def recompress_jpegs(pdf, quality):
+    """Re-encode DCT (JPEG) images with Pillow when it saves enough, returning the bytes saved"""
+    if Image is None:
+        return 0
+    saved = 0
+    done = set()
+    for _, _, image in iter_image_xobjects(pdf):
+        if image.objgen in done or image.get("/Filter") != "/DCTDecode":
+            continue
+        done.add(image.objgen)
+        raw = image.read_raw_bytes()
+        try:
+            decoded = Image.open(io.BytesIO(raw))
+            # CMYK/Adobe JPEGs can come back inverted, leave them untouched
+            if decoded.mode not in ("L", "RGB"):
+                continue
+            buffer = io.BytesIO()
+            decoded.save(buffer, format="JPEG", quality=quality, optimize=True)
+        except OSError:
+            continue
+        encoded = buffer.getvalue()
+        if len(encoded) <= len(raw) * (1 - MIN_IMAGE_SAVINGS):
+            image.write(encoded, filter=pikepdf.Name.DCTDecode)
+            saved += len(raw) - len(encoded)
+    return saved
+
+def first_page_bytes(path):
+    """Bytes a viewer needs before page 1 can render: /E when linearized, the whole file otherwise"""
+    with open(path, "rb") as f:
+        linearization = parse_linearization(f.read(1024))
+    size = os.path.getsize(path)
+    if linearization and linearization["first_page_end"] and linearization["length"] == size:
+        return linearization["first_page_end"], True
+    return size, False
+
+def estimate_ms(size, bandwidth_mbps, rtt_ms):
+    """Transfer time of size bytes over the network profile"""
+    return rtt_ms + size * 8 / (bandwidth_mbps * 1e6) * 1000
+
+def optimize_pdf(input_path, output_path, jpeg_quality):
+    """Optimize one PDF into output_path, returning what was done"""
+    with pikepdf.open(input_path) as pdf:
+        duplicates = deduplicate_images(pdf)
+        image_savings = recompress_jpegs(pdf, jpeg_quality)
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            output_path,
+            linearize=True,
+            compress_streams=True,
+            recompress_flate=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+    return {"duplicate_images": duplicates, "image_bytes_saved": image_savings}
+
+def run_pipeline(output_dir, in_place, jpeg_quality, bandwidth_mbps, rtt_ms):
+    """Optimize every procedure PDF and collect the size / first-page report"""
+    report = {}
+    os.makedirs(output_dir, exist_ok=True)
+
+    for filename in list_procedure_files():
+        input_path = procedure_path(filename)
+        output_path = os.path.join(output_dir, filename)
+        before_size = os.path.getsize(input_path)
+        before_first, _ = first_page_bytes(input_path)
+        print(f"📄 {filename} ({before_size / 1024:.1f}KB)")
+
+        temp_path = None
+        try:
+            # Written next to the output then renamed, so a failure never leaves a truncated PDF
+            fd, temp_path = tempfile.mkstemp(suffix=".pdf", dir=output_dir)
+            os.close(fd)
+            actions = optimize_pdf(input_path, temp_path, jpeg_quality)
+            # mkstemp creates 0600: give the output the usual mode so a web server can read it
+            os.chmod(temp_path, 0o666 & ~current_umask())
+            os.replace(temp_path, output_path)
+        except Exception as e:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            print(f"   ❌ Error: {str(e)}")
+            report[filename] = {"error": str(e)}
+            continue
+
+        after_size = os.path.getsize(output_path)
+        after_first, linearized = first_page_bytes(output_path)
+        entry = {
+            **actions,
+            "before_bytes": before_size,
+            "after_bytes": after_size,
+            "linearized": linearized,
+            "first_page_bytes_before": before_first,
+            "first_page_bytes_after": after_first,
+            "first_page_ms_before": estimate_ms(before_first, bandwidth_mbps, rtt_ms),
+            "first_page_ms_after": estimate_ms(after_first, bandwidth_mbps, rtt_ms),
+        }
+        report[filename] = entry
+
+        print(f"   📊 {before_size / 1024:.1f}KB → {after_size / 1024:.1f}KB "
+              f"({(1 - after_size / before_size) * 100:.1f}% reduction), "
+              f"{actions['duplicate_images']} duplicate images, "
+              f"{actions['image_bytes_saved'] / 1024:.1f}KB saved on JPEGs")
+        print(f"   ⚡ First page after {after_first / 1024:.1f}KB instead of {before_first / 1024:.1f}KB "
+              f"(~{entry['first_page_ms_after']:.0f}ms instead of ~{entry['first_page_ms_before']:.0f}ms)")
+
+        if in_place:
+            # Contents only, the original keeps its mode; same mtime as the output,
+            # so compress-pdfs.js and the manifest see a new version
+            shutil.copyfile(output_path, input_path)
+            stat = os.stat(output_path)
+            os.utime(input_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    return report
+
+def print_summary(report, bandwidth_mbps, rtt_ms):
+    """Size and first-page table over all files"""
+    print("\n" + "=" * 60)
+    print(f"📊 PDF OPTIMIZATION SUMMARY ({bandwidth_mbps:g} Mbit/s, {rtt_ms:g}ms RTT)")
+    print("=" * 60)
+    print(f"{'File':<24}{'Before':>10}{'After':>10}{'Page 1 before':>15}{'Page 1 after':>14}")
+    for filename, entry in report.items():
+        if "error" in entry:
+            print(f"{filename:<24}{'error':>10}")
+            continue
+        print(f"{filename:<24}{entry['before_bytes'] / 1024:>8.0f}KB{entry['after_bytes'] / 1024:>8.0f}KB"
+              f"{entry['first_page_ms_before']:>13.0f}ms{entry['first_page_ms_after']:>12.0f}ms")
+
+    done = [entry for entry in report.values() if "error" not in entry]
+    before = sum(entry["before_bytes"] for entry in done)
+    after = sum(entry["after_bytes"] for entry in done)
+    if before:
+        print(f"{'TOTAL':<24}{before / 1024:>8.0f}KB{after / 1024:>8.0f}KB ({(1 - after / before) * 100:.1f}% reduction)")
+
+def main():
+    """Main pipeline function"""
+    parser = argparse.ArgumentParser(description="Linearize and optimize the procedure PDFs")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"where optimized PDFs are written (default: {os.path.relpath(DEFAULT_OUTPUT_DIR)})")
+    parser.add_argument("--in-place", action="store_true",
+                        help=f"also replace the originals in {os.path.relpath(PROCEDURES_DIR)}")
+    parser.add_argument("--jpeg-quality", type=int, default=80, help="JPEG re-encoding quality (default: 80)")
+    parser.add_argument("--bandwidth", type=float, default=DEFAULT_BANDWIDTH_MBPS,
+                        help=f"Mbit/s used to estimate first-page latency (default: {DEFAULT_BANDWIDTH_MBPS:g})")
+    parser.add_argument("--rtt", type=float, default=DEFAULT_RTT_MS,
+                        help=f"round-trip time in ms for the estimate (default: {DEFAULT_RTT_MS:g})")
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    args = parser.parse_args()
+
+    print("🚀 PDF Optimization Pipeline")
+    print("=" * 60)
+
+    if pikepdf is None:
+        print("❌ pikepdf is required: pip install pikepdf")
+        return False
+    if Image is None:
+        print("⚠️  Pillow not installed, JPEG images are kept as-is (pip install Pillow)")
+
+    report = run_pipeline(args.output_dir, args.in_place, args.jpeg_quality, args.bandwidth, args.rtt)
+    print_summary(report, args.bandwidth, args.rtt)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 JSON report written to {args.json}")
+    if args.in_place:
+        print("\n🔁 Originals replaced: run `npm run compress:pdfs && npm run manifest:pdfs` to refresh variants and manifest")
+
+    failed = [filename for filename, entry in report.items() if "error" in entry or not entry["linearized"]]
+    print(f"\n🎯 LINEARIZATION: {'✅ ALL FILES LINEARIZED' if not failed else '❌ FAILED: ' + ', '.join(failed)}")
+    return not failed
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Page-Weight Audit for Next.js Portfolio Application
+Fetches every page route of src/app, parses the HTML and measures what a
+browser would download: HTML, JS chunks, CSS and images (transfer sizes), plus
+the server response time, and fails on the budgets of page-budgets.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, unquote, urljoin, urlparse
+
+import requests
+
+import http_client
+from server_fixture import discover_pages
+from suite_report import SuiteReport, add_report_arguments, finish_report, positive_int
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "page-budgets.json")
+
+# Responsive set written by optimize-images.js and the page whose hero renders it through <picture>
+IMAGES_MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "lib", "optimized-images.json")
+RESPONSIVE_ROUTE = "/accueil"
+
+# What a current browser advertises, so sizes match real transfers
+BROWSER_HEADERS = {
+    "Accept-Encoding": "br, gzip",
+    "Accept": "image/avif,image/webp,*/*",
+}
+
+# srcset candidate a desktop browser would pick (1280px viewport, DPR 1)
+VIEWPORT_WIDTH = 1280
+
+class PageAssets(HTMLParser):
+    """Collects the scripts, stylesheets and images referenced by a page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.scripts = []
+        self.stylesheets = []
+        self.images = []
+        self.sources = []
+        self.inline_script_bytes = 0
+        self._in_inline_script = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script":
+            if attrs.get("src"):
+                self.scripts.append(attrs["src"])
+            else:
+                self._in_inline_script = True
+        elif tag == "link":
+            rel = (attrs.get("rel") or "").lower().split()
+            if "stylesheet" in rel and attrs.get("href"):
+                self.stylesheets.append(attrs["href"])
+            elif "preload" in rel and attrs.get("as") == "script" and attrs.get("href"):
+                self.scripts.append(attrs["href"])
+        elif tag == "img":
+            src = pick_candidate(attrs.get("srcset")) or attrs.get("src")
+            if src and not src.startswith("data:"):
+                self.images.append({"src": src, "lazy": attrs.get("loading") == "lazy"})
+        elif tag == "source" and attrs.get("srcset"):
+            self.sources.append({"type": attrs.get("type"), "srcset": attrs["srcset"]})
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_inline_script = False
+
+    def handle_data(self, data):
+        # Inline scripts carry the React Server Components payload (self.__next_f.push)
+        if self._in_inline_script:
+            self.inline_script_bytes += len(data.encode())
+
+def pick_candidate(srcset):
+    """URL of the srcset candidate a browser at VIEWPORT_WIDTH would choose"""
+    if not srcset:
+        return None
+    candidates = []
+    for entry in srcset.split(","):
+        parts = entry.strip().split()
+        if not parts:
+            continue
+        descriptor = parts[1] if len(parts) > 1 else "1x"
+        if descriptor.endswith("w"):
+            candidates.append((int(descriptor[:-1]), parts[0]))
+        else:
+            candidates.append((float(descriptor[:-1]) * VIEWPORT_WIDTH, parts[0]))
+    candidates.sort()
+    for width, url in candidates:
+        if width >= VIEWPORT_WIDTH:
+            return url
+    return candidates[-1][1] if candidates else None
+
+def srcset_urls(srcset):
+    """Every candidate URL of a srcset"""
+    return [entry.strip().split()[0] for entry in srcset.split(",") if entry.strip()]
+
+def image_source(src):
+    """The file behind an image URL: /_next/image?url=... is unwrapped to the original path"""
+    parsed = urlparse(src)
+    if parsed.path == "/_next/image":
+        return unquote(parse_qs(parsed.query).get("url", [""])[0])
+    return parsed.path if not parsed.netloc else src
+
+def is_optimized(source):
+    """Local procedure images must be the optimized_* output of optimize-images.js"""
+    if not source.startswith("/images/"):
+        return True
+    return os.path.basename(source).startswith("optimized_")
+
+class AssetCache:
+    """Transfer size of each asset, fetched once even when shared by several pages"""
+
+    def __init__(self):
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def size(self, url):
+        with self._lock:
+            if url in self._sizes:
+                return self._sizes[url]
+        try:
+            fetched = http_client.fetch_timed(url, decode=False, headers=BROWSER_HEADERS)
+            size = fetched["bytes"] if fetched["response"].status_code == 200 else None
+        except requests.exceptions.RequestException:
+            size = None
+        with self._lock:
+            self._sizes[url] = size
+        return size
+
+_assets = AssetCache()
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+def budget_for(budgets, route):
+    return {**budgets["default"], **budgets.get("routes", {}).get(route, {})}
+
+def audit_route(route, repeats=3):
+    """Measure one page and everything it references"""
+    page_url = http_client.url(route)
+    timings = []
+    for _ in range(repeats):
+        fetched = http_client.fetch_timed(route, decode=False, headers=BROWSER_HEADERS)
+        timings.append(fetched)
+    response = timings[-1]["response"]
+    if response.status_code != 200:
+        return {"route": route, "status": response.status_code, "error": f"HTTP {response.status_code}"}
+
+    html = http_client.get(route, cached=True).text
+    parser = PageAssets()
+    parser.feed(html)
+
+    def sizes(urls):
+        resolved = {urljoin(page_url, url) for url in urls}
+        found = {url: _assets.size(url) for url in sorted(resolved)}
+        return found, [url for url, size in found.items() if size is None]
+
+    scripts, missing_scripts = sizes(parser.scripts)
+    styles, missing_styles = sizes(parser.stylesheets)
+    images = []
+    for image in parser.images:
+        url = urljoin(page_url, image["src"])
+        source = image_source(image["src"])
+        # Third-party images (not proxied by /_next/image) are not ours to budget
+        external = urlparse(url).netloc != urlparse(page_url).netloc
+        images.append({
+            "url": url,
+            "source": source,
+            "bytes": None if external else _assets.size(url),
+            "lazy": image["lazy"],
+            "external": external,
+            "optimized": is_optimized(source),
+        })
+
+    return {
+        "route": route,
+        "status": response.status_code,
+        "html_bytes": timings[-1]["bytes"],
+        "html_decoded_bytes": len(html.encode()),
+        "inline_script_bytes": parser.inline_script_bytes,
+        "js_chunks": len(scripts),
+        "js_bytes": sum(size or 0 for size in scripts.values()),
+        "css_files": len(styles),
+        "css_bytes": sum(size or 0 for size in styles.values()),
+        "images": images,
+        "image_bytes": sum(image["bytes"] or 0 for image in images),
+        "unoptimized_images": [image["source"] for image in images if not image["optimized"]],
+        "missing_assets": missing_scripts + missing_styles + [
+            image["url"] for image in images if image["bytes"] is None and not image["external"]
+        ],
+        "ttfb_ms": statistics.median(timing["ttfb"] for timing in timings) * 1000,
+        "response_ms": statistics.median(timing["total"] for timing in timings) * 1000,
+    }
+
+def check_budget(result, budget):
+    """List the budget overruns of one audited page"""
+    measured = {
+        "html_kb": result["html_bytes"] / 1024,
+        "js_kb": result["js_bytes"] / 1024,
+        "js_chunks": result["js_chunks"],
+        "css_kb": result["css_bytes"] / 1024,
+        "images_kb": result["image_bytes"] / 1024,
+        "unoptimized_images": len(result["unoptimized_images"]),
+        "response_ms": result["response_ms"],
+    }
+    return [
+        f"{key} {measured[key]:.1f} > {limit}"
+        for key, limit in budget.items()
+        if key in measured and measured[key] > limit
+    ]
+
+def page_routes():
+    """Page routes of src/app, without / which only redirects"""
+    return sorted(route for route in discover_pages() if route != "/")
+
+def audit_page(route, budget, repeats=3):
+    """Audit one page and apply its budget"""
+    print(f"🔍 Auditing {route}...")
+    try:
+        result = audit_route(route, repeats)
+    except requests.exceptions.RequestException as e:
+        return {"route": route, "success": False, "error": f"Connection error: {str(e)}"}
+    if "error" in result:
+        return {**result, "success": False}
+
+    result["overruns"] = check_budget(result, budget)
+    if result["missing_assets"]:
+        result["overruns"].append(f"{len(result['missing_assets'])} assets not found")
+    for overrun in result["overruns"]:
+        print(f"  ❌ {overrun}")
+    result["success"] = not result["overruns"]
+    if result["overruns"]:
+        result["error"] = "; ".join(result["overruns"])
+    return result
+
+def audit_pages(routes=None, budgets=None, repeats=3):
+    """Audit every page route, returning per-route results"""
+    budgets = budgets or load_budgets()
+    return {route: audit_page(route, budget_for(budgets, route), repeats) for route in routes or page_routes()}
+
+def test_page_budgets():
+    """Every page stays within page-budgets.json"""
+    pages = audit_pages()
+    failed = [route for route, page in pages.items() if not page["success"]]
+    return {"success": not failed, "failed": failed, "pages": pages}
+
+def test_responsive_images(route=RESPONSIVE_ROUTE):
+    """The responsive set of optimize-images.js is rendered as <picture> sources that resolve"""
+    print(f"\n🔍 Testing responsive images on {route}...")
+    results = {"success": True, "skipped": False, "sources": 0, "issues": []}
+
+    try:
+        with open(IMAGES_MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {"images": {}}
+    variants = {variant["file"] for entry in manifest["images"].values() for variant in entry["variants"]}
+    if not variants:
+        print("  ⚠️ No responsive set in src/lib/optimized-images.json (run `npm run optimize:images`)")
+        results["skipped"] = True
+        return results
+
+    try:
+        response = http_client.get(route, cached=True)
+        if response.status_code != 200:
+            print(f"  ❌ {route} returned HTTP {response.status_code}")
+            return {**results, "success": False, "error": f"HTTP {response.status_code}"}
+        parser = PageAssets()
+        parser.feed(response.text)
+
+        rendered = [
+            source for source in parser.sources
+            if any(os.path.basename(urlparse(url).path) in variants for url in srcset_urls(source["srcset"]))
+        ]
+        results["sources"] = len(rendered)
+        if not rendered:
+            results["issues"].append(f"no <picture> source from the responsive set on {route}")
+        for source in rendered:
+            for url in srcset_urls(source["srcset"]):
+                status = http_client.head(url).status_code
+                if status != 200:
+                    results["issues"].append(f"{url}: HTTP {status}")
+    except requests.exceptions.RequestException as e:
+        print(f"  ❌ Connection error: {str(e)}")
+        return {**results, "success": False, "error": f"Connection error: {str(e)}"}
+
+    for issue in results["issues"]:
+        print(f"  ❌ {issue}")
+    if not results["issues"]:
+        print(f"  ✅ {results['sources']} <picture> sources rendered, every candidate resolves")
+    results["success"] = not results["issues"]
+    return results
+
+def print_table(pages):
+    print("\n" + "=" * 100)
+    print("📊 PAGE WEIGHT (transfer sizes)")
+    print("=" * 100)
+    print(f"{'Route':<26}{'HTML':>8}{'RSC':>8}{'JS':>12}{'CSS':>8}{'Images':>13}{'TTFB':>9}{'Total':>9}  Budget")
+    for route, page in pages.items():
+        if "html_bytes" not in page:
+            print(f"{route:<26}❌ {page['error']}")
+            continue
+        print(f"{route:<26}{page['html_bytes'] / 1024:>6.1f}KB{page['inline_script_bytes'] / 1024:>6.1f}KB"
+              f"{page['js_bytes'] / 1024:>7.0f}KB/{page['js_chunks']:<3}{page['css_bytes'] / 1024:>6.1f}KB"
+              f"{page['image_bytes'] / 1024:>8.0f}KB/{len(page['images']):<3}"
+              f"{page['ttfb_ms']:>7.1f}ms{page['response_ms']:>7.1f}ms  {'✅' if page['success'] else '❌'}")
+        for source in page["unoptimized_images"]:
+            print(f"{'':<26}⚠️  not optimized: {source}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Page weight and response time audit of every app route")
+    parser.add_argument("--budgets", default=BUDGETS_PATH, help="budget file (default: page-budgets.json)")
+    parser.add_argument("--repeats", type=positive_int, default=3, help="HTML fetches per route for the median time (default: 3)")
+    parser.add_argument("--route", action="append", help="audit only this route (repeatable)")
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Main audit function"""
+    args = args or parse_args([])
+    report = SuiteReport("page-weight")
+    report.start_server_metrics()
+
+    print("🚀 Starting Page-Weight Audit for Next.js Portfolio")
+    print("=" * 60)
+
+    budgets = load_budgets(args.budgets)
+    pages = {}
+    for route in args.route or page_routes():
+        page = pages[route] = report.run(f"audit:{route}", audit_page, route, budget_for(budgets, route), args.repeats)
+        if "html_bytes" not in page:
+            continue
+        report.add_metric(f"page.{route}.html_bytes", page["html_bytes"], unit="bytes")
+        report.add_metric(f"page.{route}.js_bytes", page["js_bytes"], unit="bytes")
+        report.add_metric(f"page.{route}.css_bytes", page["css_bytes"], unit="bytes")
+        report.add_metric(f"page.{route}.image_bytes", page["image_bytes"], unit="bytes")
+        report.add_metric(f"page.{route}.ttfb_ms", page["ttfb_ms"])
+
+    print_table(pages)
+    report.run("test_responsive_images", test_responsive_images)
+    success = report.passed
+    print(f"\n🎯 PAGE BUDGETS: {'✅ ALL ROUTES WITHIN BUDGET' if success else '❌ BUDGET EXCEEDED'}")
+    return finish_report(report, args, success)
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
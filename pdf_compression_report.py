@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Precompressed PDF Delivery Report
+Lists original/br/gz sizes of every procedure PDF and measures the transfer
+time of /api/pdf/[filename] for each negotiated Content-Encoding
+"""
+
+import argparse
+import os
+import sys
+
+import requests
+
+import http_client
+from procedures import list_procedure_files, procedure_path
+
+ENCODINGS = [
+    ("identity", None),
+    ("br", ".br"),
+    ("gzip", ".gz"),
+]
+
+def variant_size(filename, extension):
+    """Size of a precompressed sibling on disk, or None if it was not generated"""
+    if extension is None:
+        return os.path.getsize(procedure_path(filename))
+    path = procedure_path(filename) + extension
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+def measure_encoding(filename, encoding, repeats):
+    """Median transfer time and wire bytes of /api/pdf/[filename] for one Accept-Encoding"""
+    url = http_client.api_url(f"pdf/{filename}")
+    samples = []
+    for _ in range(repeats):
+        samples.append(http_client.fetch_timed(url, decode=False, headers={"Accept-Encoding": encoding}))
+    samples.sort(key=lambda sample: sample["total"])
+    median = samples[len(samples) // 2]
+    response = median["response"]
+    return {
+        "status": response.status_code,
+        "content_encoding": response.headers.get("Content-Encoding", "identity"),
+        "content_length": int(response.headers.get("Content-Length", median["bytes"])),
+        "vary": response.headers.get("Vary", ""),
+        "bytes": median["bytes"],
+        "total_ms": median["total"] * 1000,
+    }
+
+def build_report(repeats=3):
+    """Collect on-disk sizes and measured transfers for every procedure"""
+    report = {}
+    for filename in list_procedure_files():
+        entry = {"sizes": {}, "transfers": {}, "issues": []}
+        for encoding, extension in ENCODINGS:
+            entry["sizes"][encoding] = variant_size(filename, extension)
+            try:
+                transfer = measure_encoding(filename, encoding, repeats)
+            except requests.exceptions.RequestException as e:
+                entry["issues"].append(f"{encoding}: connection error {str(e)}")
+                continue
+            entry["transfers"][encoding] = transfer
+
+            # The route must serve the variant that exists on disk, with matching length
+            expected = encoding if entry["sizes"][encoding] is not None else "identity"
+            if transfer["content_encoding"] != expected:
+                entry["issues"].append(f"{encoding}: served {transfer['content_encoding']}, expected {expected}")
+            elif transfer["bytes"] != transfer["content_length"]:
+                entry["issues"].append(f"{encoding}: Content-Length {transfer['content_length']} != {transfer['bytes']} bytes received")
+            if "accept-encoding" not in transfer["vary"].lower():
+                entry["issues"].append(f"{encoding}: missing Vary: Accept-Encoding")
+        report[filename] = entry
+    return report
+
+def print_report(report):
+    """Print size and transfer tables"""
+    def kb(size):
+        return f"{size / 1024:.1f}KB" if size is not None else "-"
+
+    def saving(size, original):
+        return f"({(1 - size / original) * 100:.1f}%)" if size is not None and original else ""
+
+    print(f"\n{'File':<24}{'Original':>11}{'br':>11}{'':>8}{'gz':>11}{'':>8}{'identity':>11}{'br':>10}{'gzip':>10}")
+    totals = {encoding: 0 for encoding, _ in ENCODINGS}
+    for filename, entry in report.items():
+        sizes = entry["sizes"]
+        original = sizes["identity"]
+        for encoding in totals:
+            totals[encoding] += sizes[encoding] if sizes[encoding] is not None else original
+        times = [
+            f"{entry['transfers'][encoding]['total_ms']:.1f}ms" if encoding in entry["transfers"] else "-"
+            for encoding, _ in ENCODINGS
+        ]
+        print(
+            f"{filename:<24}{kb(original):>11}{kb(sizes['br']):>11}{saving(sizes['br'], original):>8}"
+            f"{kb(sizes['gzip']):>11}{saving(sizes['gzip'], original):>8}"
+            f"{times[0]:>11}{times[1]:>10}{times[2]:>10}"
+        )
+    print(
+        f"{'TOTAL':<24}{kb(totals['identity']):>11}{kb(totals['br']):>11}{saving(totals['br'], totals['identity']):>8}"
+        f"{kb(totals['gzip']):>11}{saving(totals['gzip'], totals['identity']):>8}"
+    )
+
+def main():
+    """Main report function"""
+    parser = argparse.ArgumentParser(description="Report precompressed PDF sizes and transfer times")
+    parser.add_argument("--repeats", type=int, default=3, help="fetches per file and encoding (default: 3)")
+    args = parser.parse_args()
+
+    print("🚀 Precompressed PDF Delivery Report")
+    print("=" * 60)
+
+    if not any(size is not None for f in list_procedure_files() for size in (variant_size(f, ".br"), variant_size(f, ".gz"))):
+        print("⚠️  No .br/.gz variants found, run `npm run compress:pdfs` first")
+
+    report = build_report(args.repeats)
+    print_report(report)
+
+    issues = [f"{filename} - {issue}" for filename, entry in report.items() for issue in entry["issues"]]
+    if issues:
+        print(f"\n❌ Delivery issues:")
+        for issue in issues:
+            print(f"  - {issue}")
+
+    print(f"\n🎯 CONTENT NEGOTIATION: {'✅ CORRECT' if not issues else '❌ ISSUES DETECTED'}")
+    return not issues
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
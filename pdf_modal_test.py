@@ -4,24 +4,34 @@ Advanced PDF Modal Testing - Simulating Frontend Behavior
 Tests iframe loading and CSP compliance for PDF modal functionality
 """
 
+import argparse
 import requests
+import http_client
+from procedures import (
+    PAGES_DIR, PDF_MAGIC, THUMBNAILS_DIR, count_page_objects, list_procedure_files, procedure_manifest,
+    verify_pdf_download,
+)
+from suite_report import SuiteReport, add_report_arguments, finish_report
+import hashlib
 import json
+import os
+import statistics
 import sys
 import time
 from urllib.parse import urljoin
 
-# Configuration
-BASE_URL = "http://localhost:3000"
-API_BASE = f"{BASE_URL}/api"
+# Width of the preview requested first by the modal (first entry of images.deviceSizes)
+SMALLEST_THUMBNAIL = 640
 
 def test_iframe_pdf_loading():
     """Test PDF loading in iframe context (simulating frontend modal behavior)"""
     print("🔍 Testing PDF Loading in iframe Context...")
     
-    test_files = ["VLAN_Interco.pdf", "Zabbix.pdf", "Active_Directory.pdf"]
+    test_files = list(procedure_manifest())
     results = {
         "direct_access": 0,
         "api_access": 0,
+        "total_tested": len(test_files),
         "csp_compliant": True,
         "issues": []
     }
@@ -30,9 +40,9 @@ def test_iframe_pdf_loading():
         print(f"\n  Testing: {filename}")
         
         # Test direct access (how frontend might try to load)
+        # HEAD only: the headers are what matters here, the bodies are verified by the modal simulation
         try:
-            direct_url = f"{BASE_URL}/procedures/{filename}"
-            response = requests.get(direct_url, timeout=10)
+            response = http_client.head(f"/procedures/{filename}")
             
             if response.status_code == 200:
                 results["direct_access"] += 1
@@ -56,8 +66,7 @@ def test_iframe_pdf_loading():
         
         # Test API access
         try:
-            api_url = f"{API_BASE}/pdf/{filename}"
-            response = requests.get(api_url, timeout=10)
+            response = http_client.head(http_client.api_url(f"pdf/{filename}"))
             
             if response.status_code == 200:
                 results["api_access"] += 1
@@ -77,19 +86,18 @@ def test_iframe_pdf_loading():
             results["issues"].append(f"{filename} - API access error: {str(e)}")
             print(f"    ❌ API access error: {str(e)}")
     
+    # At least two thirds of the manifest's files must load each way
+    results["success"] = (results["direct_access"] >= 2 / 3 * len(test_files) and
+                          results["api_access"] >= 2 / 3 * len(test_files))
+    
     return results
 
 def test_pdf_modal_simulation():
     """Simulate the exact behavior of the PDF modal component"""
     print("\n🔍 Simulating PDF Modal Component Behavior...")
     
-    # Test the specific files mentioned in the test_result.md
-    modal_test_files = [
-        "VLAN_Interco.pdf",
-        "Zabbix.pdf", 
-        "Active_Directory.pdf",
-        "GLPI.pdf"
-    ]
+    # Every PDF of the asset manifest (public/procedures)
+    modal_test_files = list(procedure_manifest())
     
     results = {
         "modal_compatible": 0,
@@ -103,9 +111,9 @@ def test_pdf_modal_simulation():
         
         # Test multiple loading strategies that the modal might use
         strategies = [
-            ("Direct /procedures/", f"{BASE_URL}/procedures/{filename}"),
-            ("API endpoint", f"{API_BASE}/pdf/{filename}"),
-            ("With iframe params", f"{BASE_URL}/procedures/{filename}#toolbar=1&navpanes=1&scrollbar=1&zoom=fit")
+            ("Direct /procedures/", http_client.url(f"/procedures/{filename}")),
+            ("API endpoint", http_client.api_url(f"pdf/{filename}")),
+            ("With iframe params", http_client.url(f"/procedures/{filename}#toolbar=1&navpanes=1&scrollbar=1&zoom=fit"))
         ]
         
         file_working = False
@@ -113,18 +121,25 @@ def test_pdf_modal_simulation():
         for strategy_name, url in strategies:
             try:
                 print(f"    Testing {strategy_name}: {url}")
-                response = requests.get(url, timeout=10)
+                # Streamed and hashed chunk by chunk: memory stays flat whatever the PDF size
+                download = verify_pdf_download(url, filename)
+                response = download["response"]
                 
                 if response.status_code == 200:
                     content_type = response.headers.get('Content-Type', '')
-                    content_length = response.headers.get('Content-Length', '0')
                     
-                    if 'application/pdf' in content_type and int(content_length) > 1000:
-                        print(f"      ✅ {strategy_name} - PDF loaded successfully ({content_length} bytes)")
+                    if 'application/pdf' in content_type and download["verified"]:
+                        throughput = download["throughput_mbps"]
+                        print(f"      ✅ {strategy_name} - PDF loaded and verified ({download['bytes']} bytes"
+                              f"{f', {throughput:.1f}MB/s' if throughput else ''})")
                         file_working = True
                         break
+                    elif 'application/pdf' not in content_type:
+                        print(f"      ❌ {strategy_name} - Invalid content type: {content_type}")
                     else:
-                        print(f"      ❌ {strategy_name} - Invalid content type or size")
+                        print(f"      ❌ {strategy_name} - Content does not match the file on disk "
+                              f"(PDF header: {download['is_pdf']}, size: {download['size_matches']}, "
+                              f"SHA-256: {download['sha256_matches']})")
                 else:
                     print(f"      ❌ {strategy_name} - HTTP {response.status_code}")
                     
@@ -137,6 +152,8 @@ def test_pdf_modal_simulation():
         else:
             results["loading_issues"].append(filename)
     
+    results["success"] = results["modal_compatible"] >= 0.75 * len(modal_test_files)
+    
     return results
 
 def test_csp_iframe_compatibility():
@@ -144,7 +161,7 @@ def test_csp_iframe_compatibility():
     print("\n🔍 Testing CSP Configuration for iframe Compatibility...")
     
     try:
-        response = requests.get(BASE_URL, timeout=10)
+        response = http_client.get("/", cached=True)
         csp = response.headers.get('Content-Security-Policy', '')
         
         print(f"  Current CSP: {csp}")
@@ -180,29 +197,292 @@ def test_csp_iframe_compatibility():
         print(f"    ❌ Error checking CSP: {str(e)}")
         return False
 
-def main():
+def test_pdf_revalidation():
+    """Test ETag / Last-Modified revalidation (304) over every procedure and measure bytes saved"""
+    print("\n🔍 Testing PDF Revalidation (ETag / If-None-Match / If-Modified-Since)...")
+    
+    results = {
+        "success": True,
+        "files_tested": 0,
+        "not_modified": 0,
+        "first_pass_bytes": 0,
+        "second_pass_bytes": 0,
+        "issues": []
+    }
+    
+    def issue(filename, message):
+        results["success"] = False
+        results["issues"].append(f"{filename} - {message}")
+        print(f"    ❌ {message}")
+    
+    for filename in list_procedure_files():
+        print(f"\n  Testing: {filename}")
+        url = http_client.api_url(f"pdf/{filename}")
+        results["files_tested"] += 1
+        
+        try:
+            # First visit: full download, validators recorded
+            first = http_client.fetch_timed(url)
+            results["first_pass_bytes"] += first["bytes"]
+            etag = first["response"].headers.get("ETag")
+            last_modified = first["response"].headers.get("Last-Modified")
+            if not etag or etag.startswith("W/"):
+                issue(filename, f"Missing strong ETag (got {etag})")
+                continue
+            if not last_modified:
+                issue(filename, "Missing Last-Modified")
+                continue
+            
+            # Returning visit: the browser revalidates with its ETag
+            second = http_client.fetch_timed(url, headers={"If-None-Match": etag})
+            results["second_pass_bytes"] += second["bytes"]
+            if second["response"].status_code == 304 and second["bytes"] == 0:
+                results["not_modified"] += 1
+                print(f"    ✅ If-None-Match → 304 ({first['bytes']} bytes saved, "
+                      f"{first['total'] * 1000:.1f}ms → {second['total'] * 1000:.1f}ms)")
+            else:
+                issue(filename, f"If-None-Match: expected empty 304, got {second['response'].status_code}")
+            
+            if second["response"].headers.get("ETag") != etag:
+                issue(filename, "ETag changed between two requests for the same file")
+            
+            response = http_client.get(url, headers={"If-Modified-Since": last_modified}, stream=True)
+            response.close()
+            if response.status_code != 304:
+                issue(filename, f"If-Modified-Since: expected 304, got {response.status_code}")
+            
+            stale = http_client.fetch_timed(url, headers={"If-None-Match": '"stale-etag"'})
+            if stale["response"].status_code != 200 or stale["bytes"] != first["bytes"]:
+                issue(filename, f"Stale ETag: expected full 200, got {stale['response'].status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            issue(filename, f"Connection error: {str(e)}")
+    
+    results["bytes_saved"] = results["first_pass_bytes"] - results["second_pass_bytes"]
+    print(f"\n  Revalidated {results['not_modified']}/{results['files_tested']} files with 304, "
+          f"{results['bytes_saved'] / 1e6:.2f} MB saved on the second pass")
+    
+    return results
+
+def test_pdf_thumbnails():
+    """Test that the first-page previews shown by the modal are served and lighter than the PDFs"""
+    print("\n🔍 Testing PDF First-Page Thumbnails (/procedures/thumbnails)...")
+    
+    results = {"success": True, "skipped": False, "files_tested": 0, "preview_bytes": 0, "pdf_bytes": 0, "issues": []}
+    try:
+        with open(os.path.join(THUMBNAILS_DIR, "index.json")) as f:
+            generated = json.load(f)["files"]
+    except FileNotFoundError:
+        print("  ⚠️  Thumbnails not generated, run generate_pdf_thumbnails.py")
+        results["skipped"] = True
+        return results
+    
+    for filename, entry in procedure_manifest().items():
+        results["files_tested"] += 1
+        stem = os.path.splitext(filename)[0]
+        # AVIF is only generated when the local Pillow build can encode it
+        formats = generated.get(filename, {}).get("formats", ["webp"])
+        for extension in formats:
+            content_type = f"image/{extension}"
+            try:
+                preview = http_client.fetch_timed(f"/procedures/thumbnails/{stem}-{SMALLEST_THUMBNAIL}.{extension}")
+            except requests.exceptions.RequestException as e:
+                results["success"] = False
+                results["issues"].append(f"{filename} - Connection error: {str(e)}")
+                continue
+            response = preview["response"]
+            if response.status_code != 200 or response.headers.get("Content-Type", "").split(";")[0] != content_type:
+                results["success"] = False
+                results["issues"].append(f"{filename} - {extension} preview: HTTP {response.status_code} "
+                                         f"{response.headers.get('Content-Type', '')}")
+                print(f"  ❌ {filename} - {extension} preview not served")
+                continue
+            if extension == "webp":
+                results["preview_bytes"] += preview["bytes"]
+                results["pdf_bytes"] += entry["size"]
+                print(f"  ✅ {filename} - preview {preview['bytes'] / 1024:.1f}KB instead of "
+                      f"{entry['size'] / 1024:.1f}KB, {preview['total'] * 1000:.1f}ms")
+    
+    return results
+
+def load_pages_index():
+    """{filename: entry} written by split_pdf_pages.py, or None if the pages were not generated"""
+    try:
+        with open(os.path.join(PAGES_DIR, "index.json")) as f:
+            return json.load(f)["files"]
+    except FileNotFoundError:
+        return None
+
+def test_pdf_pages():
+    """Test that every page of every procedure is served alone, as a one-page PDF matching the split"""
+    print("\n🔍 Testing Single-Page PDFs (/api/pdf/[filename]/pages/[page])...")
+    
+    results = {"success": True, "skipped": False, "files_tested": 0, "pages_tested": 0, "issues": []}
+    split = load_pages_index()
+    if split is None:
+        print("  ⚠️  Pages not generated, run split_pdf_pages.py")
+        results["skipped"] = True
+        return results
+    
+    def issue(filename, message):
+        results["success"] = False
+        results["issues"].append(f"{filename} - {message}")
+        print(f"    ❌ {message}")
+    
+    for filename, entry in procedure_manifest().items():
+        results["files_tested"] += 1
+        generated = split.get(filename)
+        if generated is None:
+            issue(filename, "not split")
+            continue
+        pages = generated["pages"]
+        # The manifest counts pages on its own (build-pdf-manifest.js): both must agree
+        if entry.get("pages") is not None and entry["pages"] != pages:
+            issue(filename, f"{pages} pages split, the manifest counts {entry['pages']}")
+        
+        served = 0
+        for page in range(1, pages + 1):
+            chunks = []
+            try:
+                fetched = http_client.fetch_timed(f"/api/pdf/{filename}/pages/{page}",
+                                                  on_chunk=lambda chunk, elapsed: chunks.append(chunk))
+            except requests.exceptions.RequestException as e:
+                issue(filename, f"page {page}: connection error: {str(e)}")
+                continue
+            response = fetched["response"]
+            data = b"".join(chunks)
+            output = generated["outputs"].get(f"{os.path.splitext(filename)[0]}-{page}.pdf", {})
+            results["pages_tested"] += 1
+            if response.status_code != 200 or "application/pdf" not in response.headers.get("Content-Type", ""):
+                issue(filename, f"page {page}: HTTP {response.status_code} {response.headers.get('Content-Type', '')}")
+            elif not data.startswith(PDF_MAGIC) or count_page_objects(data) != 1:
+                issue(filename, f"page {page}: not a one-page PDF ({count_page_objects(data)} pages)")
+            elif hashlib.sha256(data).hexdigest() != output.get("sha256"):
+                issue(filename, f"page {page}: content does not match the split")
+            else:
+                served += 1
+        
+        # One past the last page does not exist; page numbers start at 1
+        for page, expected in ((pages + 1, 404), (0, 400)):
+            response = http_client.get(f"/api/pdf/{filename}/pages/{page}")
+            if response.status_code != expected:
+                issue(filename, f"page {page}: expected {expected}, got {response.status_code}")
+        print(f"  {'✅' if served == pages else '❌'} {filename} - {served}/{pages} pages served as one-page PDFs")
+    
+    return results
+
+def test_single_page_vs_full():
+    """Measure what opening one page costs against loading the whole document, for every procedure"""
+    print("\n🔍 Comparing Single-Page and Full-Document Loads...")
+    
+    results = {"success": True, "skipped": False, "files": {}, "page_bytes": 0, "full_bytes": 0, "issues": []}
+    split = load_pages_index()
+    if split is None:
+        print("  ⚠️  Pages not generated, run split_pdf_pages.py")
+        results["skipped"] = True
+        return results
+    
+    # What a browser sends: the full document may come precompressed
+    headers = {"Accept-Encoding": "br, gzip"}
+    
+    def measure(path, repeats=3):
+        timings = [http_client.fetch_timed(path, decode=False, headers=headers) for _ in range(repeats)]
+        if any(timing["response"].status_code != 200 for timing in timings):
+            raise requests.exceptions.HTTPError(f"{path}: HTTP {timings[-1]['response'].status_code}")
+        return timings[-1]["bytes"], statistics.median(timing["total"] for timing in timings)
+    
+    print(f"  {'Procedure':<24}{'Pages':>6}{'Full':>11}{'Page 1':>11}{'Ratio':>8}{'Full ms':>10}{'Page ms':>10}")
+    for filename in list_procedure_files():
+        if filename not in split:
+            continue
+        try:
+            full_bytes, full_time = measure(f"/api/pdf/{filename}")
+            # The modal opens on the first page
+            page_bytes, page_time = measure(f"/api/pdf/{filename}/pages/1")
+        except requests.exceptions.RequestException as e:
+            results["success"] = False
+            results["issues"].append(f"{filename} - {str(e)}")
+            print(f"  ❌ {filename} - {str(e)}")
+            continue
+        results["files"][filename] = {
+            "pages": split[filename]["pages"],
+            "full_bytes": full_bytes,
+            "page_bytes": page_bytes,
+            "full_ms": full_time * 1000,
+            "page_ms": page_time * 1000,
+        }
+        results["full_bytes"] += full_bytes
+        results["page_bytes"] += page_bytes
+        # A single page re-embeds its fonts: only a one-page document may come out heavier
+        if page_bytes > full_bytes and split[filename]["pages"] > 1:
+            results["success"] = False
+            results["issues"].append(f"{filename} - page 1 ({page_bytes} bytes) heavier than the document")
+        print(f"  {filename:<24}{split[filename]['pages']:>6}{full_bytes / 1024:>9.0f}KB{page_bytes / 1024:>9.0f}KB"
+              f"{page_bytes / full_bytes:>8.2f}{full_time * 1000:>8.1f}ms{page_time * 1000:>8.1f}ms")
+    
+    if results["full_bytes"]:
+        print(f"\n  Opening page 1 of every procedure: {results['page_bytes'] / 1e6:.2f} MB "
+              f"instead of {results['full_bytes'] / 1e6:.2f} MB")
+    return results
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="PDF modal backend tests for the Next.js portfolio")
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
     """Main testing function for PDF modal functionality"""
+    args = args or parse_args([])
+    report = SuiteReport("pdf-modal")
+    report.start_server_metrics()
+    
     print("🚀 Starting Advanced PDF Modal Backend Testing")
     print("=" * 60)
     
     # Test iframe PDF loading
-    iframe_results = test_iframe_pdf_loading()
+    iframe_results = report.run("test_iframe_pdf_loading", test_iframe_pdf_loading)
     
     # Test PDF modal simulation
-    modal_results = test_pdf_modal_simulation()
+    modal_results = report.run("test_pdf_modal_simulation", test_pdf_modal_simulation)
     
     # Test CSP compatibility
-    csp_compatible = test_csp_iframe_compatibility()
+    csp_compatible = report.run("test_csp_iframe_compatibility", test_csp_iframe_compatibility)
+    
+    # Test revalidation of returning visitors
+    revalidation_results = report.run("test_pdf_revalidation", test_pdf_revalidation)
+    report.add_metric("revalidation.second_pass_bytes", revalidation_results["second_pass_bytes"], unit="bytes")
+    
+    # Test first-page previews
+    thumbnail_results = report.run("test_pdf_thumbnails", test_pdf_thumbnails)
+    if not thumbnail_results["skipped"]:
+        report.add_metric("thumbnails.preview_bytes", thumbnail_results["preview_bytes"], unit="bytes")
+    
+    # Test single-page loads
+    pages_results = report.run("test_pdf_pages", test_pdf_pages)
+    comparison_results = report.run("test_single_page_vs_full", test_single_page_vs_full)
+    if not comparison_results["skipped"]:
+        report.add_metric("pages.first_page_bytes", comparison_results["page_bytes"], unit="bytes")
+        for filename, entry in comparison_results["files"].items():
+            report.add_metric(f"pages.{filename}.page_ms", entry["page_ms"])
     
     # Summary
     print("\n" + "=" * 60)
     print("📊 PDF MODAL BACKEND TESTING SUMMARY")
     print("=" * 60)
     
-    print(f"Direct PDF Access: {iframe_results['direct_access']}/3 files working")
-    print(f"API PDF Access: {iframe_results['api_access']}/3 files working")
+    print(f"Direct PDF Access: {iframe_results['direct_access']}/{iframe_results['total_tested']} files working")
+    print(f"API PDF Access: {iframe_results['api_access']}/{iframe_results['total_tested']} files working")
     print(f"Modal Compatibility: {modal_results['modal_compatible']}/{modal_results['total_tested']} files working")
     print(f"CSP iframe Compatibility: {'✅ COMPATIBLE' if csp_compatible else '❌ ISSUES'}")
+    print(f"First-Page Previews: {'⚠️ NOT GENERATED' if thumbnail_results['skipped'] else '✅ SERVED' if thumbnail_results['success'] else '❌ ISSUES'}"
+          + (f" ({thumbnail_results['preview_bytes'] / 1024:.0f}KB instead of {thumbnail_results['pdf_bytes'] / 1024:.0f}KB)"
+             if thumbnail_results['pdf_bytes'] else ""))
+    print(f"Revalidation (304): {revalidation_results['not_modified']}/{revalidation_results['files_tested']} files, "
+          f"{revalidation_results['bytes_saved'] / 1e6:.2f} MB saved")
+    print(f"Single Pages: {'⚠️ NOT GENERATED' if pages_results['skipped'] else '✅ SERVED' if pages_results['success'] else '❌ ISSUES'}"
+          + (f" ({pages_results['pages_tested']} pages, page 1 of each: {comparison_results['page_bytes'] / 1024:.0f}KB "
+             f"instead of {comparison_results['full_bytes'] / 1024:.0f}KB)" if comparison_results['full_bytes'] else ""))
     
     if modal_results['success_files']:
         print(f"\n✅ Modal-compatible PDFs:")
@@ -214,34 +494,42 @@ def main():
         for file in modal_results['loading_issues']:
             print(f"  - {file}")
     
-    if iframe_results['issues']:
+    page_issues = pages_results['issues'] + comparison_results['issues']
+    if iframe_results['issues'] or revalidation_results['issues'] or page_issues:
         print(f"\n⚠️  Identified Issues:")
-        for issue in iframe_results['issues']:
+        for issue in iframe_results['issues'] + revalidation_results['issues'] + page_issues:
             print(f"  - {issue}")
     
     # Overall assessment for PDF modal functionality
     modal_backend_working = (
-        iframe_results['direct_access'] >= 2 and
-        iframe_results['api_access'] >= 2 and
-        modal_results['modal_compatible'] >= 3 and
-        csp_compatible
+        iframe_results['success'] and
+        modal_results['success'] and
+        csp_compatible and
+        revalidation_results['success'] and
+        thumbnail_results['success'] and
+        pages_results['success'] and
+        comparison_results['success']
     )
     
     print(f"\n🎯 PDF MODAL BACKEND STATUS: {'✅ WORKING' if modal_backend_working else '❌ NEEDS ATTENTION'}")
     
     if not modal_backend_working:
         print("\n🔧 RECOMMENDATIONS:")
-        if iframe_results['direct_access'] < 2:
+        if iframe_results['direct_access'] < iframe_results['total_tested']:
             print("  - Check direct PDF file access configuration")
-        if iframe_results['api_access'] < 2:
+        if iframe_results['api_access'] < iframe_results['total_tested']:
             print("  - Verify API endpoint functionality")
-        if modal_results['modal_compatible'] < 3:
+        if not modal_results['success']:
             print("  - Investigate PDF loading strategies in modal component")
         if not csp_compatible:
             print("  - Review CSP configuration for iframe compatibility")
+        if not revalidation_results['success']:
+            print("  - Check ETag / Last-Modified handling in the PDF API route")
+        if not pages_results['success'] or not comparison_results['success']:
+            print("  - Re-run split_pdf_pages.py and check the pages route")
     
-    return modal_backend_working
+    return finish_report(report, args, modal_backend_working)
 
 if __name__ == "__main__":
-    success = main()
+    success = main(parse_args())
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Latency statistics helpers for the test scripts
+Percentiles, summaries, text histograms and per-phase HTTP timing
+"""
+
+import http.client
+import math
+import socket
+import ssl
+import time
+from urllib.parse import urljoin, urlparse
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(values):
+    """min/mean/p50/p95/p99/max of a list of values"""
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "min": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "min": values[0],
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+def text_histogram(values, bins=10, width=40, unit=1000.0, suffix="ms"):
+    """Render a text histogram of values (seconds by default, displayed in ms)"""
+    if not values:
+        return []
+    low, high = min(values), max(values)
+    step = (high - low) / bins or 1e-9
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / step), bins - 1)] += 1
+    peak = max(counts)
+
+    lines = []
+    for index, count in enumerate(counts):
+        start = (low + index * step) * unit
+        end = (low + (index + 1) * step) * unit
+        bar = "█" * max(1 if count else 0, round(count / peak * width))
+        lines.append(f"{start:9.2f} - {end:9.2f} {suffix} │{bar} {count}")
+    return lines
+
+def _open_connection(parsed, timeout):
+    """Resolve and connect separately so DNS and TCP/TLS connect can be timed"""
+    host = parsed.hostname
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    start = time.perf_counter()
+    family, socktype, proto, _, sockaddr = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+    resolved = time.perf_counter()
+
+    sock = socket.socket(family, socktype, proto)
+    sock.settimeout(timeout)
+    sock.connect(sockaddr)
+    if parsed.scheme == "https":
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+    connected = time.perf_counter()
+
+    conn_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+    conn = conn_class(host, port, timeout=timeout)
+    conn.sock = sock
+    return conn, resolved - start, connected - resolved
+
+def measure_phases(url, follow_redirects=False, timeout=10):
+    """
+    Time one fresh-connection GET split into DNS, connect, TTFB and transfer phases.
+
+    With follow_redirects=True, same-origin redirects are followed on the same
+    connection (as a browser would) and their TTFB/transfer phases are added up.
+    hops lists the URL, status, timings, size, Server-Timing and X-Request-Id of each response.
+    """
+    parsed = urlparse(url)
+    conn, dns, connect = _open_connection(parsed, timeout)
+    phases = {"dns": dns, "connect": connect, "ttfb": 0.0, "transfer": 0.0}
+    statuses = []
+    hops = []
+
+    try:
+        path = parsed.path or "/"
+        for _ in range(10):
+            start = time.perf_counter()
+            conn.request("GET", path + (f"?{parsed.query}" if parsed.query else ""))
+            response = conn.getresponse()
+            headers_received = time.perf_counter()
+            body = response.read()
+            done = time.perf_counter()
+
+            phases["ttfb"] += headers_received - start
+            phases["transfer"] += done - headers_received
+            statuses.append(response.status)
+            hops.append({"url": urljoin(url, path), "status": response.status, "started": start,
+                         "ttfb": headers_received - start, "elapsed": done - start, "bytes": len(body),
+                         "server_timing": response.getheader("Server-Timing"),
+                         "request_id": response.getheader("X-Request-Id")})
+
+            location = response.getheader("Location")
+            if not (follow_redirects and 300 <= response.status < 400 and location):
+                break
+            target = urlparse(urljoin(url, location))
+            if (target.scheme, target.netloc) != (parsed.scheme, parsed.netloc):
+                break
+            path, parsed = target.path or "/", target
+    finally:
+        conn.close()
+
+    phases["total"] = sum(phases.values())
+    phases["statuses"] = statuses
+    phases["hops"] = hops
+    return phases
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Server process statistics read from /proc (Linux)
+Locates the process listening on the application port and samples its memory
+"""
+
+import os
+
+def _listening_inodes(port):
+    """Socket inodes in LISTEN state on the given TCP port"""
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    local_port = int(fields[1].rsplit(":", 1)[1], 16)
+                    if local_port == port and fields[3] == "0A":
+                        inodes.add(fields[9])
+        except (OSError, StopIteration):
+            continue
+    return inodes
+
+def find_server_pid(port):
+    """
+    Return the pid of the process listening on `port`, or None.
+
+    SERVER_PID in the environment takes precedence (useful when the server runs
+    as another user and its file descriptors cannot be inspected).
+    """
+    if os.environ.get("SERVER_PID"):
+        return int(os.environ["SERVER_PID"])
+
+    targets = {f"socket:[{inode}]" for inode in _listening_inodes(port)}
+    if not targets:
+        return None
+
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            for fd in os.listdir(fd_dir):
+                if os.readlink(os.path.join(fd_dir, fd)) in targets:
+                    return int(pid)
+        except OSError:
+            continue
+    return None
+
+def read_rss_bytes(pid):
+    """Resident set size of a process in bytes, or None if it cannot be read"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+def read_fd_count(pid):
+    """Number of open file descriptors of a process, or None if they cannot be listed"""
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Procedure PDFs shipped in public/procedures
+Shared by the test scripts so they all exercise the real asset set, with a
+content manifest to verify downloads against
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import http_client
+from perf_stats import percentile
+
+PROCEDURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public", "procedures")
+
+# First-page previews written by generate_pdf_thumbnails.py
+THUMBNAILS_DIR = os.path.join(PROCEDURES_DIR, "thumbnails")
+
+# Single-page PDFs written by split_pdf_pages.py
+PAGES_DIR = os.path.join(PROCEDURES_DIR, "pages")
+
+# Every PDF starts with this header
+PDF_MAGIC = b"%PDF-"
+
+# A linearized PDF opens with its linearization dictionary, within the first KB
+LINEARIZATION_WINDOW = 1024
+
+# Page objects (not the /Pages tree nodes), visible while not packed in an object stream
+PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+def list_procedure_files():
+    """List the PDF files shipped in public/procedures"""
+    return sorted(f for f in os.listdir(PROCEDURES_DIR) if f.lower().endswith(".pdf"))
+
+def procedure_path(filename):
+    """Absolute path of a procedure PDF on disk"""
+    return os.path.join(PROCEDURES_DIR, filename)
+
+def parse_linearization(head):
+    """
+    Read the linearization dictionary from the first bytes of a PDF.
+
+    Returns None if the file is not linearized, otherwise a dict with the file
+    length it was linearized for (length), the end of the first page section
+    (first_page_end), the first page object number and the page count.
+    """
+    head = head[:LINEARIZATION_WINDOW]
+    if b"/Linearized" not in head:
+        return None
+
+    def number(key):
+        match = re.search(rb"/" + key + rb"\s+(\d+)", head)
+        return int(match.group(1)) if match else None
+
+    return {
+        "length": number(b"L"),
+        "first_page_end": number(b"E"),
+        "first_page_object": number(b"O"),
+        "pages": number(b"N"),
+    }
+
+def count_page_objects(data):
+    """Number of /Type /Page objects in a PDF without object streams (e.g. split_pdf_pages.py output)"""
+    return len(PAGE_OBJECT.findall(data))
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Index written by build-pdf-manifest.js (npm run manifest:pdfs, run before every build)
+MANIFEST_PATH = os.path.join(PROCEDURES_DIR, "manifest.json")
+
+_manifest = {}
+_manifest_lock = threading.Lock()
+
+def load_generated_manifest():
+    """{filename: entry} from the generated manifest.json, or None if it was not generated"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)["files"]
+    except FileNotFoundError:
+        return None
+
+def manifest_entry_is_current(entry, stats):
+    """Whether a generated entry still describes the file on disk (same size and mtime)"""
+    return entry["size"] == stats.st_size and abs(entry["mtimeMs"] - stats.st_mtime_ns / 1e6) < 1
+
+def procedure_manifest():
+    """
+    {filename: {"size", "sha256", ...}} for every procedure PDF on disk.
+
+    Entries of the generated manifest.json are used as-is (with pages,
+    linearized, firstPageOffset...) while they match the file; other files
+    are hashed here, once per file version (mtime/size).
+    """
+    generated = load_generated_manifest() or {}
+    manifest = {}
+    for filename in list_procedure_files():
+        stats = os.stat(procedure_path(filename))
+        if filename in generated and manifest_entry_is_current(generated[filename], stats):
+            manifest[filename] = generated[filename]
+            continue
+        key = (stats.st_mtime_ns, stats.st_size)
+        with _manifest_lock:
+            known = _manifest.get(filename)
+        if not known or known[0] != key:
+            known = (key, {"size": stats.st_size, "sha256": file_sha256(procedure_path(filename))})
+            with _manifest_lock:
+                _manifest[filename] = known
+        manifest[filename] = known[1]
+    return manifest
+
+def verify_pdf_download(path, filename, chunk_size=64 * 1024, **kwargs):
+    """
+    Stream a PDF download chunk by chunk and check it against the manifest
+    without keeping the body in memory.
+
+    Returns a dict with the response, the checks (is_pdf, size_matches,
+    sha256_matches, verified), the bytes received and the throughput in MB/s,
+    overall and per chunk (min/p50).
+    """
+    expected = procedure_manifest().get(filename)
+    digest = hashlib.sha256()
+    state = {"magic": b"", "last": None, "rates": []}
+
+    def on_chunk(chunk, elapsed):
+        digest.update(chunk)
+        if len(state["magic"]) < len(PDF_MAGIC):
+            state["magic"] += chunk[:len(PDF_MAGIC) - len(state["magic"])]
+        if state["last"] is not None and elapsed > state["last"]:
+            state["rates"].append(len(chunk) / (elapsed - state["last"]) / 1e6)
+        state["last"] = elapsed
+
+    result = http_client.fetch_timed(path, chunk_size=chunk_size, on_chunk=on_chunk, **kwargs)
+    sha256 = digest.hexdigest()
+    rates = sorted(state["rates"])
+    transfer = result["total"] - result["ttfb"]
+
+    checks = {
+        "is_pdf": state["magic"] == PDF_MAGIC,
+        "size_matches": expected is not None and result["bytes"] == expected["size"],
+        "sha256_matches": expected is not None and sha256 == expected["sha256"],
+    }
+    checks["verified"] = result["response"].status_code == 200 and all(checks.values())
+    return {
+        **result,
+        **checks,
+        "sha256": sha256,
+        "throughput_mbps": result["bytes"] / transfer / 1e6 if transfer > 0 else None,
+        "chunk_throughput_mbps": {
+            "min": rates[0] if rates else None,
+            "p50": percentile(rates, 50) if rates else None,
+        },
+    }
+
+def load_outputs_index(output_dir):
+    """index.json of a per-PDF output directory (thumbnails, pages), empty if not generated yet"""
+    try:
+        with open(os.path.join(output_dir, "index.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"files": {}}
+
+def outputs_up_to_date(output_dir, entry, sha256, settings):
+    """
+    Same PDF content, same settings (e.g. widths and formats) and every output
+    still on disk, with the size it was written with when the index records one
+    """
+    if entry is None or entry.get("sha256") != sha256:
+        return False
+    if any(entry.get(key) != value for key, value in settings.items()):
+        return False
+    for name, output in entry.get("outputs", {}).items():
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path) or ("size" in output and os.path.getsize(path) != output["size"]):
+            return False
+    return True
+
+def remove_outputs(output_dir, entry, keep=()):
+    """Delete the files an index entry lists, except those in keep"""
+    for name in entry.get("outputs", {}):
+        path = os.path.join(output_dir, name)
+        if name not in keep and os.path.exists(path):
+            os.remove(path)
+
+def generate_outputs(output_dir, worker, args=(), settings=None, jobs=None, force=False,
+                     kind="outputs", describe=None):
+    """
+    Run worker(filename, *args) for every procedure PDF whose content or
+    settings changed since the last run, one process per file, and rewrite
+    output_dir/index.json.
+
+    worker returns the index entry of the file, with the files it wrote under
+    "outputs"; settings are stored in every entry and compared on the next
+    run. Outputs of deleted PDFs, and those a PDF no longer produces, are
+    removed. describe(filename, entry) is the line printed on success.
+    Returns (number of PDFs processed, filenames that failed).
+    """
+    settings = settings or {}
+    os.makedirs(output_dir, exist_ok=True)
+    index = load_outputs_index(output_dir)
+    files = list_procedure_files()
+    for filename in list(index["files"]):
+        if filename not in files:
+            remove_outputs(output_dir, index["files"].pop(filename))
+            print(f"🗑️  {filename} removed, {kind} deleted")
+
+    todo = {}
+    for filename in files:
+        sha256 = file_sha256(procedure_path(filename))
+        if not force and outputs_up_to_date(output_dir, index["files"].get(filename), sha256, settings):
+            print(f"⏭️  {filename} up to date")
+            continue
+        todo[filename] = sha256
+
+    errors = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(worker, filename, *args): filename for filename in todo}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                errors.append(filename)
+                print(f"❌ {filename} - {str(e)}")
+                continue
+            # A document that lost pages (or a width dropped) leaves no stale output behind
+            remove_outputs(output_dir, index["files"].get(filename, {}), keep=entry["outputs"])
+            index["files"][filename] = {"sha256": todo[filename], **settings, **entry}
+            summary = describe(filename, entry) if describe else f"{len(entry['outputs'])} {kind}"
+            print(f"✅ {filename} - {summary}")
+
+    index["files"] = dict(sorted(index["files"].items()))
+    with open(os.path.join(output_dir, "index.json"), "w") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    return len(todo), errors
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Parallel Test Runner for Next.js Portfolio Application
+Discovers the test_* checks of backend_test.py, pdf_modal_test.py,
+redirect_test.py and page_weight_audit.py, warms every route up once, then
+runs the checks concurrently, optionally once per throttled network profile
+"""
+
+import argparse
+import fnmatch
+import inspect
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+import backend_test
+import http_client
+import page_weight_audit
+import pdf_modal_test
+import redirect_test
+from network_shaping import add_network_arguments, throttled
+from perf_stats import summarize
+from procedures import list_procedure_files
+from server_fixture import add_server_arguments, serve
+from suite_report import SuiteReport, add_report_arguments, finish_report, positive_int
+
+SUITES = [
+    ("backend", backend_test),
+    ("pdf-modal", pdf_modal_test),
+    ("redirect", redirect_test),
+    ("page-weight", page_weight_audit),
+]
+
+# Latency measurements run alone after the others, so concurrent checks do not skew them
+SERIAL_CHECKS = {("redirect", "test_redirect_performance")}
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "app")
+
+class ThreadOutput(io.TextIOBase):
+    """
+    sys.stdout replacement that buffers prints per worker thread, so the output
+    of concurrent checks is shown one block at a time instead of interleaved
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+
+    def release(self):
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer else ""
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def discover_checks(pattern=None):
+    """List (suite, name, func) for every test_* function that takes no required argument"""
+    checks = []
+    for suite, module in SUITES:
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith("test_") or func.__module__ != module.__name__:
+                continue
+            required = [
+                param for param in inspect.signature(func).parameters.values()
+                if param.default is inspect.Parameter.empty
+                and param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+            ]
+            if required:
+                continue
+            if pattern and not fnmatch.fnmatch(f"{suite}.{name}", pattern):
+                continue
+            checks.append((suite, name, func))
+    return checks
+
+def discover_routes():
+    """Every page of src/app, the root redirect, and each PDF through the API and statically"""
+    routes = ["/"]
+    for directory, _, files in sorted(os.walk(APP_DIR)):
+        if "page.js" in files and directory != APP_DIR:
+            segments = os.path.relpath(directory, APP_DIR).split(os.sep)
+            # Route groups "(name)" do not appear in the URL
+            routes.append("/" + "/".join(s for s in segments if not (s.startswith("(") and s.endswith(")"))))
+    for filename in list_procedure_files():
+        routes.append(f"/api/pdf/{filename}")
+        routes.append(f"/procedures/{filename}")
+    return routes
+
+def warm_up(routes):
+    """
+    Request every route once before measuring anything.
+
+    In development Next.js compiles a route on its first hit; warming up up
+    front keeps that cost out of whichever check happens to hit it first.
+    """
+    print(f"🔥 Warming up {len(routes)} routes...")
+    timings = {}
+    for path in routes:
+        try:
+            timings[path] = http_client.fetch_timed(path)["total"]
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠️  {path} - {str(e)}")
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"  ✅ {len(timings)}/{len(routes)} routes warmed in {sum(timings.values()):.2f}s")
+    for path, elapsed in slowest:
+        print(f"    {path:<40} {elapsed * 1000:8.1f}ms")
+    return timings
+
+def run_checks(report, checks, workers, output):
+    """Run the checks in a worker pool, printing each check's output as it completes"""
+    def run_one(suite, name, func):
+        output.capture()
+        try:
+            report.run(f"{suite}.{name}", func)
+        finally:
+            text = output.release()
+            http_client.close()
+        return text
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_one, *check): check for check in checks}
+        for future in as_completed(futures):
+            suite, name, _ = futures[future]
+            print(f"\n── {suite}.{name} " + "─" * max(0, 56 - len(suite) - len(name)))
+            print(future.result(), end="")
+
+def print_summary(report, wall_time):
+    """Merged pass/fail table with the time each check took"""
+    print("\n" + "=" * 60)
+    print("📊 PARALLEL TEST RUN SUMMARY")
+    print("=" * 60)
+    print(f"{'Check':<44}{'Status':>8}{'Time':>10}{'Reqs':>6}")
+    for check in sorted(report.checks, key=lambda check: check["name"]):
+        status = "✅" if check["passed"] else "❌"
+        print(f"{check['name']:<44}{status:>7}{check['duration']:>9.2f}s{check['requests']:>6}")
+
+    durations = [check["duration"] for check in report.checks]
+    print(f"\nWall time: {wall_time:.2f}s "
+          f"(sum of checks: {sum(durations):.2f}s, slowest check: {max(durations, default=0):.2f}s)")
+    report.add_metric("runner.wall_time_ms", wall_time * 1000)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run every test suite of the Next.js portfolio in parallel")
+    parser.add_argument("--workers", type=positive_int, default=None,
+                        help="number of checks run concurrently (default: 8, or 1 with --network so "
+                             "the checks do not share the shaped link; 1 runs them serially)")
+    parser.add_argument("--only", metavar="PATTERN", default=None,
+                        help="only run checks matching a glob, e.g. 'redirect.*' or '*range*'")
+    parser.add_argument("--no-warmup", action="store_true", help="skip the warm-up pass")
+    parser.add_argument("--list", action="store_true", help="list the discovered checks and exit")
+    parser.add_argument("--compare-targets", action="store_true",
+                        help="run against the stand-in and then `next start`, and report the framework overhead per endpoint")
+    add_server_arguments(parser)
+    add_network_arguments(parser)
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.workers is None:
+        args.workers = 1 if args.network else 8
+    return args
+
+def run_once(args, checks, server, warm=True):
+    """Health check, warm-up and parallel checks against one server"""
+    report = SuiteReport("all")
+    report.start_server_metrics()
+    if server.startup_time is not None:
+        report.add_metric("server.startup_ms", server.startup_time * 1000)
+
+    health = report.run("backend.test_application_health", backend_test.test_application_health)
+    if not health:
+        print("\n❌ Application is not running. Cannot proceed with testing.")
+        return report
+
+    if warm and not args.no_warmup:
+        warm_up(discover_routes())
+
+    output = ThreadOutput(sys.stdout)
+    checks = [check for check in checks if check[1] != "test_application_health"]
+    serial = [check for check in checks if check[:2] in SERIAL_CHECKS]
+    parallel = [check for check in checks if check[:2] not in SERIAL_CHECKS]
+    print(f"\n⚡ Running {len(parallel)} checks with {args.workers} workers"
+          f"{f', then {len(serial)} alone' if serial else ''}...")
+
+    start = time.perf_counter()
+    sys.stdout = output
+    try:
+        run_checks(report, parallel, args.workers, output)
+        run_checks(report, serial, 1, output)
+    finally:
+        sys.stdout = output.stream
+    print_summary(report, time.perf_counter() - start)
+    # Scraped while the server is still up, finish_report() only prints it
+    report.collect_server_metrics()
+    return report
+
+def print_target_comparison(reports):
+    """p50 per endpoint on each target; the difference is what the framework adds"""
+    standin, nextjs = reports["standin"].endpoints(), reports["next"].endpoints()
+    print("\n" + "=" * 60)
+    print("📊 FRAMEWORK OVERHEAD (next start vs stand-in, p50)")
+    print("=" * 60)
+    print(f"{'Endpoint':<44}{'stand-in':>10}{'next':>10}{'overhead':>10}")
+    for key in sorted(set(standin) & set(nextjs)):
+        before, after = standin[key]["p50_ms"], nextjs[key]["p50_ms"]
+        print(f"{key:<44}{before:>8.1f}ms{after:>8.1f}ms{after - before:>+8.1f}ms")
+        reports["next"].add_metric(f"overhead.{key}", after - before)
+    for target, report in reports.items():
+        startup = report.metrics.get("server.startup_ms")
+        if startup:
+            print(f"Startup {target}: {startup['value']:.0f}ms")
+
+def run_throttled(args, checks, server):
+    """
+    Warm up once over loopback, then run the checks through the shaping proxy
+    with each network profile. Returns {profile name: report}.
+    """
+    if not args.no_warmup:
+        warm_up(discover_routes())
+    reports = {}
+    for name, profile in args.network:
+        print("\n" + "=" * 60)
+        with throttled(name, profile) as proxy:
+            reports[name] = run_once(args, checks, server, warm=False)
+            stats = proxy.stats()
+        print(f"📶 {name}: {stats['connections']} connections, {stats['bytes_down'] / 1024:.0f}KB down, "
+              f"{stats['bytes_up'] / 1024:.0f}KB up, {stats['lost_segments']} segments lost")
+    return reports
+
+def print_network_comparison(reports, report):
+    """
+    Time to first byte and full-load time of every check on each profile, then
+    over all requests; the metrics go to report (the one finish_report writes)
+    """
+    names = list(reports)
+    width = 16 * len(names)
+    print("\n" + "=" * 60)
+    print("📶 THROTTLED NETWORK PROFILES (first-request TTFB / check full-load time)")
+    print("=" * 60)
+    print(f"{'Check':<44}" + "".join(f"{name:>16}" for name in names))
+    checks = {}
+    for name, profile_report in reports.items():
+        for check in profile_report.checks:
+            checks.setdefault(check["name"], {})[name] = check
+    for check_name in sorted(checks):
+        cells = []
+        for name in names:
+            check = checks[check_name].get(name)
+            if check is None:
+                cells.append(f"{'-':>16}")
+                continue
+            ttfb = f"{check['ttfb'] * 1000:.0f}" if check["ttfb"] is not None else "-"
+            cell = f"{ttfb}/{check['duration'] * 1000:.0f}ms{'' if check['passed'] else '*'}"
+            cells.append(f"{cell:>16}")
+        print(f"{check_name:<44}" + "".join(cells))
+    print("(* failed on that profile)")
+
+    print("-" * (44 + width))
+    rows = [("TTFB p50", "ttfb", "p50"), ("TTFB p95", "ttfb", "p95"),
+            ("Full load p50", "elapsed", "p50"), ("Full load p95", "elapsed", "p95")]
+    summaries = {
+        name: {field: summarize([record[field] for record in profile_report.requests]) for field in ("ttfb", "elapsed")}
+        for name, profile_report in reports.items()
+    }
+    for label, field, stat in rows:
+        print(f"{label:<44}" + "".join(f"{summaries[name][field][stat] * 1000:>14.0f}ms" for name in names))
+    print(f"{'Wall time':<44}" + "".join(
+        f"{reports[name].metrics['runner.wall_time_ms']['value'] / 1000:>15.1f}s" for name in names))
+    print(f"{'Checks passed':<44}" + "".join(
+        f"{sum(check['passed'] for check in reports[name].checks):>12}/{len(reports[name].checks):<3}" for name in names))
+
+    for name in names:
+        report.add_metric(f"network.{name}.ttfb_p50_ms", summaries[name]["ttfb"]["p50"] * 1000)
+        report.add_metric(f"network.{name}.ttfb_p95_ms", summaries[name]["ttfb"]["p95"] * 1000)
+        report.add_metric(f"network.{name}.load_p50_ms", summaries[name]["elapsed"]["p50"] * 1000)
+        report.add_metric(f"network.{name}.load_p95_ms", summaries[name]["elapsed"]["p95"] * 1000)
+        report.add_metric(f"network.{name}.wall_time_ms", reports[name].metrics["runner.wall_time_ms"]["value"])
+
+def main(args=None):
+    """Main runner function"""
+    args = args or parse_args([])
+    checks = discover_checks(args.only)
+
+    if args.list:
+        for suite, name, _ in checks:
+            print(f"{suite}.{name}")
+        return True
+
+    print("🚀 Starting Parallel Test Run for Next.js Portfolio")
+    print("=" * 60)
+
+    if args.network and args.compare_targets:
+        print("  ❌ --network and --compare-targets cannot be combined")
+        return False
+
+    targets = ["standin", "next"] if args.compare_targets else [args.server]
+    reports = {}
+    for target in targets:
+        try:
+            with serve(target, args.next_mode) as server:
+                if args.network:
+                    reports = run_throttled(args, checks, server)
+                else:
+                    reports[target] = run_once(args, checks, server)
+        except RuntimeError as e:
+            print(f"  ❌ Could not start the {target} server: {e}")
+            return False
+
+    if args.compare_targets:
+        print_target_comparison(reports)
+    report = reports[list(reports)[-1]]
+    if args.network:
+        print_network_comparison(reports, report)
+
+    success = all(report.passed for report in reports.values())
+    print(f"\n🎯 OVERALL STATUS: {'✅ ALL CHECKS PASSED' if success else '❌ ISSUES DETECTED'}")
+    return finish_report(report, args, success)
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark for the procedure PDFs
+Times a full and an incremental build of the search index, reports its size,
+then replays a query corpus against /api/search and reports latency
+percentiles, both end to end and as measured by the route (tookMs), and
+checks that each query finds the procedure it is about
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from urllib.parse import urlencode
+
+import requests
+
+import build_search_index
+import http_client
+from perf_stats import summarize
+from search_index import INDEX_PATH, load_index
+from server_fixture import add_server_arguments, serve
+from suite_report import SuiteReport, add_report_arguments, finish_report
+
+# (query, procedure expected as the top result, None when any answer is fine)
+QUERY_CORPUS = [
+    ("proxmox", "Proxmox.pdf"),
+    ("clé usb bootable", "Proxmox.pdf"),
+    ("vlan", "VLAN_Interco.pdf"),
+    ("switch netgear", "VLAN_Interco.pdf"),
+    ("port pvid", "VLAN_Interco.pdf"),
+    ("routeur zyxel", "VLAN_Interco.pdf"),
+    ("ettercap", "MITM_Ettercap.pdf"),
+    ("dns spoofing", "MITM_DNS_Spoofing.pdf"),
+    ("faux site", "MITM_DNS_Spoofing.pdf"),
+    ("zabbix", "Zabbix.pdf"),
+    ("mysql base de données", "Zabbix.pdf"),
+    ("glpi", "GLPI.pdf"),
+    ("contrôleur de domaine", "Active_Directory.pdf"),
+    ("unités d'organisation", "Active_Directory.pdf"),
+    ("fond d'écran", "Active_Directory.pdf"),
+    ("patrimoine informatique", "TCS.pdf"),
+    # Prefixes, as typed in a search box
+    ("inst", None),
+    ("config", None),
+    ("adresse ip", None),
+    ("windows server", None),
+    # Nothing to find
+    ("xyzzy plugh", None),
+]
+
+def measure_build(jobs):
+    """Time a full build (every PDF extracted) then an incremental one (nothing changed)"""
+    print("🏗️  Full build...")
+    start = time.perf_counter()
+    full = build_search_index.build(jobs, force=True)
+    full_ms = (time.perf_counter() - start) * 1000
+    print("🏗️  Incremental build...")
+    start = time.perf_counter()
+    incremental = build_search_index.build(jobs)
+    incremental_ms = (time.perf_counter() - start) * 1000
+    print(f"  ✅ full {full_ms:.0f}ms ({full['extracted']} extracted), "
+          f"incremental {incremental_ms:.0f}ms ({incremental['reused']} reused)")
+    return {
+        "success": not full["errors"] and incremental["extracted"] == 0,
+        "full_ms": full_ms,
+        "incremental_ms": incremental_ms,
+        "errors": full["errors"],
+    }
+
+def measure_index(path=INDEX_PATH):
+    """Size of the index on disk and over the wire, and what it is made of"""
+    index = load_index(path)
+    if index is None:
+        return {"success": False, "error": f"{path} not found, run build_search_index.py"}
+    with open(path, "rb") as f:
+        raw = f.read()
+    postings = sum(len(entries) // 3 for entries in index["terms"].values())
+    text_bytes = sum(len(page.encode()) for document in index["documents"] for page in document["pages"])
+    result = {
+        "success": True,
+        "bytes": len(raw),
+        "gzip_bytes": len(gzip.compress(raw, 9)),
+        "documents": len(index["documents"]),
+        "pages": sum(len(document["pages"]) for document in index["documents"]),
+        "terms": len(index["terms"]),
+        "postings": postings,
+        "text_bytes": text_bytes,
+    }
+    print(f"📦 Index: {result['bytes'] / 1024:.1f}KB ({result['gzip_bytes'] / 1024:.1f}KB gzip), "
+          f"{result['documents']} documents, {result['pages']} pages, {result['terms']} terms, "
+          f"{postings} postings, page texts {text_bytes / len(raw) * 100:.0f}% of the file")
+    return result
+
+def search(query, limit=10):
+    """One /api/search request: (end-to-end seconds, decoded JSON)"""
+    chunks = []
+    fetched = http_client.fetch_timed(f"/api/search?{urlencode({'q': query, 'limit': limit})}",
+                                      on_chunk=lambda chunk, elapsed: chunks.append(chunk))
+    response = fetched["response"]
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(f"HTTP {response.status_code} for {query!r}", response=response)
+    return fetched["total"], json.loads(b"".join(chunks))
+
+def measure_queries(corpus, repeats):
+    """
+    Replay the corpus repeats times. The very first request is reported apart:
+    it is the one that loads the index into the server.
+    """
+    first_ms = search(corpus[0][0])[0] * 1000
+    latencies, took, misses = [], [], []
+    per_query = {}
+    for _ in range(repeats):
+        for query, expected in corpus:
+            elapsed, body = search(query)
+            latencies.append(elapsed)
+            took.append(body["tookMs"] / 1000)
+            per_query.setdefault(query, []).append(elapsed)
+            top = body["results"][0]["file"] if body["results"] else None
+            if expected is not None and top != expected and query not in misses:
+                misses.append(query)
+                print(f"  ❌ {query!r}: top result {top}, expected {expected}")
+
+    http = summarize(latencies)
+    route = summarize(took)
+    slowest = sorted(per_query.items(), key=lambda item: summarize(item[1])["p50"], reverse=True)[:3]
+    print(f"🔎 {len(latencies)} queries: p50 {http['p50'] * 1000:.2f}ms, p95 {http['p95'] * 1000:.2f}ms, "
+          f"p99 {http['p99'] * 1000:.2f}ms (route: p50 {route['p50'] * 1000:.3f}ms, "
+          f"p95 {route['p95'] * 1000:.3f}ms), first request {first_ms:.1f}ms")
+    for query, values in slowest:
+        print(f"    {query!r:<32} p50 {summarize(values)['p50'] * 1000:.2f}ms")
+    return {
+        "success": not misses,
+        "queries": len(latencies),
+        "first_ms": first_ms,
+        "p50_ms": http["p50"] * 1000,
+        "p95_ms": http["p95"] * 1000,
+        "p99_ms": http["p99"] * 1000,
+        "route_p50_ms": route["p50"] * 1000,
+        "route_p95_ms": route["p95"] * 1000,
+        "misses": misses,
+    }
+
+def load_corpus(path):
+    """A JSON list of [query, expected file or null] pairs"""
+    with open(path) as f:
+        return [tuple(entry) for entry in json.load(f)]
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Search index build, size and /api/search latency benchmark")
+    parser.add_argument("--repeats", type=int, default=20, help="passes over the query corpus (default: 20)")
+    parser.add_argument("--queries", metavar="PATH", help="JSON query corpus (default: the built-in one)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for the build (default: number of CPUs)")
+    parser.add_argument("--skip-build", action="store_true", help="measure the existing index without rebuilding it")
+    parser.add_argument("--max-p95-ms", type=float, default=50.0,
+                        help="end-to-end p95 budget per query (default: 50)")
+    add_server_arguments(parser)
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Main benchmark function"""
+    args = args or parse_args([])
+    print("🚀 Starting Search Benchmark for Next.js Portfolio")
+    print("=" * 60)
+
+    corpus = load_corpus(args.queries) if args.queries else QUERY_CORPUS
+    report = SuiteReport("search")
+
+    if not args.skip_build:
+        if build_search_index.pymupdf is None:
+            print("  ⚠️  PyMuPDF not installed, measuring the existing index (pip install pymupdf)")
+        else:
+            built = report.run("build_index", measure_build, args.jobs)
+            if "full_ms" in built:
+                report.add_metric("search.build_ms", built["full_ms"])
+                report.add_metric("search.incremental_build_ms", built["incremental_ms"])
+
+    size = report.run("index_size", measure_index)
+    if not size["success"]:
+        print(f"  ❌ {size['error']}")
+        return finish_report(report, args, False)
+    report.add_metric("search.index_bytes", size["bytes"], unit="bytes")
+    report.add_metric("search.index_gzip_bytes", size["gzip_bytes"], unit="bytes")
+
+    try:
+        with serve(args.server, args.next_mode):
+            report.start_server_metrics()
+            queries = report.run("query_latency", measure_queries, corpus, args.repeats)
+            report.collect_server_metrics()
+    except RuntimeError as e:
+        print(f"  ❌ Could not start the {args.server} server: {e}")
+        return False
+
+    if "p95_ms" in queries:
+        report.add_metric("search.p50_ms", queries["p50_ms"])
+        report.add_metric("search.p95_ms", queries["p95_ms"])
+        report.add_metric("search.route_p95_ms", queries["route_p95_ms"])
+        within_budget = queries["p95_ms"] <= args.max_p95_ms
+        if not within_budget:
+            print(f"  ❌ p95 {queries['p95_ms']:.2f}ms over the {args.max_p95_ms:g}ms budget")
+    else:
+        print(f"  ❌ {queries.get('error')}")
+        within_budget = False
+
+    success = report.passed and within_budget
+    print(f"\n🎯 SEARCH: {'✅ FAST AND RELEVANT' if success else '❌ CHECK THE FAILURES ABOVE'}")
+    return finish_report(report, args, success)
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
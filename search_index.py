@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the procedure PDFs
+Tokenizer, index format and ranking shared by build_search_index.py, the
+stand-in server and search_benchmark.py. src/lib/searchIndex.js implements the
+same tokenizer and ranking for /api/search; keep both in sync
+"""
+
+import json
+import math
+import os
+import re
+import unicodedata
+
+from procedures import PROCEDURES_DIR
+
+# Written by build_search_index.py, read by /api/search
+INDEX_PATH = os.path.join(PROCEDURES_DIR, "search-index.json")
+
+INDEX_VERSION = 1
+
+# Tokens shorter than this are dropped (d', l', single letters of lists)
+MIN_TOKEN_LENGTH = 2
+
+# Folded (lowercase, no accents) words too common to rank on; stored in the index
+# so the route tokenizes queries with exactly the list the postings were built with
+STOPWORDS = sorted({
+    "au", "aux", "avec", "ce", "ces", "cette", "dans", "de", "des", "du", "elle", "en", "est", "et",
+    "il", "la", "le", "les", "leur", "leurs", "ne", "nous", "on", "ou", "par", "pas", "plus", "pour",
+    "qu", "que", "qui", "sa", "se", "ses", "son", "sont", "sur", "un", "une", "vous",
+    "and", "for", "in", "is", "of", "the", "to",
+})
+
+# BM25 parameters, one page being one unit of retrieval
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# The last query word also matches the terms it is a prefix of (search as you type)
+MAX_PREFIX_EXPANSIONS = 10
+
+SNIPPET_LENGTH = 180
+SNIPPET_CONTEXT = 60
+
+_COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+_TOKEN = re.compile("[a-z0-9]+")
+_LEADER_DOTS = re.compile(r"\.{4,}")
+
+def fold(text):
+    """Lowercase and strip accents: 'Procédure' → 'procedure'"""
+    return _COMBINING_MARKS.sub("", unicodedata.normalize("NFD", text)).lower()
+
+def fold_chars(text):
+    """fold() one character at a time, so offsets in the result are offsets in text"""
+    return "".join((fold(char) or " ")[:1] for char in text)
+
+def tokenize(text, stopwords=STOPWORDS):
+    """Index terms of a text, in order, repeated as they occur"""
+    stopwords = stopwords if isinstance(stopwords, (set, frozenset)) else set(stopwords)
+    return [token for token in _TOKEN.findall(fold(text))
+            if len(token) >= MIN_TOKEN_LENGTH and token not in stopwords]
+
+def clean_text(text):
+    """Page text as stored in the index: whitespace runs collapsed, table of contents leaders shortened"""
+    return " ".join(_LEADER_DOTS.sub(" … ", text).split())
+
+def document_title(filename):
+    """Active_Directory.pdf → 'Active Directory' (PDF metadata titles are mostly 'Microsoft Word - ...')"""
+    return os.path.splitext(filename)[0].replace("_", " ")
+
+def build_postings(documents):
+    """
+    {term: [doc, page, tf, doc, page, tf, ...]} over every page of every
+    document, plus the token count of each page, as stored in the index
+    """
+    stopwords = set(STOPWORDS)
+    postings = {}
+    lengths = []
+    for doc_id, document in enumerate(documents):
+        page_lengths = []
+        for page, text in enumerate(document["pages"]):
+            counts = {}
+            for token in tokenize(text, stopwords):
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                postings.setdefault(term, []).extend((doc_id, page, tf))
+            page_lengths.append(sum(counts.values()))
+        lengths.append(page_lengths)
+    return dict(sorted(postings.items())), lengths
+
+def load_index(path=INDEX_PATH):
+    """The raw index written by build_search_index.py, or None if it was not built"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+class SearchIndex:
+    """Loaded index answering ranked queries, the same way src/lib/searchIndex.js does"""
+
+    def __init__(self, raw):
+        self.documents = raw["documents"]
+        self.stopwords = set(raw["tokenizer"]["stopwords"])
+        self.postings = raw["terms"]
+        self.terms = sorted(self.postings)
+        self.page_lengths = [document["lengths"] for document in self.documents]
+        pages = [length for lengths in self.page_lengths for length in lengths]
+        self.page_count = len(pages)
+        self.average_length = sum(pages) / len(pages) if pages else 0
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        raw = load_index(path)
+        return cls(raw) if raw is not None else None
+
+    def expand(self, token):
+        """Indexed terms starting with token, the exact term first"""
+        start = self._lower_bound(token)
+        expansions = []
+        for term in self.terms[start:]:
+            if not term.startswith(token) or len(expansions) >= MAX_PREFIX_EXPANSIONS:
+                break
+            expansions.append(term)
+        return expansions
+
+    def _lower_bound(self, token):
+        low, high = 0, len(self.terms)
+        while low < high:
+            middle = (low + high) // 2
+            if self.terms[middle] < token:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def score_term(self, term):
+        """BM25 contribution of one term to every page containing it: {(doc, page): score}"""
+        postings = self.postings.get(term, [])
+        frequency = len(postings) // 3
+        idf = math.log(1 + (self.page_count - frequency + 0.5) / (frequency + 0.5))
+        scores = {}
+        for i in range(0, len(postings), 3):
+            doc, page, tf = postings[i:i + 3]
+            norm = 1 - BM25_B + BM25_B * self.page_lengths[doc][page] / self.average_length
+            scores[(doc, page)] = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return scores
+
+    def search(self, query, limit=10):
+        """
+        Pages ranked by BM25, summed over the query words. The last word also
+        matches longer terms it is a prefix of; a page counts a word once, with
+        its best-scoring expansion.
+        """
+        tokens = list(dict.fromkeys(tokenize(query, self.stopwords)))
+        matched_terms = set()
+        scores = {}
+        for i, token in enumerate(tokens):
+            expansions = self.expand(token) if i == len(tokens) - 1 else [token] if token in self.postings else []
+            best = {}
+            for term in expansions:
+                matched_terms.add(term)
+                for key, score in self.score_term(term).items():
+                    best[key] = max(best.get(key, 0), score)
+            for key, score in best.items():
+                scores[key] = scores.get(key, 0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for (doc, page), score in ranked[:limit]:
+            document = self.documents[doc]
+            results.append({
+                "file": document["file"],
+                "title": document["title"],
+                "page": page + 1,
+                "score": round(score, 4),
+                "snippet": snippet(document["pages"][page], matched_terms),
+                "url": f"/api/pdf/{document['file']}#page={page + 1}",
+            })
+        return {"total": len(scores), "results": results}
+
+def snippet(text, terms):
+    """Around SNIPPET_LENGTH characters of text surrounding the first matched term"""
+    folded = fold_chars(text)
+    position = next((match.start() for match in _TOKEN.finditer(folded) if match.group() in terms), 0)
+    start = max(0, position - SNIPPET_CONTEXT)
+    if start > 0:
+        # Start on a word boundary
+        space = text.find(" ", start)
+        start = space + 1 if -1 < space < position else start
+    end = min(len(text), start + SNIPPET_LENGTH)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > position else end
+    return ("…" if start > 0 else "") + text[start:end].strip() + ("…" if end < len(text) else "")
@@ -0,0 +1,309 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const http = require('http');
+const path = require('path');
+
+// Serveur de fichiers pour out/ (build-static.js), sans dépendance : applique
+// _redirects et _headers comme un hébergeur statique, avec ETag, 304, Range et
+// variantes .br/.gz, pour comparer le mode statique au rendu serveur.
+//   node serve-static.js [--dir out] [--port 3000]
+
+function argument(name, fallback) {
+  const index = process.argv.indexOf(name);
+  return index !== -1 ? process.argv[index + 1] : fallback;
+}
+
+const rootDir = path.resolve(argument('--dir', path.join(__dirname, 'out')));
+const port = Number(argument('--port', process.env.PORT || 3000));
+
+const CONTENT_TYPES = {
+  '.html': 'text/html; charset=utf-8',
+  '.js': 'application/javascript; charset=utf-8',
+  '.css': 'text/css; charset=utf-8',
+  '.json': 'application/json',
+  '.pdf': 'application/pdf',
+  '.png': 'image/png',
+  '.jpg': 'image/jpeg',
+  '.jpeg': 'image/jpeg',
+  '.webp': 'image/webp',
+  '.avif': 'image/avif',
+  '.svg': 'image/svg+xml',
+  '.ico': 'image/x-icon',
+  '.woff2': 'font/woff2',
+  '.txt': 'text/plain; charset=utf-8'
+};
+
+// Négociation et requêtes conditionnelles reprises de src/lib/contentEncoding.js,
+// httpConditional.js et httpRange.js (modules ESM, non chargeables par ce script CommonJS)
+const PRECOMPRESSED = [['br', '.br'], ['gzip', '.gz']];
+
+// Valeurs q de l'en-tête Accept-Encoding ("br;q=1.0, gzip;q=0.8, *;q=0")
+function parseAcceptEncoding(header) {
+  const weights = new Map();
+  for (const part of header.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    if (!name) continue;
+    const q = params.map(param => param.trim()).find(param => param.startsWith('q='));
+    const weight = q ? Number(q.slice(2)) : 1;
+    weights.set(name, Number.isNaN(weight) ? 0 : weight);
+  }
+  return weights;
+}
+
+// Encodages acceptés par le client, du plus au moins préféré
+function acceptedEncodings(header) {
+  if (!header) return [];
+  const weights = parseAcceptEncoding(header);
+  const weightOf = encoding => weights.get(encoding) ?? weights.get('*') ?? 0;
+  return PRECOMPRESSED
+    .filter(([encoding]) => weightOf(encoding) > 0)
+    .sort((a, b) => weightOf(b[0]) - weightOf(a[0]));
+}
+
+// If-None-Match (comparaison faible, prioritaire) puis If-Modified-Since comparé en date
+function isNotModified(request, etag, lastModified) {
+  const ifNoneMatch = request.headers['if-none-match'];
+  if (ifNoneMatch) {
+    if (ifNoneMatch.trim() === '*') return true;
+    const normalize = value => value.trim().replace(/^W\//, '');
+    return ifNoneMatch.split(',').some(candidate => normalize(candidate) === normalize(etag));
+  }
+  const ifModifiedSince = request.headers['if-modified-since'];
+  if (!ifModifiedSince) return false;
+  const since = Date.parse(ifModifiedSince);
+  return !Number.isNaN(since) && Date.parse(lastModified) <= since;
+}
+
+// null : fichier complet ; { unsatisfiable: true } : 416 ; { start, end } : 206
+function parseRange(header, size) {
+  if (!header) return null;
+  const match = /^\s*bytes\s*=\s*(.*)$/i.exec(header);
+  if (!match) return null;
+  const specs = match[1].split(',').map(spec => spec.trim()).filter(Boolean);
+  if (specs.length !== 1) return null;
+  const bounds = /^(\d*)\s*-\s*(\d*)$/.exec(specs[0]);
+  if (!bounds || (bounds[1] === '' && bounds[2] === '')) return null;
+
+  if (bounds[1] === '') {
+    const suffix = Number(bounds[2]);
+    if (suffix === 0 || size === 0) return { unsatisfiable: true };
+    return { start: Math.max(0, size - suffix), end: size - 1 };
+  }
+  const start = Number(bounds[1]);
+  const end = bounds[2] === '' ? Math.max(start, size - 1) : Number(bounds[2]);
+  if (end < start) return null;
+  if (start >= size) return { unsatisfiable: true };
+  return { start, end: Math.min(end, size - 1) };
+}
+
+// If-Range : ETag en comparaison forte, ou date égale à Last-Modified
+function isRangeFresh(ifRange, etag, lastModified) {
+  if (!ifRange) return true;
+  const value = ifRange.trim();
+  if (value.startsWith('"') || value.startsWith('W/')) return !value.startsWith('W/') && value === etag;
+  const since = Date.parse(value);
+  return !Number.isNaN(since) && since === Date.parse(lastModified);
+}
+
+function readLines(file) {
+  try {
+    return fs.readFileSync(path.join(rootDir, file), 'utf8').split('\n');
+  } catch (error) {
+    return [];
+  }
+}
+
+// '/images/*' → /^\/images\/.*$/
+function patternToRegex(pattern) {
+  const escaped = pattern.replace(/[.+?^${}()|[\]\\]/g, '\\$&').replace(/\*/g, '.*');
+  return new RegExp(`^${escaped}$`);
+}
+
+function loadHeaderRules() {
+  const rules = [];
+  for (const line of readLines('_headers')) {
+    if (!line.trim() || line.trim().startsWith('#')) continue;
+    if (!/^\s/.test(line)) {
+      rules.push({ regex: patternToRegex(line.trim()), headers: {} });
+    } else if (rules.length) {
+      const separator = line.indexOf(':');
+      rules[rules.length - 1].headers[line.slice(0, separator).trim()] = line.slice(separator + 1).trim();
+    }
+  }
+  return rules;
+}
+
+// Règles au format Netlify : « /de  /vers  statut », * dans /de pour un préfixe.
+// 3xx : redirection (appliquée d'abord) ; 200 : réécriture ; 4xx : réponse d'erreur propre au
+// chemin. Réécritures et erreurs ne s'appliquent que si aucun fichier ne correspond au chemin.
+function loadRedirects() {
+  const rules = [];
+  for (const line of readLines('_redirects')) {
+    const [from, to, status] = line.trim().split(/\s+/);
+    if (from && to && !from.startsWith('#')) {
+      rules.push({ regex: patternToRegex(from), to, status: Number(status) || 301 });
+    }
+  }
+  return rules;
+}
+
+const headerRules = loadHeaderRules();
+const redirects = loadRedirects();
+
+// ETag fort (SHA-256) comme la route PDF, calculé au démarrage pour tout rootDir.
+// Un fichier modifié depuis (mtime/taille différents) reçoit un ETag dérivé de sa
+// taille et de sa date, sans relire son contenu pendant la requête.
+const etags = new Map();
+
+function hashFile(filePath) {
+  return new Promise((resolve, reject) => {
+    const hash = crypto.createHash('sha256');
+    fs.createReadStream(filePath)
+      .on('error', reject)
+      .on('data', chunk => hash.update(chunk))
+      .on('end', () => resolve(`"${hash.digest('hex').slice(0, 32)}"`));
+  });
+}
+
+async function computeEtags(dir) {
+  for (const entry of await fs.promises.readdir(dir, { withFileTypes: true })) {
+    const filePath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      await computeEtags(filePath);
+    } else if (entry.isFile()) {
+      const stats = await fs.promises.stat(filePath);
+      etags.set(filePath, { mtimeMs: stats.mtimeMs, size: stats.size, etag: await hashFile(filePath) });
+    }
+  }
+}
+
+function etagFor(filePath, stats) {
+  const known = etags.get(filePath);
+  if (known && known.mtimeMs === stats.mtimeMs && known.size === stats.size) return known.etag;
+  return `"${stats.size.toString(16)}-${Math.floor(stats.mtimeMs).toString(16)}"`;
+}
+
+// /accueil → accueil.html, /dossier/ → dossier/index.html ; null hors de rootDir ou absent
+function resolveFile(urlPath) {
+  const candidate = path.normalize(path.join(rootDir, urlPath));
+  if (candidate !== rootDir && !candidate.startsWith(rootDir + path.sep)) return null;
+  for (const filePath of [candidate, path.join(candidate, 'index.html'), `${candidate}.html`]) {
+    try {
+      if (fs.statSync(filePath).isFile()) return filePath;
+    } catch (error) {
+      // essai suivant
+    }
+  }
+  return null;
+}
+
+// Variante précompressée acceptée par le client et pas plus ancienne que l'original
+function precompressedVariant(request, filePath, stats) {
+  for (const [encoding, extension] of acceptedEncodings(request.headers['accept-encoding'])) {
+    const variantPath = filePath + extension;
+    if (!fs.existsSync(variantPath)) continue;
+    const variantStats = fs.statSync(variantPath);
+    if (variantStats.mtimeMs < stats.mtimeMs) continue;
+    return { encoding, filePath: variantPath, size: variantStats.size, etag: etagFor(variantPath, variantStats) };
+  }
+  return null;
+}
+
+function send(response, status, headers, filePath, range) {
+  response.writeHead(status, headers);
+  if (!filePath) return response.end();
+  fs.createReadStream(filePath, range || {}).on('error', () => response.destroy()).pipe(response);
+}
+
+function handle(request, response) {
+  const urlPath = decodeURIComponent(new URL(request.url, 'http://localhost').pathname);
+  const headers = {};
+  for (const rule of headerRules) {
+    if (rule.regex.test(urlPath)) Object.assign(headers, rule.headers);
+  }
+
+  const redirect = redirects.find(rule => rule.status >= 300 && rule.status < 400 && rule.regex.test(urlPath));
+  if (redirect) {
+    return send(response, redirect.status, { ...headers, Location: redirect.to, 'Content-Length': '0' });
+  }
+
+  let filePath = resolveFile(urlPath);
+  let status = 200;
+  if (!filePath) {
+    // Réécriture (200) ou erreur propre au chemin (4xx), sinon la page 404 du site
+    const rewrite = redirects.find(rule => (rule.status === 200 || rule.status >= 400) && rule.regex.test(urlPath));
+    filePath = rewrite ? resolveFile(rewrite.to) : null;
+    status = rewrite && filePath ? rewrite.status : 404;
+    filePath = filePath || resolveFile('/404.html');
+    if (!filePath) {
+      response.writeHead(404, { 'Content-Type': 'text/plain' });
+      return response.end('Not Found');
+    }
+  }
+
+  const stats = fs.statSync(filePath);
+  const etag = etagFor(filePath, stats);
+  const lastModified = stats.mtime.toUTCString();
+  Object.assign(headers, {
+    'Content-Type': headers['Content-Type'] || CONTENT_TYPES[path.extname(filePath).toLowerCase()] || 'application/octet-stream',
+    'ETag': etag,
+    'Last-Modified': lastModified,
+    'Accept-Ranges': 'bytes'
+  });
+
+  if (status === 200) {
+    // Représentation servie : variante .br/.gz si le client l'accepte (jamais pour une
+    // requête Range, les plages portent sur le fichier original)
+    const variant = request.headers.range ? null : precompressedVariant(request, filePath, stats);
+    if (variant) {
+      Object.assign(headers, { 'Content-Encoding': variant.encoding, 'ETag': variant.etag, 'Vary': 'Accept-Encoding' });
+    }
+
+    if (isNotModified(request, headers.ETag, lastModified)) return send(response, 304, headers);
+
+    if (variant) {
+      return send(response, 200, { ...headers, 'Content-Length': String(variant.size) },
+        request.method === 'HEAD' ? null : variant.filePath);
+    }
+
+    const range = isRangeFresh(request.headers['if-range'], etag, lastModified)
+      ? parseRange(request.headers.range, stats.size)
+      : null;
+    if (range && range.unsatisfiable) {
+      return send(response, 416, { ...headers, 'Content-Range': `bytes */${stats.size}`, 'Content-Length': '0' });
+    }
+    if (range) {
+      return send(response, 206, {
+        ...headers,
+        'Content-Range': `bytes ${range.start}-${range.end}/${stats.size}`,
+        'Content-Length': String(range.end - range.start + 1)
+      }, request.method === 'HEAD' ? null : filePath, range);
+    }
+  }
+
+  send(response, status, { ...headers, 'Content-Length': String(stats.size) }, request.method === 'HEAD' ? null : filePath);
+}
+
+if (!fs.existsSync(rootDir)) {
+  console.log(`❌ ${rootDir} introuvable : lancer \`npm run build:static\``);
+  process.exit(1);
+}
+
+const server = http.createServer((request, response) => {
+  try {
+    handle(request, response);
+  } catch (error) {
+    console.error('Error serving static file:', error);
+    response.writeHead(500, { 'Content-Type': 'text/plain' });
+    response.end('Internal server error');
+  }
+});
+
+computeEtags(rootDir).then(() => {
+  server.listen(port, () => {
+    console.log(`📡 Site statique ${path.relative(__dirname, rootDir) || '.'} servi sur http://localhost:${port} (${etags.size} ETags)`);
+  });
+}).catch(error => {
+  console.error('❌ Calcul des ETags impossible :', error);
+  process.exit(1);
+});
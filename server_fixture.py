@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+Server fixtures for the portfolio test scripts
+Starts `next start` on a free port, the pre-rendered out/ directory behind
+serve-static.js, or a lightweight stand-in that serves public/procedures and
+the / → /accueil redirect with the next.config.js headers
+"""
+
+import argparse
+import email.utils
+import hashlib
+import http.server
+import json
+import os
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import parse_qs, unquote, urlparse
+
+import requests
+
+import http_client
+import next_config
+import server_metrics
+import server_timing
+from procedures import PAGES_DIR
+from search_index import SearchIndex
+from server_metrics import MetricsRegistry
+from suite_report import ROUTE_PATTERNS
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLIC_DIR = os.path.join(ROOT_DIR, "public")
+APP_DIR = os.path.join(ROOT_DIR, "src", "app")
+
+TARGETS = ("external", "next", "standin", "static")
+
+# Pre-rendered site written by build-static.js
+OUT_DIR = os.path.join(ROOT_DIR, "out")
+
+# /api/pdf/GLPI.pdf/pages/3
+PDF_PAGE_PATH = re.compile(r"^/api/pdf/([^/]+)/pages/([^/]+)$")
+
+# Incoming X-Request-Id reused as in src/lib/serverTiming.js
+REQUEST_ID = re.compile(r"^[\w.:-]{1,128}$")
+
+# Same variants and preference order as PRECOMPRESSED_ENCODINGS in src/lib/contentEncoding.js
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+    ".svg": "image/svg+xml",
+    ".ico": "image/x-icon",
+    ".json": "application/json",
+}
+
+def free_port():
+    """Ask the OS for a free TCP port on localhost"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(base_url, timeout=60.0, process=None):
+    """Poll / until the server answers, returning the time it took"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode} before becoming ready")
+        try:
+            requests.get(f"{base_url}/", allow_redirects=False, timeout=1)
+            return time.perf_counter() - start
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    raise TimeoutError(f"{base_url} not ready after {timeout:.0f}s")
+
+def wait_until_listening(port, timeout=60.0, process=None):
+    """Poll the port until it accepts a TCP connection, without sending any request"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode} before listening")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError(f"port {port} not listening after {timeout:.0f}s")
+
+def load_config_headers():
+    """
+    headers() from next.config.js, so the stand-in sends exactly what Next.js
+    would. Returns [] if node is not available.
+    """
+    try:
+        rules = next_config.headers()
+    except RuntimeError as e:
+        print(f"  ⚠️  Could not read headers from next.config.js ({e}), stand-in sends none")
+        return []
+    return [(source_to_regex(rule["source"]), rule["headers"]) for rule in rules]
+
+def source_to_regex(source):
+    """Convert a Next.js path pattern ('/(.*)', '/images/:path*') to a compiled regex"""
+    pattern = re.sub(r"/:\w+\*", "(?:/.*)?", source)
+    pattern = re.sub(r"/:\w+\+", "/.+", pattern)
+    pattern = re.sub(r":\w+", "[^/]+", pattern)
+    return re.compile(f"^{pattern}$")
+
+def discover_pages():
+    """Page routes of the app router (every src/app directory holding a page.js)"""
+    pages = set()
+    for directory, _, files in os.walk(APP_DIR):
+        if "page.js" in files:
+            relative = os.path.relpath(directory, APP_DIR)
+            pages.add("/" if relative == "." else "/" + relative.replace(os.sep, "/"))
+    return pages
+
+def http_date(value):
+    """Seconds since the epoch of an HTTP date, None if it does not parse (Date.parse → NaN)"""
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def is_not_modified(headers, etag, last_modified):
+    """isNotModified() of src/lib/httpConditional.js: If-None-Match first, weak comparison"""
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        current = etag.strip().removeprefix("W/")
+        return any(candidate.strip().removeprefix("W/") == current for candidate in if_none_match.split(","))
+
+    if_modified_since = headers.get("If-Modified-Since")
+    if not if_modified_since:
+        return False
+    since = http_date(if_modified_since)
+    return since is not None and http_date(last_modified) <= since
+
+def parse_range(header, size):
+    """
+    parseRange() of src/lib/httpRange.js: None to answer 200 (no usable Range,
+    several ranges), "unsatisfiable" for a 416, else inclusive (start, end)
+    """
+    if not header:
+        return None
+    match = re.fullmatch(r"\s*bytes\s*=\s*(.*)", header, re.IGNORECASE | re.DOTALL)
+    if not match:
+        return None
+    specs = [spec.strip() for spec in match.group(1).split(",") if spec.strip()]
+    if len(specs) != 1:
+        return None
+    bounds = re.fullmatch(r"(\d*)\s*-\s*(\d*)", specs[0])
+    if not bounds or bounds.groups() == ("", ""):
+        return None
+
+    first, last = bounds.groups()
+    if first == "":
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return "unsatisfiable"
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    end = max(start, size - 1) if last == "" else int(last)
+    if end < start:
+        return None
+    if start >= size:
+        return "unsatisfiable"
+    return start, min(end, size - 1)
+
+def is_range_fresh(if_range, etag, last_modified):
+    """isRangeFresh() of src/lib/httpRange.js: strong ETag or exact date match"""
+    if not if_range:
+        return True
+    value = if_range.strip()
+    if value.startswith(('"', "W/")):
+        return not value.startswith("W/") and value == etag
+    since = http_date(value)
+    return since is not None and since == http_date(last_modified)
+
+def accepted_encodings(header):
+    """acceptedEncodings() of src/lib/contentEncoding.js: [(encoding, extension)] by preference"""
+    if not header:
+        return []
+    weights = {}
+    for part in header.split(","):
+        name, *params = part.strip().lower().split(";")
+        if not name:
+            continue
+        q = next((param.strip()[2:] for param in params if param.strip().startswith("q=")), None)
+        try:
+            weights[name] = float(q) if q is not None else 1.0
+        except ValueError:
+            weights[name] = 0.0
+
+    def weight_of(encoding):
+        return weights.get(encoding, weights.get("*", 0.0))
+
+    return sorted((entry for entry in PRECOMPRESSED if weight_of(entry[0]) > 0),
+                  key=lambda entry: weight_of(entry[0]), reverse=True)
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves what the tests exercise without the framework: the root redirect,
+    placeholder pages, public/ files, /api/pdf/[filename] and its single pages
+    with the same caching, range and content negotiation behaviour as the route
+    handlers, and /api/search over the same index and ranking
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "portfolio-standin"
+    # Headers and body are written separately: without TCP_NODELAY small keep-alive
+    # responses wait ~40ms on the client's delayed ACK, like Node.js (which sets it) never does
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.handle_request(send_body=False)
+
+    def do_GET(self):
+        self.handle_request(send_body=True)
+
+    def handle_request(self, send_body):
+        path = unquote(urlparse(self.path).path)
+        self.send_body = send_body
+        self.started = time.perf_counter()
+        self.timings = []
+
+        if path == "/":
+            # Redirect answered by src/middleware.js, same 307 as redirect() in a server component
+            return self.reply(307, b"", {"Location": "/accueil"}, path)
+        if path == "/api/metrics":
+            # Same Bearer check as src/app/api/metrics/route.js (the stand-in never runs as production)
+            token = os.environ.get("METRICS_TOKEN")
+            if token and self.headers.get("Authorization") != f"Bearer {token}":
+                return self.reply(401, b'{"error":"Unauthorized"}', {"Content-Type": "application/json"}, path)
+            body = self.server.metrics.render().encode()
+            return self.reply(200, body, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+                                          "Cache-Control": "no-store"}, path)
+        page_match = PDF_PAGE_PATH.match(path)
+        if page_match:
+            return self.serve_pdf_page(path, *page_match.groups())
+        if path.startswith("/api/pdf/"):
+            return self.serve_pdf(path, path[len("/api/pdf/"):])
+        if path == "/api/search":
+            return self.serve_search(path, parse_qs(urlparse(self.path).query))
+        if path.rstrip("/") in self.server.pages:
+            title = path.strip("/").replace("/", " · ")
+            body = f"<!DOCTYPE html><html><head><title>{title} | Portfolio</title></head><body></body></html>"
+            return self.reply(200, body.encode(), {"Content-Type": "text/html; charset=utf-8"}, path)
+
+        file_path = os.path.normpath(os.path.join(PUBLIC_DIR, path.lstrip("/")))
+        if file_path.startswith(PUBLIC_DIR + os.sep) and os.path.isfile(file_path):
+            content_type = CONTENT_TYPES.get(os.path.splitext(file_path)[1].lower(), "application/octet-stream")
+            return self.serve_file(path, file_path, {"Content-Type": content_type})
+        return self.reply(404, b"Not Found", {"Content-Type": "text/plain"}, path)
+
+    def serve_pdf(self, path, filename):
+        """Same checks, negotiation and headers as src/app/api/pdf/[filename]/route.js"""
+        file_path = os.path.join(PUBLIC_DIR, "procedures", filename)
+        if (os.path.basename(filename) != filename or not filename.lower().endswith(".pdf")
+                or not os.path.isfile(file_path)):
+            return self.reply(404, b'{"error":"PDF not found"}', {"Content-Type": "application/json"}, path)
+
+        # Precompressed variant the client prefers (never for a Range request), as selectVariant()
+        variant = None
+        if not self.headers.get("Range"):
+            mtime = os.stat(file_path).st_mtime
+            for encoding, extension in accepted_encodings(self.headers.get("Accept-Encoding")):
+                candidate = file_path + extension
+                if os.path.isfile(candidate) and os.stat(candidate).st_mtime >= mtime:
+                    variant = (encoding, candidate)
+                    break
+        return self.serve_file(path, file_path, {
+            "Content-Type": "application/pdf",
+            "Content-Disposition": f'inline; filename="{filename}"',
+            "Cache-Control": "public, max-age=3600",
+            "Vary": "Accept-Encoding",
+        }, variant)
+
+    def serve_pdf_page(self, path, filename, page):
+        """Single-page PDF written by split_pdf_pages.py, as src/app/api/pdf/[filename]/pages/[page]/route.js"""
+        if os.path.basename(filename) != filename or not filename.lower().endswith(".pdf"):
+            return self.reply(404, b'{"error":"PDF not found"}', {"Content-Type": "application/json"}, path)
+        if not re.fullmatch(r"[1-9]\d{0,4}", page):
+            return self.reply(400, b'{"error":"Invalid page number"}', {"Content-Type": "application/json"}, path)
+        name = f"{os.path.splitext(filename)[0]}-{page}.pdf"
+        file_path = os.path.join(PAGES_DIR, name)
+        if not os.path.isfile(file_path):
+            return self.reply(404, b'{"error":"Page not found"}', {"Content-Type": "application/json"}, path)
+        return self.serve_file(path, file_path, {
+            "Content-Type": "application/pdf",
+            "Content-Disposition": f'inline; filename="{name}"',
+            "Cache-Control": "public, max-age=3600",
+            "Vary": "Accept-Encoding",
+        })
+
+    def serve_search(self, path, params):
+        """Same validation, ranking and JSON as src/app/api/search/route.js"""
+        query = params.get("q", [""])[0].strip()
+        if not query or len(query) > 200:
+            error = "Missing query" if not query else "Query too long"
+            return self.reply(400, json.dumps({"error": error}).encode(), {"Content-Type": "application/json"}, path)
+        try:
+            limit = min(max(int(params.get("limit", [""])[0]) or 10, 1), 50)
+        except ValueError:
+            limit = 10
+        index = self.server.search_index()
+        if index is None:
+            return self.reply(503, b'{"error":"Search index not built"}', {"Content-Type": "application/json"}, path)
+
+        start = time.perf_counter()
+        found = index.search(query, limit)
+        self.mark("search", start)
+        body = {"query": query, **found, "tookMs": (time.perf_counter() - start) * 1000}
+        return self.reply(200, json.dumps(body, ensure_ascii=False).encode(), {
+            "Content-Type": "application/json",
+            "Cache-Control": "public, max-age=300",
+        }, path)
+
+    def mark(self, name, start, description=None):
+        """Server-Timing entry from start to now, as ServerTiming.add() in src/lib/serverTiming.js"""
+        self.timings.append((name, (time.perf_counter() - start) * 1000, description))
+
+    def serve_file(self, path, file_path, headers, variant=None):
+        """
+        Same revalidation, Range and variant handling as pdfResponse() in
+        src/lib/pdfResponse.js. variant is (encoding, path of the .br/.gz file)
+        or None; it carries its own ETag and size, the original's Last-Modified.
+        """
+        stats = os.stat(file_path)
+        last_modified = email.utils.formatdate(stats.st_mtime, usegmt=True)
+        served = variant[1] if variant else file_path
+        served_stats = os.stat(served) if variant else stats
+        etag = self.server.etag(served, served_stats)
+        size = served_stats.st_size
+        self.mark("lookup", self.started)
+        headers.update({
+            "Accept-Ranges": "bytes",
+            "Last-Modified": last_modified,
+            "ETag": etag,
+        })
+        if variant:
+            headers["Content-Encoding"] = variant[0]
+
+        if is_not_modified(self.headers, etag, last_modified):
+            return self.reply(304, b"", headers, path)
+
+        fresh = not variant and is_range_fresh(self.headers.get("If-Range"), etag, last_modified)
+        byte_range = parse_range(self.headers.get("Range"), size) if fresh else None
+        if byte_range == "unsatisfiable":
+            headers["Content-Range"] = f"bytes */{size}"
+            return self.reply(416, b"", headers, path)
+
+        start, end = byte_range or (0, size - 1)
+        read_start = time.perf_counter()
+        with open(served, "rb") as f:
+            f.seek(start)
+            body = f.read(end - start + 1)
+        self.mark("read", read_start, "miss")
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return self.reply(206, body, headers, path)
+        return self.reply(200, body, headers, path)
+
+    def reply(self, status, body, headers, path):
+        route = next((route for route, pattern in ROUTE_PATTERNS if pattern.match(path)), None)
+        if server_timing.ENABLED and (route is not None or path == "/"):
+            # Same headers as instrumentRoute() and the middleware
+            incoming = self.headers.get("X-Request-Id")
+            total = ("total", (time.perf_counter() - self.started) * 1000, None)
+            headers = {
+                **headers,
+                "Server-Timing": server_timing.format_header(self.timings + [total]),
+                "X-Request-Id": incoming if incoming and REQUEST_ID.match(incoming) else str(uuid.uuid4()),
+            }
+        self.send_response(status)
+        for key, value in {**self.server.config_headers_for(path), **headers}.items():
+            self.send_header(key, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if route is not None:
+            # Same series as instrumentRoute() in src/lib/metrics.js: latency up to the headers
+            length = len(body) if status != 304 else 0
+            self.server.metrics.record(route, self.command, status, length, time.perf_counter() - self.started)
+        if self.send_body and status != 304:
+            self.wfile.write(body)
+
+class StandInHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config_headers):
+        super().__init__(address, StandInHandler)
+        self.config_headers = config_headers
+        self.pages = discover_pages()
+        self.metrics = MetricsRegistry()
+        self._etags = {}
+        self._etags_lock = threading.Lock()
+        self._search_index = None
+        self._search_lock = threading.Lock()
+
+    def config_headers_for(self, path):
+        """Headers of every next.config.js rule matching the path, later rules winning"""
+        headers = {}
+        for regex, rule_headers in self.config_headers:
+            if regex.match(path):
+                headers.update({header["key"]: header["value"] for header in rule_headers})
+        return headers
+
+    def search_index(self):
+        """The search index, loaded on the first query like src/lib/searchIndex.js (None if not built)"""
+        with self._search_lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex.load() or False
+        return self._search_index or None
+
+    def etag(self, file_path, stats):
+        """Same strong ETag as src/lib/pdfCache.js (SHA-256 prefix), memoized per mtime/size"""
+        key = (stats.st_mtime_ns, stats.st_size)
+        with self._etags_lock:
+            known = self._etags.get(file_path)
+            if known and known[0] == key:
+                return known[1]
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        with self._etags_lock:
+            self._etags[file_path] = (key, etag)
+        return etag
+
+class StandInServer:
+    """In-process stand-in server on a free port"""
+
+    target = "standin"
+
+    def __init__(self, port=None):
+        self.port = port or free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.startup_time = None
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        start = time.perf_counter()
+        self._server = StandInHTTPServer(("127.0.0.1", self.port), load_config_headers())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        wait_until_ready(self.base_url)
+        self.startup_time = time.perf_counter() - start
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class NextServer:
+    """
+    `next start` (or `next dev`) child process on a free port.
+
+    env is added to the child's environment (e.g. NEXT_DIST_DIR for another
+    build). With wait_for="listening" start() returns as soon as the port
+    accepts connections, before any route has been requested.
+    """
+
+    target = "next"
+
+    def __init__(self, port=None, mode="start", timeout=120.0, env=None, wait_for="response"):
+        self.port = port or free_port()
+        self.mode = mode
+        self.timeout = timeout
+        self.env = env or {}
+        self.wait_for = wait_for
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.startup_time = None
+        self.log_path = None
+        self._process = None
+        self._log = None
+
+    @property
+    def dist_dir(self):
+        """Build directory next.config.js uses for this server"""
+        return os.path.join(ROOT_DIR, self.env.get("NEXT_DIST_DIR", ".next"))
+
+    def command(self):
+        local = os.path.join(ROOT_DIR, "node_modules", ".bin", "next")
+        binary = [local] if os.path.exists(local) else ["npx", "--no-install", "next"]
+        return binary + [self.mode, "-p", str(self.port), "-H", "127.0.0.1"]
+
+    def start(self):
+        if self.mode == "start" and not os.path.exists(os.path.join(self.dist_dir, "BUILD_ID")):
+            raise RuntimeError("no production build found, run `npm run build` first (or use --next-mode dev)")
+
+        # next start hides /api/metrics without METRICS_TOKEN: give the child the token the scrapes present
+        token = self.env.get("METRICS_TOKEN") or server_metrics.TOKEN or secrets.token_hex(16)
+        self.env = {**self.env, "METRICS_TOKEN": token}
+        server_metrics.set_token(token)
+
+        self._log = tempfile.NamedTemporaryFile(prefix="next-server-", suffix=".log", delete=False)
+        self.log_path = self._log.name
+        start = time.perf_counter()
+        self._process = subprocess.Popen(
+            self.command(), cwd=ROOT_DIR, stdout=self._log, stderr=subprocess.STDOUT,
+            env={**os.environ, **self.env, "PORT": str(self.port), "NEXT_TELEMETRY_DISABLED": "1"},
+            start_new_session=True,
+        )
+        try:
+            if self.wait_for == "listening":
+                wait_until_listening(self.port, self.timeout, self._process)
+            else:
+                wait_until_ready(self.base_url, self.timeout, self._process)
+        except (RuntimeError, TimeoutError) as e:
+            self.stop()
+            raise RuntimeError(f"{e} (see {self.log_path})") from e
+        self.startup_time = time.perf_counter() - start
+        return self
+
+    def stop(self):
+        if self._process is not None and self._process.poll() is None:
+            # next start spawns a worker, stop the whole process group
+            os.killpg(self._process.pid, 15)
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self._process.pid, 9)
+                self._process.wait()
+        self._process = None
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+class StaticServer(NextServer):
+    """serve-static.js child process serving the pre-rendered out/ directory"""
+
+    target = "static"
+
+    def __init__(self, port=None, timeout=30.0):
+        super().__init__(port, mode="static", timeout=timeout)
+
+    def command(self):
+        return ["node", os.path.join(ROOT_DIR, "serve-static.js"), "--dir", OUT_DIR, "--port", str(self.port)]
+
+    def start(self):
+        if not os.path.exists(os.path.join(OUT_DIR, "_headers")):
+            raise RuntimeError("no static build found, run `npm run build:static` first")
+        return super().start()
+
+class ExternalServer:
+    """An already running server at BASE_URL (the historical behaviour)"""
+
+    target = "external"
+
+    def __init__(self):
+        self.base_url = http_client.BASE_URL
+        self.startup_time = None
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+def create_server(target, next_mode="start"):
+    if target == "next":
+        return NextServer(mode=next_mode)
+    if target == "standin":
+        return StandInServer()
+    if target == "static":
+        return StaticServer()
+    return ExternalServer()
+
+@contextmanager
+def serve(target="external", next_mode="start"):
+    """
+    Start a server for the duration of the block and point http_client at it.
+
+    Yields the server object; its startup_time (seconds, None for an external
+    server) is the time from launch until / first answered.
+    """
+    server = create_server(target, next_mode)
+    previous = http_client.BASE_URL
+    print(f"🖥️  Starting {target} server...")
+    server.start()
+    if server.startup_time is not None:
+        print(f"  ✅ {server.base_url} ready in {server.startup_time * 1000:.0f}ms")
+    http_client.set_base_url(server.base_url)
+    try:
+        yield server
+    finally:
+        http_client.set_base_url(previous)
+        server.stop()
+
+def add_server_arguments(parser):
+    """Add the server fixture options to a script's argument parser"""
+    group = parser.add_argument_group("server")
+    group.add_argument("--server", choices=TARGETS, default="external",
+                       help="test an already running server at BASE_URL (default), "
+                            "spawn `next start` on a free port, use the local stand-in, "
+                            "or serve the pre-rendered out/ directory")
+    group.add_argument("--next-mode", choices=("start", "dev"), default="start",
+                       help="how --server next launches Next.js (default: start, needs `npm run build`)")
+    return parser
+
+def main():
+    """Run a fixture in the foreground so individual scripts can target it through BASE_URL"""
+    parser = argparse.ArgumentParser(description="Start a test server for the portfolio scripts")
+    parser.add_argument("--target", choices=TARGETS[1:], default="standin")
+    parser.add_argument("--next-mode", choices=("start", "dev"), default="start")
+    args = parser.parse_args()
+
+    try:
+        with serve(args.target, args.next_mode) as server:
+            print(f"  BASE_URL={server.base_url}  (Ctrl-C to stop)")
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"  ❌ {e}")
+        return False
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
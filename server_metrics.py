@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Server-side metrics from /api/metrics (Prometheus text format)
+Scrapes the running server before and after a suite, diffs the counters and
+histograms, and summarizes what the server observed per route so it can be
+compared with the client-side timings
+"""
+
+import os
+import re
+import threading
+import time
+
+import requests
+
+import http_client
+
+# Same buckets as DURATION_BUCKETS in src/lib/metrics.js
+DURATION_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+
+# Bearer token /api/metrics requires when METRICS_TOKEN is set (src/app/api/metrics/route.js);
+# without one, a production server answers 404
+TOKEN = os.environ.get("METRICS_TOKEN") or None
+
+SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL_PATTERN = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+def parse(text):
+    """Parse exposition text into {(name, ((label, value), ...)): float}"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        pairs = tuple(sorted(
+            (key, raw.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\"))
+            for key, raw in LABEL_PATTERN.findall(labels or "")
+        ))
+        samples[(name, pairs)] = float(value)
+    return samples
+
+def set_token(token):
+    """Token presented to /api/metrics from now on (e.g. the one given to a spawned server)"""
+    global TOKEN
+    TOKEN = token or None
+
+def auth_headers():
+    """Authorization header for /api/metrics, empty when no token is configured"""
+    return {"Authorization": f"Bearer {TOKEN}"} if TOKEN else {}
+
+def scrape(timeout=5):
+    """Current metrics of the server under test, or None if it does not expose them"""
+    try:
+        response = http_client.get(http_client.api_url("metrics"), timeout=timeout, headers=auth_headers())
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != 200 or not response.headers.get("Content-Type", "").startswith("text/plain"):
+        return None
+    return parse(response.text)
+
+def diff(before, after):
+    """Counter and histogram growth between two scrapes (gauges keep their last value)"""
+    delta = {}
+    for key, value in after.items():
+        name = key[0]
+        if name.endswith(("_total", "_bucket", "_sum", "_count")):
+            delta[key] = value - before.get(key, 0.0)
+        else:
+            delta[key] = value
+    return delta
+
+def histogram_quantile(quantile, buckets):
+    """Estimate a quantile from cumulative (upper bound, count) pairs, like PromQL does"""
+    buckets = sorted(buckets)
+    total = buckets[-1][1] if buckets else 0
+    if total <= 0:
+        return None
+    rank = quantile * total
+    lower_bound, lower_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if bound == float("inf"):
+                return lower_bound
+            if count == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+def _labels(pairs, drop=()):
+    return {key: value for key, value in pairs if key not in drop}
+
+def histogram(delta, name, **match):
+    """Summary of one histogram series: count, mean and estimated p50/p95 in ms"""
+    buckets = []
+    total = total_sum = 0.0
+    for (sample, pairs), value in delta.items():
+        labels = _labels(pairs)
+        if any(labels.get(key) != expected for key, expected in match.items()):
+            continue
+        if sample == f"{name}_bucket":
+            buckets.append((float(labels["le"]), value))
+        elif sample == f"{name}_count":
+            total = value
+        elif sample == f"{name}_sum":
+            total_sum = value
+    if not total:
+        return None
+    p50, p95 = histogram_quantile(0.5, buckets), histogram_quantile(0.95, buckets)
+    return {
+        "count": int(total),
+        "mean_ms": total_sum / total * 1000,
+        "p50_ms": p50 * 1000 if p50 is not None else None,
+        "p95_ms": p95 * 1000 if p95 is not None else None,
+    }
+
+def summarize(delta):
+    """Per-route requests, errors, bytes, cache results and latency seen by the server"""
+    routes = {}
+
+    def route(name):
+        return routes.setdefault(name, {
+            "requests": 0, "not_found": 0, "server_errors": 0, "bytes_out": 0, "cache": {}, "in_flight": 0,
+        })
+
+    for (name, pairs), value in delta.items():
+        labels = _labels(pairs)
+        if "route" not in labels:
+            continue
+        entry = route(labels["route"])
+        if name == "portfolio_http_requests_total":
+            entry["requests"] += int(value)
+            status = labels.get("status", "")
+            if status == "404":
+                entry["not_found"] += int(value)
+            elif status.startswith("5"):
+                entry["server_errors"] += int(value)
+        elif name == "portfolio_http_response_bytes_total":
+            entry["bytes_out"] += int(value)
+        elif name == "portfolio_http_cache_results_total":
+            entry["cache"][labels["result"]] = entry["cache"].get(labels["result"], 0) + int(value)
+        elif name == "portfolio_http_requests_in_flight":
+            entry["in_flight"] = int(value)
+
+    for name, entry in routes.items():
+        entry["latency"] = histogram(delta, "portfolio_http_request_duration_seconds", route=name)
+
+    return {
+        "routes": routes,
+        "file_read": histogram(delta, "portfolio_pdf_file_read_duration_seconds"),
+    }
+
+class MetricsRegistry:
+    """
+    The subset of src/lib/metrics.js the stand-in server needs, so the
+    suites get the same /api/metrics output from both targets
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, method, status, length, seconds):
+        with self._lock:
+            for key, amount in (
+                (("portfolio_http_requests_total", (("method", method), ("route", route), ("status", str(status)))), 1),
+                (("portfolio_http_response_bytes_total", (("route", route),)), length),
+            ):
+                self._counters[key] = self._counters.get(key, 0) + amount
+            counts, total = self._histograms.get(route, ([0] * len(DURATION_BUCKETS), [0, 0.0]))
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    counts[index] += 1
+                    break
+            total[0] += 1
+            total[1] += seconds
+            self._histograms[route] = (counts, total)
+
+    def render(self):
+        def labels(pairs):
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}" if pairs else ""
+
+        lines = []
+        with self._lock:
+            for (name, pairs), value in sorted(self._counters.items()):
+                lines.append(f"{name}{labels(pairs)} {value}")
+            name = "portfolio_http_request_duration_seconds"
+            for route, (counts, (count, total)) in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, bucket in zip(DURATION_BUCKETS, counts):
+                    cumulative += bucket
+                    lines.append(f'{name}_bucket{{le="{bound}",route="{route}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{le="+Inf",route="{route}"}} {count}')
+                lines.append(f'{name}_sum{{route="{route}"}} {total}')
+                lines.append(f'{name}_count{{route="{route}"}} {count}')
+        lines.append(f"portfolio_process_uptime_seconds {time.time() - self.started}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Server-Timing and X-Request-Id for the test scripts
+Parses the phases the routes report (lookup, read, stream, total) and splits
+each request's client-side time into server time, time outside the handler
+(network, framework routing) and body transfer
+"""
+
+import os
+
+from perf_stats import summarize
+
+# Same switch as SERVER_TIMING_ENABLED in src/lib/serverTiming.js
+ENABLED = os.environ.get("SERVER_TIMING", "").lower() not in ("0", "false", "off")
+
+def parse(header):
+    """'lookup;dur=0.1, read;dur=2;desc="miss", total;dur=2.3' → {name: {"dur": ms, "desc": str or None}}"""
+    timings = {}
+    for entry in (header or "").split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        if not name:
+            continue
+        values = {"dur": None, "desc": None}
+        for param in params:
+            key, _, value = param.partition("=")
+            key, value = key.strip().lower(), value.strip().strip('"')
+            if key == "dur":
+                try:
+                    values["dur"] = float(value)
+                except ValueError:
+                    pass
+            elif key == "desc":
+                values["desc"] = value
+        timings[name] = values
+    return timings
+
+def format_header(entries):
+    """[(name, ms, desc or None)] → Server-Timing header value, as ServerTiming.header() writes it"""
+    return ", ".join(
+        f"{name};dur={duration:.3f}" + (f';desc="{description}"' if description else "")
+        for name, duration, description in entries
+    )
+
+def breakdown(record):
+    """
+    Split one http_client timing record into milliseconds of server time
+    (Server-Timing total), outside (TTFB minus server time: network, framework
+    routing, queueing) and transfer (body after the first byte). None when the
+    response carried no Server-Timing total.
+    """
+    total = (record.get("server_timing") or {}).get("total", {}).get("dur")
+    if total is None:
+        return None
+    # fetch_timed() results call the full time "total", timing records "elapsed"
+    ttfb, elapsed = record["ttfb"] * 1000, record.get("elapsed", record.get("total")) * 1000
+    return {
+        "server_ms": total,
+        "phases_ms": {name: value["dur"] for name, value in record["server_timing"].items()
+                      if name != "total" and value["dur"] is not None},
+        "outside_ms": max(ttfb - total, 0.0),
+        "transfer_ms": max(elapsed - ttfb, 0.0),
+        "request_id": record.get("request_id"),
+    }
+
+def hops_breakdown(hops):
+    """
+    (server, outside) seconds over the hops of a perf_stats.measure_phases()
+    sample that carried a Server-Timing total, or None if none did
+    """
+    server = outside = 0.0
+    found = False
+    for hop in hops:
+        total = parse(hop["server_timing"]).get("total", {}).get("dur")
+        if total is None:
+            continue
+        found = True
+        server += total / 1000
+        outside += max(hop["ttfb"] - total / 1000, 0.0)
+    return (server, outside) if found else None
+
+def summarize_breakdowns(records, key):
+    """{key(record): p50 of server, each phase, outside and transfer} over the records with Server-Timing"""
+    grouped = {}
+    for record in records:
+        split = breakdown(record)
+        if split is not None:
+            grouped.setdefault(key(record), []).append(split)
+
+    summary = {}
+    for group, splits in sorted(grouped.items()):
+        phases = sorted({name for split in splits for name in split["phases_ms"]})
+        summary[group] = {
+            "count": len(splits),
+            "server_p50_ms": summarize([split["server_ms"] for split in splits])["p50"],
+            "phases_p50_ms": {
+                name: summarize([split["phases_ms"].get(name, 0.0) for split in splits])["p50"] for name in phases
+            },
+            "outside_p50_ms": summarize([split["outside_ms"] for split in splits])["p50"],
+            "transfer_p50_ms": summarize([split["transfer_ms"] for split in splits])["p50"],
+        }
+    return summary
+
+def describe(split):
+    """One-line breakdown of a request, e.g. 'server 0.4ms (lookup 0.1, read 0.3) + outside 1.1ms + transfer 5.2ms'"""
+    phases = ", ".join(f"{name} {value:.2f}" for name, value in split["phases_ms"].items())
+    text = f"server {split['server_ms']:.2f}ms{f' ({phases})' if phases else ''}"
+    if "outside_ms" in split:
+        text += f" + outside {split['outside_ms']:.2f}ms + transfer {split['transfer_ms']:.2f}ms"
+    if split.get("request_id"):
+        text += f" [{split['request_id'][:8]}]"
+    return text
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Soak Test for the Next.js Portfolio
+Cycles through every route (pages, /api/pdf/*, /procedures/*) for a long
+period, samples the server's RSS, heap, open file descriptors and latency at a
+fixed interval, and fails if any of them keeps growing. The existing checks
+run before and after the soak so a server that degrades is also caught
+functionally
+"""
+
+import argparse
+import csv
+import random
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+import backend_test
+import http_client
+import proc_stats
+import run_all_tests
+import server_metrics
+from perf_stats import summarize
+from server_fixture import add_server_arguments, serve
+from suite_report import SuiteReport, add_report_arguments, finish_report, positive_float, positive_int
+
+# Samples taken before this share of the run are warm-up (JIT, caches filling) and not judged
+WARMUP_FRACTION = 0.2
+
+# Growth allowed between the first and last third of the steady-state samples
+DEFAULT_LIMITS = {
+    "rss_mb": 50.0,
+    "heap_mb": 25.0,
+    "fds": 20,
+    "p95_ratio": 1.5,
+}
+
+class TrafficStats:
+    """Latencies and errors since the last sample, shared by the traffic workers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._errors = 0
+        self.requests = 0
+
+    def add(self, latency=None):
+        with self._lock:
+            self.requests += 1
+            if latency is None:
+                self._errors += 1
+            else:
+                self._latencies.append(latency)
+
+    def take(self):
+        """Return and reset (latencies, errors) for the interval that just ended"""
+        with self._lock:
+            latencies, errors = self._latencies, self._errors
+            self._latencies, self._errors = [], 0
+        return latencies, errors
+
+def traffic_worker(routes, stop, stats, seed):
+    """Request every route in a shuffled order, over and over, until stop is set"""
+    rng = random.Random(seed)
+    while not stop.is_set():
+        order = list(routes)
+        rng.shuffle(order)
+        for path in order:
+            if stop.is_set():
+                return
+            try:
+                fetched = http_client.fetch_timed(path)
+                ok = fetched["response"].status_code < 400
+                stats.add(fetched["total"] if ok else None)
+            except requests.exceptions.RequestException:
+                stats.add(None)
+
+def take_sample(pid, stats, started):
+    """One point of the time series: process counters from /proc and /api/metrics, interval latency"""
+    latencies, errors = stats.take()
+    latency = summarize(latencies)
+    metrics = server_metrics.scrape() or {}
+    heap = metrics.get(("portfolio_process_heap_used_bytes", ()))
+    rss = proc_stats.read_rss_bytes(pid) if pid else None
+    if rss is None:
+        rss = metrics.get(("portfolio_process_resident_memory_bytes", ()))
+    return {
+        "elapsed_s": round(time.monotonic() - started, 1),
+        "rss_mb": rss / 1024 / 1024 if rss is not None else None,
+        "heap_mb": heap / 1024 / 1024 if heap is not None else None,
+        "fds": proc_stats.read_fd_count(pid) if pid else None,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_ms": latency["p50"] * 1000 if latencies else None,
+        "p95_ms": latency["p95"] * 1000 if latencies else None,
+    }
+
+def detect_growth(samples, key, limit, ratio=False):
+    """
+    Flag a series that keeps growing over the steady-state window.
+
+    The window is split in thirds: growth means each third's median is above
+    the previous one and the last third exceeds the first by more than limit
+    (an absolute amount, or a ratio when ratio=True). A plateau after warm-up,
+    or a spike that comes back down, passes.
+    """
+    steady = samples[int(len(samples) * WARMUP_FRACTION):]
+    values = [sample[key] for sample in steady if sample[key] is not None]
+    if len(values) < 6:
+        return {"judged": False, "growing": False}
+
+    third = len(values) // 3
+    first, middle, last = (statistics.median(part) for part in (values[:third], values[third:-third], values[-third:]))
+    monotonic = first < middle < last
+    exceeded = last > first * limit if ratio else last - first > limit
+    return {
+        "judged": True,
+        "growing": monotonic and exceeded,
+        "first": first,
+        "last": last,
+        "growth": last / first if ratio and first else last - first,
+    }
+
+def run_soak(duration, interval, concurrency, limits):
+    """Drive traffic for duration seconds and return the time series and verdicts"""
+    routes = run_all_tests.discover_routes()
+    port = urlparse(http_client.BASE_URL).port or 80
+    pid = proc_stats.find_server_pid(port)
+    if pid is None:
+        print(f"  ⚠️  Server process on port {port} not found, RSS/FDs come from /api/metrics only (set SERVER_PID)")
+    print(f"🌊 Soaking {len(routes)} routes with {concurrency} workers for {duration:.0f}s, sampling every {interval:.0f}s...")
+
+    stats = TrafficStats()
+    stop = threading.Event()
+    workers = [
+        threading.Thread(target=traffic_worker, args=(routes, stop, stats, seed), daemon=True)
+        for seed in range(concurrency)
+    ]
+    started = time.monotonic()
+    for worker in workers:
+        worker.start()
+
+    samples = []
+    try:
+        while time.monotonic() - started < duration:
+            time.sleep(min(interval, max(0.0, duration - (time.monotonic() - started))))
+            sample = take_sample(pid, stats, started)
+            samples.append(sample)
+            print(f"  {sample['elapsed_s']:>7.0f}s  "
+                  f"RSS {sample['rss_mb'] or 0:>7.1f}MB  heap {sample['heap_mb'] or 0:>6.1f}MB  "
+                  f"FDs {sample['fds'] if sample['fds'] is not None else '-':>4}  "
+                  f"{sample['requests']:>5} req  {sample['errors']:>3} err  "
+                  f"p95 {sample['p95_ms'] or 0:>7.1f}ms")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=30)
+
+    verdicts = {
+        "rss_mb": detect_growth(samples, "rss_mb", limits["rss_mb"]),
+        "heap_mb": detect_growth(samples, "heap_mb", limits["heap_mb"]),
+        "fds": detect_growth(samples, "fds", limits["fds"]),
+        "p95_ms": detect_growth(samples, "p95_ms", limits["p95_ratio"], ratio=True),
+    }
+    errors = sum(sample["errors"] for sample in samples)
+    return {
+        "success": errors == 0 and not any(verdict["growing"] for verdict in verdicts.values()),
+        "duration_s": duration,
+        "requests": stats.requests,
+        "errors": errors,
+        "verdicts": verdicts,
+        "samples": samples,
+    }
+
+def write_csv(path, samples):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(samples[0]) if samples else ["elapsed_s"])
+        writer.writeheader()
+        writer.writerows(samples)
+
+def run_checks(report, checks, label):
+    """Run the discovered checks serially, returning the names of those that failed"""
+    print(f"\n🧪 Running {len(checks)} checks {label} the soak...")
+    failed = []
+    for suite, name, func in checks:
+        report.run(f"{label}.{suite}.{name}", func)
+        if not report.checks[-1]["passed"]:
+            failed.append(f"{suite}.{name}")
+    return failed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Long-running soak test with leak detection")
+    parser.add_argument("--duration", type=positive_float, default=600.0, help="soak duration in seconds (default: 600)")
+    parser.add_argument("--interval", type=positive_float, default=5.0, help="seconds between samples (default: 5)")
+    parser.add_argument("--concurrency", type=positive_int, default=4, help="traffic workers (default: 4)")
+    parser.add_argument("--csv", metavar="PATH", help="write the time series as CSV")
+    parser.add_argument("--skip-checks", action="store_true", help="do not run the checks before and after")
+    parser.add_argument("--rss-growth", type=float, default=DEFAULT_LIMITS["rss_mb"],
+                        help=f"allowed RSS growth in MB (default: {DEFAULT_LIMITS['rss_mb']:g})")
+    parser.add_argument("--heap-growth", type=float, default=DEFAULT_LIMITS["heap_mb"],
+                        help=f"allowed heap growth in MB (default: {DEFAULT_LIMITS['heap_mb']:g})")
+    parser.add_argument("--fd-growth", type=int, default=DEFAULT_LIMITS["fds"],
+                        help=f"allowed growth in open file descriptors (default: {DEFAULT_LIMITS['fds']})")
+    parser.add_argument("--p95-growth", type=float, default=DEFAULT_LIMITS["p95_ratio"],
+                        help=f"allowed p95 latency ratio (default: {DEFAULT_LIMITS['p95_ratio']:g})")
+    add_server_arguments(parser)
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def print_verdicts(results):
+    print("\n" + "=" * 60)
+    print("📊 SOAK TEST SUMMARY")
+    print("=" * 60)
+    print(f"Requests: {results['requests']} ({results['errors']} errors) in {results['duration_s']:.0f}s")
+    for key, verdict in results["verdicts"].items():
+        if not verdict["judged"]:
+            print(f"{key:<8} ⚠️  not enough samples")
+            continue
+        growth = f"x{verdict['growth']:.2f}" if key == "p95_ms" else f"{verdict['growth']:+.1f}"
+        print(f"{key:<8} {'❌ GROWING' if verdict['growing'] else '✅ STABLE'}  "
+              f"{verdict['first']:.1f} → {verdict['last']:.1f} ({growth})")
+
+def soak(args):
+    report = SuiteReport("soak")
+    report.start_server_metrics()
+    health = report.run("test_application_health", backend_test.test_application_health)
+    if not health:
+        print("\n❌ Application is not running. Cannot proceed with the soak test.")
+        return report, False
+
+    checks = [check for check in run_all_tests.discover_checks() if check[1] != "test_application_health"]
+    failed = [] if args.skip_checks else run_checks(report, checks, "before")
+
+    limits = {"rss_mb": args.rss_growth, "heap_mb": args.heap_growth, "fds": args.fd_growth, "p95_ratio": args.p95_growth}
+    results = report.run("soak", run_soak, args.duration, args.interval, args.concurrency, limits)
+    if "verdicts" not in results:
+        print(f"\n❌ Soak aborted: {results.get('error')}")
+        report.collect_server_metrics()
+        return report, False
+    print_verdicts(results)
+    # Steady-state level at the end of the soak, so baselines catch a slow creep across releases
+    units = {"rss_mb": "MB", "heap_mb": "MB", "fds": "fds", "p95_ms": "ms"}
+    for key, verdict in results["verdicts"].items():
+        if verdict["judged"]:
+            report.add_metric(f"soak.{key}", verdict["last"], unit=units[key])
+    if args.csv:
+        write_csv(args.csv, results["samples"])
+        print(f"💾 Time series written to {args.csv}")
+
+    if not args.skip_checks:
+        failed += run_checks(report, checks, "after")
+    if failed:
+        print(f"❌ Checks failing: {', '.join(failed)}")
+
+    report.collect_server_metrics()
+    return report, results["success"] and not failed
+
+def main(args=None):
+    """Main soak function"""
+    args = args or parse_args([])
+    print("🚀 Starting Soak Test for Next.js Portfolio")
+    print("=" * 60)
+
+    try:
+        with serve(args.server, args.next_mode):
+            report, success = soak(args)
+    except RuntimeError as e:
+        print(f"  ❌ Could not start the {args.server} server: {e}")
+        return False
+
+    print(f"\n🎯 SOAK STATUS: {'✅ STABLE' if success else '❌ UNSTABLE'}")
+    return finish_report(report, args, success)
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
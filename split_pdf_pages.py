@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+PDF Page Splitter for public/procedures
+Writes every page of every procedure PDF as a standalone PDF
+(GLPI.pdf → pages/GLPI-1.pdf, GLPI-2.pdf...), served by
+/api/pdf/[filename]/pages/[page] so the modal can open one step without
+downloading the whole document. One process per file, and only the PDFs whose
+content changed since the last run are split again
+
+Requires PyMuPDF (pip install pymupdf)
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+from procedures import PAGES_DIR, generate_outputs, procedure_path
+
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+# garbage=4 drops the objects (fonts, images) only used by the other pages
+SAVE_OPTIONS = {"garbage": 4, "deflate": True}
+
+def page_name(filename, page):
+    """GLPI.pdf, 3 → GLPI-3.pdf (the same scheme as src/lib/pdfPages.js)"""
+    return f"{os.path.splitext(filename)[0]}-{page}.pdf"
+
+def split_pages(filename):
+    """
+    Write each page of one PDF as its own document.
+    Runs in a worker process; returns the index entry for the file.
+    """
+    start = time.perf_counter()
+    outputs = {}
+    with pymupdf.open(procedure_path(filename)) as document:
+        for number in range(document.page_count):
+            with pymupdf.open() as single:
+                single.insert_pdf(document, from_page=number, to_page=number)
+                data = single.tobytes(**SAVE_OPTIONS)
+            name = page_name(filename, number + 1)
+            path = os.path.join(PAGES_DIR, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            stats = os.stat(path)
+            outputs[name] = {
+                "page": number + 1,
+                "size": stats.st_size,
+                # Same mtime as fs.Stats.mtimeMs, so the route reuses the sha256 as ETag
+                "mtimeMs": stats.st_mtime_ns / 1e6,
+                "sha256": hashlib.sha256(data).hexdigest(),
+            }
+        pages = document.page_count
+    return {"pages": pages, "outputs": outputs, "split_ms": (time.perf_counter() - start) * 1000}
+
+def describe(filename, entry):
+    """Line printed once a PDF is split"""
+    sizes = [output["size"] for output in entry["outputs"].values()]
+    return (f"{entry['pages']} pages, {min(sizes) / 1024:.1f}-{max(sizes) / 1024:.1f}KB each instead of "
+            f"{os.path.getsize(procedure_path(filename)) / 1024:.1f}KB, {entry['split_ms']:.0f}ms")
+
+def main():
+    """Main splitter function"""
+    parser = argparse.ArgumentParser(description="Split the procedure PDFs into single-page PDFs")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="split every PDF again, even unchanged ones")
+    args = parser.parse_args()
+
+    print("🚀 PDF Page Splitter")
+    print("=" * 60)
+
+    if pymupdf is None:
+        print("❌ PyMuPDF is required: pip install pymupdf")
+        return False
+
+    start = time.perf_counter()
+    split_count, errors = generate_outputs(PAGES_DIR, split_pages, jobs=args.jobs, force=args.force,
+                                           kind="pages", describe=describe)
+    print(f"\n🎯 PAGES: {split_count} PDFs split in {time.perf_counter() - start:.1f}s"
+          f"{', ' + str(len(errors)) + ' failed' if errors else ''}")
+    return not errors
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -5,7 +5,7 @@ import { ArrowRight, Github, Linkedin, Mail, MapPin, Phone, GraduationCap, User,
 import { Button } from '../../components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '../../components/ui/card'
 import { useRouter } from 'next/navigation'
-import Image from 'next/image'
+import OptimizedImage from '../../components/OptimizedImage'
 
 // Données statiques modernes pour un design technologique unifié
 const StaticData = {
@@ -288,11 +288,10 @@ export default function AccueilPage() {
             <div className="relative">
               <div className="relative rounded-2xl overflow-hidden shadow-2xl">
                 <div className="aspect-[4/3] relative">
-                  <Image 
+                  <OptimizedImage 
                     src="/images/procedures/optimized_hero_image_new.webp" 
                     alt="Infrastructure réseau moderne" 
-                    fill
-                    className="object-cover"
+                    className="w-full h-full"
                     priority
                     quality={85}
                     sizes="(max-width: 768px) 100vw, 50vw"
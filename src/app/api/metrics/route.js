@@ -0,0 +1,40 @@
+import { NextResponse } from 'next/server'
+import { getPdfCacheStats } from '../../../lib/pdfCache'
+import { internalAccess, processUptimeSeconds, renderMetrics } from '../../../lib/metrics'
+
+// Toujours calculé à la demande, jamais mis en cache
+export const dynamic = 'force-dynamic'
+
+// Endpoint interne (mémoire du processus, trafic par route) : 404 en production sans
+// METRICS_TOKEN, 401 sans le bon jeton
+export async function GET(request) {
+  const allowed = internalAccess(request)
+  if (allowed === 'hidden') {
+    return NextResponse.json({ error: 'Not found' }, { status: 404 })
+  }
+  if (allowed === 'unauthorized') {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  const cache = getPdfCacheStats()
+  const memory = process.memoryUsage()
+  const body = renderMetrics([
+    { name: 'portfolio_pdf_cache_bytes', labels: {}, value: cache.bytes },
+    { name: 'portfolio_pdf_cache_entries', labels: {}, value: cache.entries },
+    { name: 'portfolio_pdf_cache_evictions_total', labels: {}, value: cache.evictions },
+    { name: 'portfolio_pdf_cache_not_found_hits_total', labels: {}, value: cache.notFoundHits },
+    { name: 'portfolio_pdf_cache_manifest_misses_total', labels: {}, value: cache.manifestMisses },
+    { name: 'portfolio_process_uptime_seconds', labels: {}, value: processUptimeSeconds() },
+    { name: 'portfolio_process_resident_memory_bytes', labels: {}, value: memory.rss },
+    { name: 'portfolio_process_heap_used_bytes', labels: {}, value: memory.heapUsed },
+    { name: 'portfolio_process_external_bytes', labels: {}, value: memory.external }
+  ])
+
+  return new NextResponse(body, {
+    status: 200,
+    headers: {
+      'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+      'Cache-Control': 'no-store'
+    }
+  })
+}
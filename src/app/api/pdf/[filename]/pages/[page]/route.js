@@ -0,0 +1,37 @@
+import { NextResponse } from 'next/server'
+import path from 'path'
+import { loadPdfPage } from '../../../../../../lib/pdfCache'
+import { pageFilename } from '../../../../../../lib/pdfPages'
+import { pdfResponse } from '../../../../../../lib/pdfResponse'
+import { instrumentRoute } from '../../../../../../lib/metrics'
+
+// Une seule page d'un PDF, en document autonome : la modale n'a pas à télécharger
+// tout le fichier pour afficher une étape (découpage fait au build par split_pdf_pages.py)
+async function getPdfPage(request, { params }, timing) {
+  try {
+    const { filename, page } = await params
+
+    if (path.basename(filename) !== filename || !filename.toLowerCase().endsWith('.pdf')) {
+      return NextResponse.json({ error: 'PDF not found' }, { status: 404 })
+    }
+    // Numéro de page décimal sans zéro initial : une seule URL par page (cache HTTP)
+    if (!/^[1-9]\d{0,4}$/.test(page)) {
+      return NextResponse.json({ error: 'Invalid page number' }, { status: 400 })
+    }
+
+    const lookupStart = performance.now()
+    const file = await loadPdfPage(filename, Number(page))
+    timing.lookup(lookupStart, [file])
+    if (!file) {
+      return NextResponse.json({ error: 'Page not found' }, { status: 404 })
+    }
+
+    // Pas de variante précompressée : une page isolée est surtout faite d'images déjà compressées
+    return await pdfResponse(request, { file, variant: null, filename: pageFilename(filename, page), timing })
+  } catch (error) {
+    console.error('Error serving PDF page:', error)
+    return NextResponse.json({ error: 'Internal server error' }, { status: 500 })
+  }
+}
+
+export const GET = instrumentRoute('/api/pdf/[filename]/pages/[page]', getPdfPage)
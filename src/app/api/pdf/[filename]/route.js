@@ -1,37 +1,55 @@
 import { NextResponse } from 'next/server'
-import fs from 'fs'
 import path from 'path'
+import { acceptedEncodings } from '../../../../lib/contentEncoding'
+import { loadPdf, loadPdfVariant } from '../../../../lib/pdfCache'
+import { pdfResponse } from '../../../../lib/pdfResponse'
+import { instrumentRoute, internalAccess } from '../../../../lib/metrics'
 
-export async function GET(request, { params }) {
+// Choisit la variante précompressée préférée du client (jamais pour une requête Range,
+// les plages portent sur le PDF original)
+async function selectVariant(request, file, filename, options) {
+  if (request.headers.get('range')) return null
+
+  for (const { encoding, extension } of acceptedEncodings(request.headers.get('accept-encoding'))) {
+    const variant = await loadPdfVariant(file, filename, extension, options)
+    if (variant) return { ...variant, encoding }
+  }
+  return null
+}
+
+async function getPdf(request, { params }, timing) {
   try {
-    const filename = params.filename
-    const filePath = path.join(process.cwd(), 'public', 'procedures', filename)
-    
-    // Vérifier si le fichier existe
-    if (!fs.existsSync(filePath)) {
+    const { filename } = await params
+
+    // Refuser tout ce qui n'est pas un simple nom de fichier PDF (../, sous-dossiers, .br/.gz)
+    if (path.basename(filename) !== filename || !filename.toLowerCase().endsWith('.pdf')) {
+      return NextResponse.json({ error: 'PDF not found' }, { status: 404 })
+    }
+
+    // Cache mémoire (invalidé par mtime/taille), les 404 sont aussi mémorisés.
+    // X-Cache-Bypass force une relecture du disque, réservé aux accès internes (benchmarks)
+    const options = {
+      refresh: request.headers.has('x-cache-bypass') && internalAccess(request) === 'open'
+    }
+    const lookupStart = performance.now()
+    const file = await loadPdf(filename, options)
+    if (!file) {
+      timing.lookup(lookupStart, [])
       return NextResponse.json({ error: 'PDF not found' }, { status: 404 })
     }
-    
-    // Lire le fichier PDF
-    const fileBuffer = fs.readFileSync(filePath)
-    
-    // Créer une réponse avec les bons en-têtes
-    const response = new NextResponse(fileBuffer, {
-      status: 200,
-      headers: {
-        'Content-Type': 'application/pdf',
-        'Content-Disposition': `inline; filename="${filename}"`,
-        'Cache-Control': 'public, max-age=3600'
-      }
-    })
-    
-    return response
+
+    // Représentation servie : variante .br/.gz si le client l'accepte, sinon le PDF brut
+    const variant = await selectVariant(request, file, filename, options)
+    timing.lookup(lookupStart, [file, variant])
+    return await pdfResponse(request, { file, variant, filename, timing })
   } catch (error) {
     console.error('Error serving PDF:', error)
     return NextResponse.json({ error: 'Internal server error' }, { status: 500 })
   }
 }
 
+export const GET = instrumentRoute('/api/pdf/[filename]', getPdf)
+
 export async function OPTIONS() {
   return new NextResponse(null, {
     status: 200,
@@ -39,4 +57,4 @@ export async function OPTIONS() {
       'Cache-Control': 'public, max-age=3600'
     }
   })
-}
\ No newline at end of file
+}
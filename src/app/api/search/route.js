@@ -0,0 +1,48 @@
+import { NextResponse } from 'next/server'
+import { getSearchIndex, search } from '../../../lib/searchIndex'
+import { instrumentRoute } from '../../../lib/metrics'
+
+// Dépend de la requête (?q=), jamais pré-rendu
+export const dynamic = 'force-dynamic'
+
+const MAX_QUERY_LENGTH = 200
+const DEFAULT_LIMIT = 10
+const MAX_LIMIT = 50
+
+// GET /api/search?q=vlan&limit=10 → pages classées avec numéro de page et extrait
+async function getSearch(request, context, timing) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const query = (searchParams.get('q') || '').trim()
+    if (!query) {
+      return NextResponse.json({ error: 'Missing query' }, { status: 400 })
+    }
+    if (query.length > MAX_QUERY_LENGTH) {
+      return NextResponse.json({ error: 'Query too long' }, { status: 400 })
+    }
+    const limit = Math.min(Math.max(Number.parseInt(searchParams.get('limit'), 10) || DEFAULT_LIMIT, 1), MAX_LIMIT)
+
+    // Index chargé au premier appel puis gardé en mémoire
+    const index = getSearchIndex()
+    if (!index) {
+      return NextResponse.json({ error: 'Search index not built' }, { status: 503 })
+    }
+
+    const start = process.hrtime.bigint()
+    const { total, results } = search(index, query, limit)
+    const tookMs = Number(process.hrtime.bigint() - start) / 1e6
+    timing.add('search', tookMs)
+
+    return NextResponse.json({ query, total, results, tookMs }, {
+      headers: {
+        // L'index ne change qu'au déploiement
+        'Cache-Control': 'public, max-age=300'
+      }
+    })
+  } catch (error) {
+    console.error('Error searching procedures:', error)
+    return NextResponse.json({ error: 'Internal server error' }, { status: 500 })
+  }
+}
+
+export const GET = instrumentRoute('/api/search', getSearch)
@@ -2,6 +2,7 @@
 
 import Image from 'next/image'
 import { useState } from 'react'
+import { optimizedImageSources } from '../lib/optimizedImages'
 
 const OptimizedImage = ({ 
   src, 
@@ -31,22 +32,34 @@ const OptimizedImage = ({
   }
 
   const optimizedSrc = getOptimizedSrc(src)
+  // Variantes AVIF/WebP pré-générées : servies telles quelles par le navigateur
+  const sources = optimizedImageSources(src)
+
+  const image = (
+    <Image
+      src={optimizedSrc}
+      alt={alt}
+      fill
+      className={`object-cover transition-opacity duration-300 ${
+        isLoading ? 'opacity-0' : 'opacity-100'
+      }`}
+      priority={priority}
+      quality={quality}
+      sizes={sizes}
+      onLoad={() => setIsLoading(false)}
+      {...props}
+    />
+  )
 
   return (
     <div className={`relative overflow-hidden ${className}`}>
-      <Image
-        src={optimizedSrc}
-        alt={alt}
-        fill
-        className={`object-cover transition-opacity duration-300 ${
-          isLoading ? 'opacity-0' : 'opacity-100'
-        }`}
-        priority={priority}
-        quality={quality}
-        sizes={sizes}
-        onLoad={() => setIsLoading(false)}
-        {...props}
-      />
+      {sources ? (
+        <picture>
+          <source type="image/avif" srcSet={sources.avif} sizes={sizes} />
+          <source type="image/webp" srcSet={sources.webp} sizes={sizes} />
+          {image}
+        </picture>
+      ) : image}
       
       {/* Loading skeleton */}
       {isLoading && (
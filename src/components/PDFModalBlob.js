@@ -3,6 +3,7 @@
 import { useState, useEffect, useRef } from 'react'
 import { X, Download, ExternalLink, Maximize2, AlertCircle, RefreshCw, CheckCircle } from 'lucide-react'
 import { Button } from './ui/button'
+import { pdfThumbnailSources } from '../lib/pdfThumbnails'
 
 export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
   const [isLoading, setIsLoading] = useState(true)
@@ -10,14 +11,21 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
   const [error, setError] = useState(false)
   const [blobUrl, setBlobUrl] = useState(null)
   const [loadTimeout, setLoadTimeout] = useState(null)
+  const [previewAvailable, setPreviewAvailable] = useState(true)
+  const [blobPage, setBlobPage] = useState(null)
   const iframeRef = useRef(null)
 
+  // /api/pdf/GLPI.pdf#page=3 (résultat de recherche) : seule cette page est téléchargée
+  const [documentUrl, fragment = ''] = (pdfUrl || '').split('#')
+  const page = Number(new URLSearchParams(fragment).get('page')) || null
+
   useEffect(() => {
     if (isOpen) {
       document.body.style.overflow = 'hidden'
       setIsLoading(true)
       setError(false)
       setBlobUrl(null)
+      setPreviewAvailable(true)
       
       // Fetch PDF et créer blob URL
       fetchPDFAsBlob()
@@ -49,15 +57,18 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
     try {
       console.log('Fetching PDF:', pdfUrl)
       
-      // Essayer d'abord l'API
-      const filename = pdfUrl.split('/').pop()
-      const apiUrl = `/api/pdf/${filename}`
+      // Essayer d'abord l'API (la page seule si une page est demandée)
+      const filename = documentUrl.split('/').pop()
+      const apiUrl = page ? `/api/pdf/${filename}/pages/${page}` : `/api/pdf/${filename}`
       
       let response = await fetch(apiUrl)
+      setBlobPage(null)
       
       if (!response.ok) {
         console.log('API failed, trying direct URL')
-        response = await fetch(pdfUrl)
+        response = await fetch(documentUrl)
+        // Document entier : la visionneuse se positionne sur la page demandée
+        setBlobPage(page)
       }
       
       if (!response.ok) {
@@ -89,10 +100,13 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
 
   const handleDownload = () => {
     const link = document.createElement('a')
-    if (blobUrl) {
+    // Une page seule n'est qu'un extrait : télécharger le document complet
+    if (page) {
+      link.href = documentUrl
+    } else if (blobUrl) {
       link.href = blobUrl
     } else {
-      link.href = pdfUrl
+      link.href = documentUrl
     }
     link.download = title ? `${title.replace(/[^a-z0-9]/gi, '_')}.pdf` : 'procedure.pdf'
     link.click()
@@ -102,7 +116,7 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
     if (blobUrl) {
       window.open(blobUrl, '_blank')
     } else {
-      window.open(pdfUrl, '_blank')
+      window.open(documentUrl, '_blank')
     }
   }
 
@@ -147,6 +161,9 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
 
   if (!isOpen) return null
 
+  // Miniature de la première page, affichée tant que le PDF n'est pas chargé
+  const preview = previewAvailable && pdfUrl ? pdfThumbnailSources(pdfUrl) : null
+
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center">
       {/* Backdrop */}
@@ -289,7 +306,7 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
               
               <iframe
                 ref={iframeRef}
-                src={`${blobUrl}#toolbar=1&navpanes=1&scrollbar=1&zoom=fit`}
+                src={`${blobUrl}#${blobPage ? `page=${blobPage}&` : ''}toolbar=1&navpanes=1&scrollbar=1&zoom=fit`}
                 className="w-full h-full border-0 mt-12"
                 title={title}
                 onLoad={handleIframeLoad}
@@ -297,9 +314,23 @@ export default function PDFModalBlob({ isOpen, onClose, pdfUrl, title }) {
               />
             </div>
           ) : (
-            // Loading state
+            // Loading state : aperçu de la première page pendant le téléchargement du PDF
             <div className="absolute inset-0 bg-white flex items-center justify-center">
-              <div className="text-center">
+              {preview && (
+                <picture className="absolute inset-0 pt-12 sm:pt-16 flex justify-center overflow-hidden opacity-60">
+                  <source type="image/avif" srcSet={preview.avif} sizes="(max-width: 1152px) 100vw, 1152px" />
+                  <source type="image/webp" srcSet={preview.webp} sizes="(max-width: 1152px) 100vw, 1152px" />
+                  <img
+                    src={preview.src}
+                    alt={`Aperçu : ${title}`}
+                    className="h-full w-auto object-contain object-top"
+                    decoding="async"
+                    fetchPriority="high"
+                    onError={() => setPreviewAvailable(false)}
+                  />
+                </picture>
+              )}
+              <div className="relative text-center bg-white/80 rounded-xl px-6 py-4">
                 <div className="w-12 h-12 border-4 border-purple-200 border-t-purple-600 rounded-full animate-spin mb-4" />
                 <p className="text-gray-600">Chargement du PDF...</p>
                 <p className="text-sm text-gray-500 mt-2">
@@ -0,0 +1,32 @@
+// Négociation de Content-Encoding pour les variantes précompressées (.br / .gz)
+
+// Encodages disponibles par ordre de préférence, avec l'extension du fichier précompressé
+export const PRECOMPRESSED_ENCODINGS = [
+  { encoding: 'br', extension: '.br' },
+  { encoding: 'gzip', extension: '.gz' }
+]
+
+// Valeurs q de l'en-tête Accept-Encoding ("br;q=1.0, gzip;q=0.8, *;q=0")
+function parseAcceptEncoding(header) {
+  const weights = new Map()
+  for (const part of header.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';')
+    if (!name) continue
+    const q = params.map(param => param.trim()).find(param => param.startsWith('q='))
+    const weight = q ? Number(q.slice(2)) : 1
+    weights.set(name, Number.isNaN(weight) ? 0 : weight)
+  }
+  return weights
+}
+
+// Liste des variantes acceptées par le client, de la plus à la moins préférée
+export function acceptedEncodings(header) {
+  if (!header) return []
+
+  const weights = parseAcceptEncoding(header)
+  const weightOf = encoding => weights.get(encoding) ?? weights.get('*') ?? 0
+
+  return PRECOMPRESSED_ENCODINGS
+    .filter(({ encoding }) => weightOf(encoding) > 0)
+    .sort((a, b) => weightOf(b.encoding) - weightOf(a.encoding))
+}
@@ -0,0 +1,51 @@
+// Lecture de fichiers en streaming pour les Route Handlers
+// Remplace fs.readFileSync : pas de blocage de l'event loop, mémoire constante
+
+const CHUNK_SIZE = 64 * 1024
+
+// Crée un ReadableStream web qui lit les octets [start, end] d'un fichier déjà ouvert.
+// pull() n'est appelé que lorsque le consommateur réclame des données : un client
+// lent ralentit donc la lecture disque au lieu de remplir la mémoire (contre-pression).
+// Le descripteur est fermé en fin de lecture, en cas d'erreur ou d'abandon du client.
+export function createFileStream(handle, { start = 0, end, chunkSize = CHUNK_SIZE } = {}) {
+  let position = start
+  let closed = false
+
+  const close = async () => {
+    if (closed) return
+    closed = true
+    await handle.close().catch(() => {})
+  }
+
+  return new ReadableStream(
+    {
+      async pull(controller) {
+        const remaining = end - position + 1
+        if (remaining <= 0) {
+          await close()
+          controller.close()
+          return
+        }
+
+        try {
+          const buffer = Buffer.allocUnsafe(Math.min(chunkSize, remaining))
+          const { bytesRead } = await handle.read(buffer, 0, buffer.length, position)
+          if (bytesRead === 0) {
+            await close()
+            controller.close()
+            return
+          }
+          position += bytesRead
+          controller.enqueue(new Uint8Array(buffer.buffer, buffer.byteOffset, bytesRead))
+        } catch (error) {
+          await close()
+          controller.error(error)
+        }
+      },
+      cancel() {
+        return close()
+      }
+    },
+    { highWaterMark: 1 }
+  )
+}
@@ -0,0 +1,24 @@
+// Requêtes conditionnelles (RFC 9110, section 13) : If-None-Match / If-Modified-Since
+
+// Liste d'ETags d'un en-tête If-None-Match, comparaison faible (préfixe W/ ignoré)
+function etagMatches(header, etag) {
+  if (!etag) return false
+  if (header.trim() === '*') return true
+
+  const normalize = value => value.trim().replace(/^W\//, '')
+  const current = normalize(etag)
+  return header.split(',').some(candidate => normalize(candidate) === current)
+}
+
+// Indique si le client possède déjà la version actuelle (réponse 304).
+// If-None-Match est prioritaire : If-Modified-Since n'est évalué qu'en son absence.
+export function isNotModified(headers, { etag, lastModified } = {}) {
+  const ifNoneMatch = headers.get('if-none-match')
+  if (ifNoneMatch) return etagMatches(ifNoneMatch, etag)
+
+  const ifModifiedSince = headers.get('if-modified-since')
+  if (!ifModifiedSince || !lastModified) return false
+
+  const since = Date.parse(ifModifiedSince)
+  return !Number.isNaN(since) && Date.parse(lastModified) <= since
+}
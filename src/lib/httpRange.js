@@ -0,0 +1,50 @@
+// Gestion des requêtes HTTP Range (RFC 9110, section 14) pour les réponses fichiers
+
+// Analyse l'en-tête Range pour une ressource de `size` octets.
+// - null : pas de Range exploitable, on répond 200 avec le fichier complet
+//   (en-tête absent, syntaxe invalide, unité inconnue ou plusieurs plages :
+//   les requêtes multi-plages sont volontairement ignorées, ce que la RFC autorise)
+// - { unsatisfiable: true } : plage hors du fichier, on répond 416
+// - { start, end } : bornes inclusives de la plage à servir en 206
+export function parseRange(header, size) {
+  if (!header) return null
+
+  const match = /^\s*bytes\s*=\s*(.*)$/i.exec(header)
+  if (!match) return null
+
+  const specs = match[1].split(',').map(spec => spec.trim()).filter(Boolean)
+  if (specs.length !== 1) return null
+
+  const bounds = /^(\d*)\s*-\s*(\d*)$/.exec(specs[0])
+  if (!bounds || (bounds[1] === '' && bounds[2] === '')) return null
+
+  // Plage suffixe : "-500" = les 500 derniers octets
+  if (bounds[1] === '') {
+    const suffix = Number(bounds[2])
+    if (suffix === 0 || size === 0) return { unsatisfiable: true }
+    return { start: Math.max(0, size - suffix), end: size - 1 }
+  }
+
+  const start = Number(bounds[1])
+  const end = bounds[2] === '' ? Math.max(start, size - 1) : Number(bounds[2])
+  if (end < start) return null
+  if (start >= size) return { unsatisfiable: true }
+
+  return { start, end: Math.min(end, size - 1) }
+}
+
+// Vérifie la condition If-Range : la plage n'est servie que si le validateur
+// correspond encore à la version actuelle du fichier, sinon on renvoie tout.
+export function isRangeFresh(ifRange, { etag, lastModified } = {}) {
+  if (!ifRange) return true
+
+  const value = ifRange.trim()
+  if (value.startsWith('"') || value.startsWith('W/')) {
+    // Comparaison forte obligatoire : un ETag faible ne valide jamais une plage
+    return Boolean(etag) && !value.startsWith('W/') && value === etag
+  }
+
+  if (!lastModified) return false
+  const since = Date.parse(value)
+  return !Number.isNaN(since) && since === Date.parse(lastModified)
+}
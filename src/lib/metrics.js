@@ -0,0 +1,173 @@
+// Métriques serveur exposées par /api/metrics au format texte Prometheus
+// Compteurs et histogrammes en mémoire : quelques additions par requête, rien sur le disque
+
+import { ServerTiming, applyServerTiming, requestId } from './serverTiming'
+
+// Bornes des histogrammes de latence, en secondes
+export const DURATION_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+
+class Histogram {
+  constructor(buckets) {
+    this.buckets = buckets
+    this.counts = new Array(buckets.length).fill(0)
+    this.sum = 0
+    this.count = 0
+  }
+
+  observe(value) {
+    const index = this.buckets.findIndex(bound => value <= bound)
+    if (index !== -1) this.counts[index]++
+    this.sum += value
+    this.count++
+  }
+}
+
+// État partagé via globalThis : les routes sont des bundles séparés mais
+// doivent alimenter le même registre
+const STATE_KEY = Symbol.for('portfolio.metrics')
+
+function getState() {
+  if (!globalThis[STATE_KEY]) {
+    globalThis[STATE_KEY] = {
+      counters: new Map(),
+      gauges: new Map(),
+      histograms: new Map(),
+      startedAt: Date.now()
+    }
+  }
+  return globalThis[STATE_KEY]
+}
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')
+}
+
+// Étiquettes triées : sert aussi de clé stable à une série
+function formatLabels(labels) {
+  const keys = Object.keys(labels).sort()
+  return keys.length ? `{${keys.map(key => `${key}="${escapeLabel(labels[key])}"`).join(',')}}` : ''
+}
+
+function series(map, name, labels, create) {
+  const key = name + formatLabels(labels)
+  let item = map.get(key)
+  if (!item) {
+    item = { name, labels, value: create() }
+    map.set(key, item)
+  }
+  return item
+}
+
+export function incrementCounter(name, labels = {}, amount = 1) {
+  series(getState().counters, name, labels, () => 0).value += amount
+}
+
+export function adjustGauge(name, labels = {}, amount = 1) {
+  series(getState().gauges, name, labels, () => 0).value += amount
+}
+
+export function observeHistogram(name, labels, seconds, buckets = DURATION_BUCKETS) {
+  series(getState().histograms, name, labels, () => new Histogram(buckets)).value.observe(seconds)
+}
+
+// Instrumente un Route Handler : requêtes par statut, octets envoyés, résultat du
+// cache (X-Cache), requêtes en cours et latence jusqu'à l'envoi des en-têtes.
+// Le corps streamé n'est pas inclus : il dépend du débit du client.
+// Le handler reçoit en troisième argument le ServerTiming de la requête pour y noter ses étapes.
+export function instrumentRoute(route, handler) {
+  return async function instrumented(request, context) {
+    const start = process.hrtime.bigint()
+    const method = request.method
+    const timing = new ServerTiming()
+    adjustGauge('portfolio_http_requests_in_flight', { route }, 1)
+
+    let status = 500
+    try {
+      const response = applyServerTiming(await handler(request, context, timing), timing, requestId(request))
+      status = response.status
+      const length = Number(response.headers.get('content-length'))
+      if (length > 0) incrementCounter('portfolio_http_response_bytes_total', { route }, length)
+      const cache = response.headers.get('x-cache')
+      if (cache) incrementCounter('portfolio_http_cache_results_total', { route, result: cache })
+      return response
+    } finally {
+      const seconds = Number(process.hrtime.bigint() - start) / 1e9
+      adjustGauge('portfolio_http_requests_in_flight', { route }, -1)
+      incrementCounter('portfolio_http_requests_total', { route, method, status })
+      observeHistogram('portfolio_http_request_duration_seconds', { route }, seconds)
+    }
+  }
+}
+
+const HELP = {
+  portfolio_http_requests_total: ['counter', 'Requêtes traitées par route, méthode et statut'],
+  portfolio_http_response_bytes_total: ['counter', 'Octets de corps envoyés (Content-Length)'],
+  portfolio_http_cache_results_total: ['counter', 'Résultat du cache mémoire (X-Cache)'],
+  portfolio_http_requests_in_flight: ['gauge', 'Requêtes en cours de traitement'],
+  portfolio_http_request_duration_seconds: ['histogram', 'Latence jusqu\'à l\'envoi des en-têtes'],
+  portfolio_pdf_file_read_duration_seconds: ['histogram', 'Lecture d\'un PDF sur le disque (cache manquant)'],
+  portfolio_pdf_cache_bytes: ['gauge', 'Octets occupés par le cache des PDF'],
+  portfolio_pdf_cache_entries: ['gauge', 'Entrées du cache des PDF'],
+  portfolio_pdf_cache_evictions_total: ['counter', 'Évictions du cache des PDF'],
+  portfolio_pdf_cache_not_found_hits_total: ['counter', '404 servis par le cache négatif'],
+  portfolio_pdf_cache_manifest_misses_total: ['counter', '404 servis par le manifeste sans accès disque'],
+  portfolio_process_uptime_seconds: ['gauge', 'Durée de vie du processus'],
+  portfolio_process_resident_memory_bytes: ['gauge', 'Mémoire résidente du processus'],
+  portfolio_process_heap_used_bytes: ['gauge', 'Tas V8 utilisé'],
+  portfolio_process_external_bytes: ['gauge', 'Mémoire hors tas (Buffers des PDF en cache)']
+}
+
+function groupByName(items) {
+  const groups = new Map()
+  for (const item of items) {
+    if (!groups.has(item.name)) groups.set(item.name, [])
+    groups.get(item.name).push(item)
+  }
+  return groups
+}
+
+function header(lines, name) {
+  const [type, help] = HELP[name] || ['untyped', name]
+  lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`)
+}
+
+// Accès aux fonctions internes (/api/metrics, X-Cache-Bypass) : si METRICS_TOKEN est défini,
+// il doit être présenté en Bearer ; sans jeton, ouvert en développement seulement
+// ('hidden' en production, comme si l'endpoint n'existait pas)
+export function internalAccess(request) {
+  const token = process.env.METRICS_TOKEN
+  if (!token) return process.env.NODE_ENV === 'production' ? 'hidden' : 'open'
+  return request.headers.get('authorization') === `Bearer ${token}` ? 'open' : 'unauthorized'
+}
+
+export function processUptimeSeconds() {
+  return (Date.now() - getState().startedAt) / 1000
+}
+
+// Texte d'exposition ; gauges : valeurs instantanées lues au moment du scrape ({ name, labels, value })
+export function renderMetrics(gauges = []) {
+  const state = getState()
+  const lines = []
+
+  const scalars = [...state.counters.values(), ...state.gauges.values(), ...gauges]
+  for (const [name, items] of groupByName(scalars)) {
+    header(lines, name)
+    for (const item of items) lines.push(`${name}${formatLabels(item.labels)} ${item.value}`)
+  }
+
+  for (const [name, items] of groupByName(state.histograms.values())) {
+    header(lines, name)
+    for (const { labels, value: histogram } of items) {
+      let cumulative = 0
+      histogram.buckets.forEach((bound, index) => {
+        cumulative += histogram.counts[index]
+        lines.push(`${name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`)
+      })
+      lines.push(`${name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${histogram.count}`)
+      lines.push(`${name}_sum${formatLabels(labels)} ${histogram.sum}`)
+      lines.push(`${name}_count${formatLabels(labels)} ${histogram.count}`)
+    }
+  }
+
+  return lines.join('\n') + '\n'
+}
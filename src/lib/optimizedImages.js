@@ -0,0 +1,26 @@
+// Jeu responsive généré par optimize-images.js (optimized_<nom>-<largeur>.webp/.avif)
+import manifest from './optimized-images.json'
+
+// Entrée du manifeste pour /images/procedures/photo.jpg ou optimized_photo.webp
+function manifestEntry(src) {
+  const fileName = src.split('?')[0].split('/').pop()
+  const baseName = fileName.replace(/^optimized_/, '').replace(/\.(jpg|jpeg|png|webp)$/i, '')
+  return Object.values(manifest.images).find(entry =>
+    entry.source.replace(/\.(jpg|jpeg|png)$/i, '') === baseName
+  )
+}
+
+// Sources <picture> (srcSet avif/webp) d'une image optimisée, null si absente du manifeste
+export function optimizedImageSources(src) {
+  const entry = manifestEntry(src)
+  if (!entry || entry.variants.length === 0) return null
+
+  const directory = src.split('?')[0].split('/').slice(0, -1).join('/')
+  const srcSet = format => entry.variants
+    .filter(variant => variant.format === format)
+    .sort((a, b) => a.width - b.width)
+    .map(variant => `${directory}/${variant.file} ${variant.width}w`)
+    .join(', ')
+
+  return { avif: srcSet('avif'), webp: srcSet('webp'), width: entry.width, height: entry.height }
+}
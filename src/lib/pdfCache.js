@@ -0,0 +1,256 @@
+// Cache mémoire des PDF servis par /api/pdf/[filename] et de leurs pages (/pages/[page])
+// LRU borné en octets, invalidé par mtime/taille, avec cache négatif des 404
+
+import { createHash } from 'crypto'
+import fs, { promises as fsp } from 'fs'
+import path from 'path'
+import { getPdfManifest, manifestEntry } from './pdfManifest'
+import { pdfPageEntry } from './pdfPages'
+import { observeHistogram } from './metrics'
+
+const PROCEDURES_DIR = path.join(process.cwd(), 'public', 'procedures')
+
+// Budget total, taille max d'une entrée (au-delà : lecture en streaming) et durée du cache négatif
+const MAX_BYTES = Number(process.env.PDF_CACHE_MAX_BYTES) || 32 * 1024 * 1024
+const MAX_ENTRY_BYTES = Number(process.env.PDF_CACHE_MAX_ENTRY_BYTES) || 8 * 1024 * 1024
+const NOT_FOUND_TTL_MS = Number(process.env.PDF_CACHE_NOT_FOUND_TTL_MS) || 30 * 1000
+const MAX_NOT_FOUND_ENTRIES = 1000
+
+// LRU borné en octets : Map conserve l'ordre d'insertion, la première clé est la plus ancienne
+export class ByteLRU {
+  constructor({ maxBytes, maxEntryBytes = maxBytes }) {
+    this.maxBytes = maxBytes
+    this.maxEntryBytes = maxEntryBytes
+    this.entries = new Map()
+    this.bytes = 0
+    this.hits = 0
+    this.misses = 0
+    this.evictions = 0
+  }
+
+  // Retourne l'entrée si elle existe et reste valide (isValid), en la marquant récente
+  get(key, isValid = () => true) {
+    const item = this.entries.get(key)
+    if (!item || !isValid(item.value)) {
+      if (item) this.delete(key)
+      this.misses++
+      return undefined
+    }
+    this.entries.delete(key)
+    this.entries.set(key, item)
+    this.hits++
+    return item.value
+  }
+
+  set(key, value, size) {
+    this.delete(key)
+    if (size > this.maxEntryBytes) return false
+
+    while (this.bytes + size > this.maxBytes && this.entries.size > 0) {
+      this.delete(this.entries.keys().next().value)
+      this.evictions++
+    }
+    this.entries.set(key, { value, size })
+    this.bytes += size
+    return true
+  }
+
+  delete(key) {
+    const item = this.entries.get(key)
+    if (!item) return
+    this.entries.delete(key)
+    this.bytes -= item.size
+  }
+
+  stats() {
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxBytes: this.maxBytes
+    }
+  }
+}
+
+// État partagé via globalThis : un seul cache par processus, même si le module
+// est chargé par plusieurs bundles de routes ou rechargé en développement
+const STATE_KEY = Symbol.for('portfolio.pdfCache')
+
+function getState() {
+  if (!globalThis[STATE_KEY]) {
+    globalThis[STATE_KEY] = {
+      lru: new ByteLRU({ maxBytes: MAX_BYTES, maxEntryBytes: MAX_ENTRY_BYTES }),
+      notFound: new Map(),
+      pending: new Map(),
+      etags: new Map(),
+      notFoundHits: 0,
+      manifestMisses: 0,
+      bypass: 0
+    }
+  }
+  return globalThis[STATE_KEY]
+}
+
+function rememberNotFound(state, key) {
+  if (state.notFound.size >= MAX_NOT_FOUND_ENTRIES) {
+    state.notFound.delete(state.notFound.keys().next().value)
+  }
+  state.notFound.set(key, Date.now() + NOT_FOUND_TTL_MS)
+}
+
+// ETag fort dérivé du contenu (SHA-256), calculé une seule fois par version du fichier
+function contentEtag(digest) {
+  return `"${digest.slice(0, 32)}"`
+}
+
+function hashFile(filePath) {
+  return new Promise((resolve, reject) => {
+    const hash = createHash('sha256')
+    fs.createReadStream(filePath)
+      .on('data', chunk => hash.update(chunk))
+      .on('end', () => resolve(hash.digest('hex')))
+      .on('error', reject)
+  })
+}
+
+// L'ETag est mémorisé tant que mtime et taille ne changent pas : il survit aux
+// évictions du LRU, et les fichiers non mis en cache ne sont hachés qu'une fois.
+// Le SHA-256 du manifeste (ou de l'index des pages) évite même ce premier hachage ;
+// mtime comparé à la milliseconde près, l'index des pages étant écrit par Python.
+async function etagFor(state, key, meta, indexed, computeDigest) {
+  const known = state.etags.get(key)
+  if (known && known.mtimeMs === meta.mtimeMs && known.size === meta.size) return known.etag
+
+  const fromIndex = indexed?.sha256 && Math.abs(indexed.mtimeMs - meta.mtimeMs) < 1 && indexed.size === meta.size
+  const etag = contentEtag(fromIndex ? indexed.sha256 : await computeDigest())
+  state.etags.set(key, { mtimeMs: meta.mtimeMs, size: meta.size, etag })
+  return etag
+}
+
+// Charge un PDF de public/procedures.
+// Retourne null si le fichier n'existe pas, sinon { filePath, size, mtimeMs, lastModified, etag, buffer, cache }
+// où buffer vaut null pour les fichiers trop gros pour le cache (cache: 'BYPASS', à streamer),
+// plus readMs, durée de la lecture disque, quand le fichier vient d'être lu (cache: 'MISS').
+// refresh : l'entrée en cache est écartée et le fichier relu (lecture à froid mesurée par les benchmarks).
+export async function loadPdf(filename, { refresh = false } = {}) {
+  const state = getState()
+
+  // Absent du manifeste : 404 sans accès disque
+  const indexed = manifestEntry(filename)
+  if (indexed === null) {
+    state.manifestMisses++
+    return null
+  }
+
+  if (refresh) state.lru.delete(filename)
+  return loadFile(state, filename, path.join(PROCEDURES_DIR, filename), indexed)
+}
+
+// Page d'un PDF découpée au build (split_pdf_pages.py), mise en cache comme les PDF entiers.
+// null si le PDF ou la page n'existe pas.
+export async function loadPdfPage(filename, page) {
+  const state = getState()
+  const indexed = pdfPageEntry(filename, page)
+  if (!indexed) {
+    state.manifestMisses++
+    return null
+  }
+  return loadFile(state, `${filename}#${page}`, indexed.filePath, indexed)
+}
+
+// Taille et date d'un fichier : celles du manifeste quand il fait foi (production, fichiers
+// figés au build), sans accès disque ; sinon celles du disque. null si le fichier n'existe pas.
+async function fileMeta(state, key, filePath, indexed) {
+  if (getPdfManifest() && indexed?.size !== undefined && indexed?.mtimeMs !== undefined) {
+    return { size: indexed.size, mtimeMs: indexed.mtimeMs, lastModified: new Date(indexed.mtimeMs).toUTCString() }
+  }
+
+  let stats
+  try {
+    stats = await fsp.stat(filePath)
+  } catch (error) {
+    if (error.code !== 'ENOENT' && error.code !== 'ENOTDIR') throw error
+    rememberNotFound(state, key)
+    return null
+  }
+  if (!stats.isFile()) {
+    rememberNotFound(state, key)
+    return null
+  }
+  return { size: stats.size, mtimeMs: stats.mtimeMs, lastModified: stats.mtime.toUTCString() }
+}
+
+// indexed : entrée du manifeste ou de l'index des pages ({ sha256, size, mtimeMs }), évite le hachage
+// et, en production, le stat : le disque n'est lu que pour le contenu, en cas d'absence du cache
+async function loadFile(state, key, filePath, indexed) {
+  const notFoundUntil = state.notFound.get(key)
+  if (notFoundUntil !== undefined) {
+    if (notFoundUntil > Date.now()) {
+      state.notFoundHits++
+      return null
+    }
+    state.notFound.delete(key)
+  }
+
+  const meta = await fileMeta(state, key, filePath, indexed)
+  if (!meta) return null
+
+  const cached = state.lru.get(key, entry => entry.mtimeMs === meta.mtimeMs && entry.size === meta.size)
+  if (cached) return { ...cached, filePath, cache: 'HIT' }
+
+  if (meta.size > MAX_ENTRY_BYTES) {
+    state.bypass++
+    const etag = await etagFor(state, key, meta, indexed, () => hashFile(filePath))
+    return { ...meta, etag, filePath, buffer: null, cache: 'BYPASS' }
+  }
+
+  // Les requêtes simultanées sur un fichier absent du cache partagent une seule lecture
+  const pendingKey = `${key}:${meta.mtimeMs}:${meta.size}`
+  let pending = state.pending.get(pendingKey)
+  if (!pending) {
+    const readStart = process.hrtime.bigint()
+    pending = fsp.readFile(filePath)
+      .then(async buffer => {
+        const readSeconds = Number(process.hrtime.bigint() - readStart) / 1e9
+        observeHistogram('portfolio_pdf_file_read_duration_seconds', {}, readSeconds)
+        const etag = await etagFor(state, key, meta, indexed, () => createHash('sha256').update(buffer).digest('hex'))
+        const entry = { ...meta, size: buffer.length, etag, buffer }
+        state.lru.set(key, entry, buffer.length)
+        return { entry, readMs: readSeconds * 1000 }
+      })
+      .finally(() => state.pending.delete(pendingKey))
+    state.pending.set(pendingKey, pending)
+  }
+
+  let result
+  try {
+    result = await pending
+  } catch (error) {
+    // Listé dans le manifeste mais supprimé depuis le build
+    if (error.code !== 'ENOENT') throw error
+    rememberNotFound(state, key)
+    return null
+  }
+  return { ...result.entry, filePath, cache: 'MISS', readMs: result.readMs }
+}
+
+// Variante précompressée (X.pdf.br, X.pdf.gz) du PDF déjà chargé, passant par le même cache.
+// Une variante absente ou plus ancienne que l'original est ignorée.
+export async function loadPdfVariant(file, filename, extension, options) {
+  const variant = await loadPdf(`${filename}${extension}`, options)
+  if (!variant || variant.mtimeMs < file.mtimeMs) return null
+  return variant
+}
+
+export function getPdfCacheStats() {
+  const state = getState()
+  return {
+    ...state.lru.stats(),
+    notFoundHits: state.notFoundHits,
+    notFoundEntries: state.notFound.size,
+    manifestMisses: state.manifestMisses,
+    bypass: state.bypass
+  }
+}
@@ -0,0 +1,41 @@
+// Manifeste des PDF généré au build (build-pdf-manifest.js) : taille, mtime, SHA-256,
+// pages, linéarisation et variantes précompressées de chaque fichier de public/procedures
+
+import fs from 'fs'
+import path from 'path'
+
+const MANIFEST_PATH = path.join(process.cwd(), 'public', 'procedures', 'manifest.json')
+
+// En développement les fichiers changent sans rebuild : le manifeste n'y fait pas foi
+const ENABLED = process.env.NODE_ENV === 'production' && process.env.PDF_MANIFEST !== 'off'
+
+const STATE_KEY = Symbol.for('portfolio.pdfManifest')
+
+// Chargé une seule fois par processus ; null si absent ou illisible (retour au disque)
+export function getPdfManifest() {
+  if (!(STATE_KEY in globalThis)) {
+    let manifest = null
+    if (ENABLED) {
+      try {
+        manifest = JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf8'))
+      } catch (error) {
+        if (error.code !== 'ENOENT') console.error('Invalid PDF manifest:', error)
+      }
+    }
+    globalThis[STATE_KEY] = manifest
+  }
+  return globalThis[STATE_KEY]
+}
+
+// Entrée d'un PDF ou d'une variante (X.pdf.br, X.pdf.gz).
+// undefined sans manifeste, null si le manifeste ne connaît pas le fichier
+export function manifestEntry(name) {
+  const manifest = getPdfManifest()
+  if (!manifest) return undefined
+
+  const extension = path.extname(name)
+  if (extension.toLowerCase() === '.pdf') return manifest.files[name] || null
+
+  const original = manifest.files[name.slice(0, -extension.length)]
+  return original?.variants?.[extension] || null
+}
@@ -0,0 +1,37 @@
+// Pages des PDF découpées par split_pdf_pages.py dans public/procedures/pages
+// (GLPI.pdf → GLPI-1.pdf, GLPI-2.pdf...), servies par /api/pdf/[filename]/pages/[page]
+
+import fs from 'fs'
+import path from 'path'
+
+const PAGES_DIR = path.join(process.cwd(), 'public', 'procedures', 'pages')
+const INDEX_PATH = path.join(PAGES_DIR, 'index.json')
+
+const STATE_KEY = Symbol.for('portfolio.pdfPages')
+
+// Chargé une seule fois par processus ; null si les pages n'ont pas été générées
+export function getPdfPagesIndex() {
+  if (!(STATE_KEY in globalThis)) {
+    let index = null
+    try {
+      index = JSON.parse(fs.readFileSync(INDEX_PATH, 'utf8'))
+    } catch (error) {
+      if (error.code !== 'ENOENT') console.error('Invalid PDF pages index:', error)
+    }
+    globalThis[STATE_KEY] = index
+  }
+  return globalThis[STATE_KEY]
+}
+
+// Même nommage que split_pdf_pages.py
+export function pageFilename(filename, page) {
+  return `${filename.replace(/\.pdf$/i, '')}-${page}.pdf`
+}
+
+// { filePath, size, mtimeMs, sha256 } d'une page (numérotée à partir de 1), null si inconnue
+export function pdfPageEntry(filename, page) {
+  const entry = getPdfPagesIndex()?.files?.[filename]
+  const output = entry?.outputs?.[pageFilename(filename, page)]
+  if (!output) return null
+  return { ...output, filePath: path.join(PAGES_DIR, pageFilename(filename, page)) }
+}
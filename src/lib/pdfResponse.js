@@ -0,0 +1,81 @@
+// Réponse HTTP d'un PDF chargé par pdfCache (document entier ou page) :
+// en-têtes de cache, revalidation 304, requêtes Range et variante précompressée
+
+import { NextResponse } from 'next/server'
+import { promises as fsp } from 'fs'
+import { parseRange, isRangeFresh } from './httpRange'
+import { isNotModified } from './httpConditional'
+import { createFileStream } from './fileStream'
+
+// Corps de réponse : depuis la mémoire si le fichier est en cache, sinon lu sur le
+// disque au rythme du client (le descripteur est fermé par le stream lui-même)
+async function fileBody(file, start, end) {
+  if (file.buffer) {
+    return start === 0 && end === file.size - 1 ? file.buffer : file.buffer.subarray(start, end + 1)
+  }
+  const handle = await fsp.open(file.filePath, 'r')
+  return createFileStream(handle, { start, end })
+}
+
+// Corps lu sur le disque (fichier hors cache) : l'ouverture est notée dans Server-Timing,
+// le transfert lui-même a lieu après l'envoi des en-têtes
+async function timedFileBody(timing, file, start, end) {
+  if (file.buffer || !timing) return fileBody(file, start, end)
+  const opened = performance.now()
+  const body = await fileBody(file, start, end)
+  timing.add('stream', performance.now() - opened, 'open')
+  return body
+}
+
+// file : PDF chargé ; variant : sa variante .br/.gz choisie pour ce client, ou null ;
+// filename : nom proposé au navigateur (Content-Disposition) ; timing : ServerTiming de la requête
+export async function pdfResponse(request, { file, variant, filename, timing }) {
+  const representation = variant || file
+  const { lastModified } = file
+  const { size, etag } = representation
+
+  const headers = {
+    'Content-Type': 'application/pdf',
+    'Content-Disposition': `inline; filename="${filename}"`,
+    'Cache-Control': 'public, max-age=3600',
+    'Accept-Ranges': 'bytes',
+    'Last-Modified': lastModified,
+    'ETag': etag,
+    'Vary': 'Accept-Encoding',
+    'X-Cache': representation.cache
+  }
+  if (variant) headers['Content-Encoding'] = variant.encoding
+
+  // Revalidation : le client a déjà cette version, rien à renvoyer
+  if (isNotModified(request.headers, { etag, lastModified })) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  // Requêtes partielles : les visionneuses PDF chargent le document page par page
+  const range = !variant && isRangeFresh(request.headers.get('if-range'), { etag, lastModified })
+    ? parseRange(request.headers.get('range'), size)
+    : null
+
+  if (range?.unsatisfiable) {
+    return new NextResponse(null, {
+      status: 416,
+      headers: { ...headers, 'Content-Range': `bytes */${size}` }
+    })
+  }
+
+  if (range) {
+    return new NextResponse(await timedFileBody(timing, file, range.start, range.end), {
+      status: 206,
+      headers: {
+        ...headers,
+        'Content-Range': `bytes ${range.start}-${range.end}/${size}`,
+        'Content-Length': String(range.end - range.start + 1)
+      }
+    })
+  }
+
+  return new NextResponse(await timedFileBody(timing, representation, 0, size - 1), {
+    status: 200,
+    headers: { ...headers, 'Content-Length': String(size) }
+  })
+}
@@ -0,0 +1,20 @@
+// Miniatures de la première page générées par generate_pdf_thumbnails.py
+// dans public/procedures/thumbnails (GLPI.pdf → GLPI-640.webp, GLPI-640.avif...)
+
+// Mêmes largeurs que images.deviceSizes de next.config.js
+export const THUMBNAIL_WIDTHS = [640, 750, 828, 1080, 1200, 1920]
+
+// Sources <picture> de l'aperçu d'un PDF (/procedures/GLPI.pdf ou /api/pdf/GLPI.pdf)
+export function pdfThumbnailSources(pdfUrl) {
+  const filename = pdfUrl.split('#')[0].split('?')[0].split('/').pop()
+  const stem = filename.replace(/\.pdf$/i, '')
+  const srcSet = extension => THUMBNAIL_WIDTHS
+    .map(width => `/procedures/thumbnails/${encodeURIComponent(stem)}-${width}.${extension} ${width}w`)
+    .join(', ')
+
+  return {
+    avif: srcSet('avif'),
+    webp: srcSet('webp'),
+    src: `/procedures/thumbnails/${encodeURIComponent(stem)}-${THUMBNAIL_WIDTHS[0]}.webp`
+  }
+}
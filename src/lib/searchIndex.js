@@ -0,0 +1,167 @@
+// Recherche plein texte dans les PDF de public/procedures
+// Index inversé généré par build_search_index.py (public/procedures/search-index.json) :
+// postings par page [doc, page, tf, ...], textes des pages pour les extraits.
+// Même tokenisation et même classement que search_index.py : les garder synchronisés.
+
+import fs from 'fs'
+import path from 'path'
+
+const INDEX_PATH = path.join(process.cwd(), 'public', 'procedures', 'search-index.json')
+const INDEX_VERSION = 1
+
+// BM25, une page étant l'unité de recherche
+const BM25_K1 = 1.2
+const BM25_B = 0.75
+
+// Le dernier mot de la requête couvre aussi les termes qu'il préfixe (saisie en cours)
+const MAX_PREFIX_EXPANSIONS = 10
+
+const SNIPPET_LENGTH = 180
+const SNIPPET_CONTEXT = 60
+
+const COMBINING_MARKS = /[\u0300-\u036f]/g
+const TOKEN = /[a-z0-9]+/g
+
+// Minuscules sans accents : 'Procédure' → 'procedure'
+function fold(text) {
+  return text.normalize('NFD').replace(COMBINING_MARKS, '').toLowerCase()
+}
+
+// fold() caractère par caractère : les positions du résultat sont celles du texte
+function foldChars(text) {
+  let folded = ''
+  for (let i = 0; i < text.length; i++) folded += (fold(text[i]) || ' ')[0]
+  return folded
+}
+
+export function tokenize(text, { minLength, stopwords }) {
+  return (fold(text).match(TOKEN) || []).filter(token => token.length >= minLength && !stopwords.has(token))
+}
+
+// Structures de requête construites une fois au chargement
+function prepare(raw) {
+  if (raw.version !== INDEX_VERSION) throw new Error(`Unsupported search index version ${raw.version}`)
+  const pageLengths = raw.documents.map(document => document.lengths)
+  const pages = pageLengths.flat()
+  return {
+    documents: raw.documents,
+    tokenizer: { minLength: raw.tokenizer.minLength, stopwords: new Set(raw.tokenizer.stopwords) },
+    postings: new Map(Object.entries(raw.terms)),
+    // Ordre des chaînes identique à Python (code units, termes ASCII)
+    terms: Object.keys(raw.terms).sort(),
+    pageLengths,
+    pageCount: pages.length,
+    averageLength: pages.length ? pages.reduce((sum, length) => sum + length, 0) / pages.length : 0
+  }
+}
+
+const STATE_KEY = Symbol.for('portfolio.searchIndex')
+
+// Chargé une seule fois par processus ; null si l'index n'a pas été généré
+export function getSearchIndex() {
+  if (!(STATE_KEY in globalThis)) {
+    let index = null
+    try {
+      index = prepare(JSON.parse(fs.readFileSync(INDEX_PATH, 'utf8')))
+    } catch (error) {
+      if (error.code !== 'ENOENT') console.error('Invalid search index:', error)
+    }
+    globalThis[STATE_KEY] = index
+  }
+  return globalThis[STATE_KEY]
+}
+
+// Termes de l'index commençant par token, le terme exact en premier (recherche dichotomique)
+function expand(index, token) {
+  let low = 0
+  let high = index.terms.length
+  while (low < high) {
+    const middle = (low + high) >> 1
+    if (index.terms[middle] < token) low = middle + 1
+    else high = middle
+  }
+  const expansions = []
+  for (let i = low; i < index.terms.length && expansions.length < MAX_PREFIX_EXPANSIONS; i++) {
+    if (!index.terms[i].startsWith(token)) break
+    expansions.push(index.terms[i])
+  }
+  return expansions
+}
+
+// Contribution BM25 d'un terme à chaque page qui le contient : Map 'doc:page' → score
+function scoreTerm(index, term) {
+  const postings = index.postings.get(term) || []
+  const frequency = postings.length / 3
+  const idf = Math.log(1 + (index.pageCount - frequency + 0.5) / (frequency + 0.5))
+  const scores = new Map()
+  for (let i = 0; i < postings.length; i += 3) {
+    const [doc, page, tf] = [postings[i], postings[i + 1], postings[i + 2]]
+    const norm = 1 - BM25_B + BM25_B * index.pageLengths[doc][page] / index.averageLength
+    scores.set(`${doc}:${page}`, idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm))
+  }
+  return scores
+}
+
+// Environ SNIPPET_LENGTH caractères autour du premier terme trouvé
+function snippet(text, terms) {
+  const folded = foldChars(text)
+  let position = 0
+  for (const match of folded.matchAll(TOKEN)) {
+    if (terms.has(match[0])) {
+      position = match.index
+      break
+    }
+  }
+  let start = Math.max(0, position - SNIPPET_CONTEXT)
+  if (start > 0) {
+    // Début sur une frontière de mot
+    const space = text.indexOf(' ', start)
+    if (space > -1 && space < position) start = space + 1
+  }
+  let end = Math.min(text.length, start + SNIPPET_LENGTH)
+  if (end < text.length) {
+    const space = text.lastIndexOf(' ', end - 1)
+    if (space > position) end = space
+  }
+  return (start > 0 ? '…' : '') + text.slice(start, end).trim() + (end < text.length ? '…' : '')
+}
+
+// Pages classées par BM25, sommé sur les mots de la requête. Chaque mot compte une
+// fois par page, avec sa meilleure expansion.
+export function search(index, query, limit = 10) {
+  const tokens = [...new Set(tokenize(query, index.tokenizer))]
+  const matchedTerms = new Set()
+  const scores = new Map()
+  tokens.forEach((token, i) => {
+    const expansions = i === tokens.length - 1 ? expand(index, token) : index.postings.has(token) ? [token] : []
+    const best = new Map()
+    for (const term of expansions) {
+      matchedTerms.add(term)
+      for (const [key, score] of scoreTerm(index, term)) {
+        best.set(key, Math.max(best.get(key) || 0, score))
+      }
+    }
+    for (const [key, score] of best) scores.set(key, (scores.get(key) || 0) + score)
+  })
+
+  const ranked = [...scores].map(([key, score]) => {
+    const [doc, page] = key.split(':').map(Number)
+    return { doc, page, score }
+  })
+  ranked.sort((a, b) => b.score - a.score || a.doc - b.doc || a.page - b.page)
+
+  return {
+    total: ranked.length,
+    results: ranked.slice(0, limit).map(({ doc, page, score }) => {
+      const document = index.documents[doc]
+      return {
+        file: document.file,
+        title: document.title,
+        page: page + 1,
+        score: Math.round(score * 1e4) / 1e4,
+        snippet: snippet(document.pages[page], matchedTerms),
+        url: `/api/pdf/${document.file}#page=${page + 1}`
+      }
+    })
+  }
+}
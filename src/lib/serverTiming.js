@@ -0,0 +1,50 @@
+// En-têtes Server-Timing et X-Request-Id : où passe le temps côté serveur (recherche
+// du fichier, lecture disque, ouverture du flux) pour le comparer à ce que mesure le client.
+// Quelques appels à performance.now() par requête ; SERVER_TIMING=0 les retire.
+// Utilisé aussi par le middleware : pas d'API propre à Node.js ici.
+
+export const SERVER_TIMING_ENABLED = !['0', 'false', 'off'].includes((process.env.SERVER_TIMING || '').toLowerCase())
+
+// Identifiant posé par un proxy amont, repris s'il est raisonnable
+const REQUEST_ID = /^[\w.:-]{1,128}$/
+
+export function requestId(request) {
+  const incoming = request.headers.get('x-request-id')
+  return incoming && REQUEST_ID.test(incoming) ? incoming : crypto.randomUUID()
+}
+
+// Étapes d'une requête, en millisecondes depuis sa réception
+export class ServerTiming {
+  constructor() {
+    this.start = performance.now()
+    this.entries = []
+  }
+
+  add(name, duration, description) {
+    this.entries.push({ name, duration, description })
+  }
+
+  // Temps passé à trouver le fichier (manifeste, stat, cache) depuis start ;
+  // les lectures disque des fichiers chargés (readMs, cache MISS) sont comptées à part
+  lookup(start, files) {
+    const read = files.reduce((total, file) => total + (file?.readMs || 0), 0)
+    this.add('lookup', performance.now() - start - read)
+    if (read) this.add('read', read, 'miss')
+  }
+
+  header() {
+    const entries = [...this.entries, { name: 'total', duration: performance.now() - this.start }]
+    return entries
+      .map(({ name, duration, description }) =>
+        `${name};dur=${duration.toFixed(3)}${description ? `;desc="${description}"` : ''}`)
+      .join(', ')
+  }
+}
+
+// Ajoute Server-Timing (total : jusqu'à l'envoi des en-têtes) et X-Request-Id à la réponse
+export function applyServerTiming(response, timing, id) {
+  if (!SERVER_TIMING_ENABLED) return response
+  response.headers.set('Server-Timing', timing.header())
+  response.headers.set('X-Request-Id', id)
+  return response
+}
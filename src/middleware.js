@@ -0,0 +1,16 @@
+import { NextResponse } from 'next/server'
+import { ServerTiming, applyServerTiming, requestId } from './lib/serverTiming'
+
+// Redirection / → /accueil faite ici, avant le rendu : même statut 307 que redirect()
+// dans src/app/page.js (gardé pour le build statique), mais avec Server-Timing et
+// X-Request-Id. Next.js réécrit la Location de même origine en chemin relatif.
+export function middleware(request) {
+  const timing = new ServerTiming()
+  const response = NextResponse.redirect(new URL('/accueil', request.url), 307)
+  return applyServerTiming(response, timing, requestId(request))
+}
+
+// Seule la racine passe par le middleware
+export const config = {
+  matcher: '/'
+}
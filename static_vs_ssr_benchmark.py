@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Static vs SSR Benchmark for Next.js Portfolio Application
+Runs the same workload (every page, the / redirect, /api/pdf/* and
+/procedures/*) against `next start` and against the pre-rendered out/
+directory (npm run build:static), and reports throughput and latency per
+route class for each mode
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+import requests
+
+import http_client
+import run_all_tests
+from perf_stats import summarize
+from server_fixture import serve
+from suite_report import SuiteReport, add_report_arguments, finish_report, positive_float, positive_int
+
+# Server names as used by server_fixture, and how they are labelled here
+MODES = {"next": "ssr", "static": "static"}
+
+# Same Accept-Encoding as a browser, so both modes serve their .br/.gz variants
+WORKLOAD_HEADERS = {"Accept-Encoding": "br, gzip"}
+
+def route_class(path):
+    """Group routes whose cost is comparable"""
+    if path == "/":
+        return "redirect"
+    if path.startswith("/api/pdf/"):
+        return "api-pdf"
+    if path.startswith("/procedures/"):
+        return "static-pdf"
+    return "page"
+
+def workload_worker(routes, deadline, seed, samples, lock):
+    """Request the routes in a shuffled order until the deadline, recording each response"""
+    rng = random.Random(seed)
+    local = []
+    while time.monotonic() < deadline:
+        order = list(routes)
+        rng.shuffle(order)
+        for path in order:
+            if time.monotonic() >= deadline:
+                break
+            try:
+                fetched = http_client.fetch_timed(path, decode=False, allow_redirects=False, headers=WORKLOAD_HEADERS)
+                status = fetched["response"].status_code
+                local.append((route_class(path), fetched["total"], fetched["bytes"], status < 400))
+            except requests.exceptions.RequestException:
+                local.append((route_class(path), None, 0, False))
+    with lock:
+        samples.extend(local)
+
+def run_workload(routes, duration, concurrency):
+    """Drive the workload for duration seconds and summarize it per route class"""
+    samples = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    start = time.perf_counter()
+    workers = [
+        threading.Thread(target=workload_worker, args=(routes, deadline, seed, samples, lock))
+        for seed in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    classes = {}
+    for name in sorted({sample[0] for sample in samples}) + ["all"]:
+        selected = [sample for sample in samples if name == "all" or sample[0] == name]
+        latencies = [sample[1] for sample in selected if sample[3]]
+        stats = summarize(latencies)
+        classes[name] = {
+            "requests": len(selected),
+            "errors": sum(1 for sample in selected if not sample[3]),
+            "rps": len(selected) / elapsed,
+            "mbps": sum(sample[2] for sample in selected) * 8 / elapsed / 1e6,
+            "p50_ms": stats["p50"] * 1000,
+            "p95_ms": stats["p95"] * 1000,
+            "p99_ms": stats["p99"] * 1000,
+        }
+    return {"elapsed": elapsed, "classes": classes}
+
+def benchmark_mode(target, duration, concurrency, warmup):
+    """Start one mode, warm it up and measure it"""
+    routes = run_all_tests.discover_routes()
+    with serve(target) as server:
+        if warmup:
+            run_all_tests.warm_up(routes)
+        print(f"⏱️  {MODES.get(target, target)}: {len(routes)} routes, {concurrency} workers, {duration:.0f}s...")
+        results = run_workload(routes, duration, concurrency)
+        results["startup_ms"] = server.startup_time * 1000 if server.startup_time is not None else None
+    all_classes = results["classes"]["all"]
+    results["success"] = all_classes["errors"] == 0
+    print(f"  ✅ {all_classes['requests']} requests, {all_classes['rps']:.0f} req/s, "
+          f"p50 {all_classes['p50_ms']:.1f}ms, {all_classes['errors']} errors")
+    return results
+
+def print_comparison(results):
+    """Per route class: each mode side by side, and what going static changes"""
+    print("\n" + "=" * 96)
+    print("📊 STATIC vs SSR")
+    print("=" * 96)
+    print(f"{'Class':<12}{'Mode':<8}{'req/s':>9}{'Mbit/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}")
+    ssr, static = results.get("ssr"), results.get("static")
+    names = sorted(set().union(*(mode["classes"] for mode in results.values())), key=lambda name: (name == "all", name))
+    for name in names:
+        for mode, data in results.items():
+            entry = data["classes"].get(name)
+            if entry is None:
+                continue
+            print(f"{name:<12}{mode:<8}{entry['rps']:>9.0f}{entry['mbps']:>9.1f}{entry['p50_ms']:>8.1f}ms"
+                  f"{entry['p95_ms']:>8.1f}ms{entry['p99_ms']:>8.1f}ms{entry['errors']:>8}")
+        if ssr and static and name in ssr["classes"] and name in static["classes"]:
+            before, after = ssr["classes"][name], static["classes"][name]
+            ratio = after["rps"] / before["rps"] if before["rps"] else 0
+            print(f"{'':<12}{'Δ':<8}{'x' + format(ratio, '.2f'):>9}{'':>9}"
+                  f"{after['p50_ms'] - before['p50_ms']:>+8.1f}ms{after['p95_ms'] - before['p95_ms']:>+8.1f}ms")
+    for mode, data in results.items():
+        if data.get("startup_ms") is not None:
+            print(f"Startup {mode}: {data['startup_ms']:.0f}ms")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Compare `next start` with the pre-rendered static build")
+    parser.add_argument("--duration", type=positive_float, default=20.0, help="measured seconds per mode (default: 20)")
+    parser.add_argument("--concurrency", type=positive_int, default=8, help="concurrent workers (default: 8)")
+    parser.add_argument("--no-warmup", action="store_true", help="skip the warm-up pass")
+    parser.add_argument("--modes", default="next,static",
+                        help="comma-separated servers to compare (default: next,static; standin also works)")
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Main benchmark function"""
+    args = args or parse_args([])
+    report = SuiteReport("static-vs-ssr")
+
+    print("🚀 Starting Static vs SSR Benchmark for Next.js Portfolio")
+    print("=" * 60)
+
+    results = {}
+    for target in args.modes.split(","):
+        label = MODES.get(target, target)
+        results[label] = report.run(f"benchmark_{label}", benchmark_mode, target,
+                                    args.duration, args.concurrency, not args.no_warmup)
+        if "classes" not in results[label]:
+            print(f"  ❌ {label}: {results[label].get('error')}")
+            return finish_report(report, args, False)
+        for name, entry in results[label]["classes"].items():
+            report.add_metric(f"bench.{label}.{name}.p50_ms", entry["p50_ms"])
+            report.add_metric(f"bench.{label}.{name}.p95_ms", entry["p95_ms"])
+
+    print_comparison(results)
+    errors = sum(data["classes"]["all"]["errors"] for data in results.values())
+    success = report.passed
+    print(f"\n🎯 BENCHMARK: {'✅ COMPLETED' if success else f'❌ {errors} FAILED REQUESTS'}")
+    return finish_report(report, args, success)
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Structured reporting for the test scripts
+Collects every check with its timing and byte counts, writes JSON / JUnit XML
+and gates the run against a baseline file
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+
+import http_client
+import server_metrics
+import server_timing
+from perf_stats import summarize
+
+# Default regression thresholds (overridable on the command line or in the baseline file)
+DEFAULT_THRESHOLDS = {
+    "latency_ratio": 1.5,       # p50 may grow by 50%...
+    "latency_min_delta_ms": 5,  # ...and by at least 5ms before it counts
+    "size_ratio": 1.1,          # payloads may grow by 10%
+}
+
+def result_passed(result):
+    """Normalize the return value of a test_* function to a pass/fail boolean"""
+    if isinstance(result, bool):
+        return result
+    if isinstance(result, dict):
+        return bool(result.get("success", False))
+    return bool(result)
+
+def route_pattern(route):
+    """/api/pdf/[filename] → regex matching the request paths served by that route"""
+    return re.compile("^" + re.sub(r"\\\[[^/]+?\\\]", "[^/]+", re.escape(route)) + "$")
+
+# Route handlers wrapped by instrumentRoute() in src/lib/metrics.js
+INSTRUMENTED_ROUTES = ["/api/pdf/[filename]", "/api/pdf/[filename]/pages/[page]", "/api/search"]
+
+ROUTE_PATTERNS = [(route, route_pattern(route)) for route in INSTRUMENTED_ROUTES]
+
+def endpoint_key(record):
+    """Group requests by method, path and status (206/304 are tracked apart from full 200s)"""
+    return f"{record['method']} {urlparse(record['url']).path} {record['status']}"
+
+def route_key(record):
+    """Group requests by method, route (/api/pdf/[filename] for every PDF) and status"""
+    path = urlparse(record["url"]).path
+    route = next((route for route, pattern in ROUTE_PATTERNS if pattern.match(path)), path)
+    return f"{record['method']} {route} {record['status']}"
+
+class SuiteReport:
+    """Collects checks, HTTP timings and metrics for one suite run"""
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.started = time.time()
+        self.checks = []
+        self.metrics = {}
+        self.requests = []
+        self.regressions = []
+        self.server = None
+        self._lock = threading.Lock()
+        # Server-side counters before the run (start_server_metrics), diffed by collect_server_metrics()
+        self._server_before = None
+
+    def run(self, name, func, *args, **kwargs):
+        """Run a check, recording its result, duration and the requests it made on this thread"""
+        thread_id = threading.get_ident()
+        made = []
+
+        def hook(record):
+            if threading.get_ident() == thread_id:
+                made.append(record)
+
+        http_client.add_timing_hook(hook)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            error = None
+        except Exception as e:
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+            error = result["error"]
+        finally:
+            http_client.remove_timing_hook(hook)
+        duration = time.perf_counter() - start
+
+        with self._lock:
+            self.requests.extend(made)
+            self.checks.append({
+                "name": name,
+                "passed": result_passed(result),
+                "duration": duration,
+                "requests": len(made),
+                "bytes": sum(record["bytes"] or 0 for record in made),
+                # Time to first byte of the check's first request
+                "ttfb": made[0]["ttfb"] if made else None,
+                "error": error or (result.get("error") if isinstance(result, dict) else None),
+                # Raised instead of returning a result: a JUnit error rather than a failure
+                "exception": error is not None,
+                "details": result,
+            })
+        return result
+
+    def add_metric(self, name, value, unit="ms"):
+        """Record a named metric where lower is better (latency, size...)"""
+        with self._lock:
+            self.metrics[name] = {"value": value, "unit": unit}
+
+    def endpoints(self):
+        """Latency and payload statistics per endpoint over the whole run"""
+        grouped = {}
+        for record in self.requests:
+            grouped.setdefault(endpoint_key(record), []).append(record)
+
+        endpoints = {}
+        for key, records in sorted(grouped.items()):
+            latency = summarize([record["elapsed"] for record in records])
+            sizes = [record["bytes"] for record in records if record["bytes"] is not None]
+            endpoints[key] = {
+                "count": len(records),
+                "p50_ms": latency["p50"] * 1000,
+                "p95_ms": latency["p95"] * 1000,
+                "max_ms": latency["max"] * 1000,
+                "bytes": max(sizes) if sizes else None,
+            }
+        return endpoints
+
+    def server_timing(self):
+        """Per route p50 of server time (Server-Timing) vs time outside the handler and transfer"""
+        return server_timing.summarize_breakdowns(self.requests, route_key)
+
+    def start_server_metrics(self):
+        """
+        Scrape /api/metrics before the run, once the server under test is up, so
+        collect_server_metrics() can tell what the run itself caused. Returns
+        False if the server does not expose metrics.
+        """
+        self._server_before = server_metrics.scrape()
+        return self._server_before is not None
+
+    def collect_server_metrics(self):
+        """Scrape /api/metrics again and keep what the server observed during the run"""
+        if self._server_before is None or self.server is not None:
+            return self.server
+        after = server_metrics.scrape()
+        if after is None:
+            return None
+        self.server = server_metrics.summarize(server_metrics.diff(self._server_before, after))
+
+        for route, entry in self.server["routes"].items():
+            pattern = route_pattern(route)
+            client = [record["elapsed"] for record in self.requests if pattern.match(urlparse(record["url"]).path)]
+            entry["client"] = {"count": len(client), "p50_ms": summarize(client)["p50"] * 1000} if client else None
+            if entry["latency"]:
+                self.add_metric(f"server.{route}.mean_ms", entry["latency"]["mean_ms"])
+        return self.server
+
+    @property
+    def passed(self):
+        return all(check["passed"] for check in self.checks)
+
+    def to_dict(self):
+        return {
+            "suite": self.suite,
+            "base_url": http_client.BASE_URL,
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "passed": self.passed,
+            "checks": self.checks,
+            "endpoints": self.endpoints(),
+            "metrics": self.metrics,
+            "regressions": self.regressions,
+            "server": self.server,
+            "server_timing": self.server_timing(),
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    def write_junit(self, path):
+        errors = [check for check in self.checks if check.get("exception")]
+        failures = [check for check in self.checks if not check["passed"] and not check.get("exception")]
+        testsuite = ET.Element("testsuite", {
+            "name": self.suite,
+            "tests": str(len(self.checks)),
+            "failures": str(len(failures)),
+            "errors": str(len(errors)),
+            "time": f"{sum(check['duration'] for check in self.checks):.3f}",
+        })
+        for check in self.checks:
+            testcase = ET.SubElement(testsuite, "testcase", {
+                "classname": self.suite,
+                "name": check["name"],
+                "time": f"{check['duration']:.3f}",
+            })
+            if not check["passed"]:
+                tag = "error" if check.get("exception") else "failure"
+                failure = ET.SubElement(testcase, tag, {"message": check["error"] or "check failed"})
+                failure.text = json.dumps(check["details"], indent=2, default=str)
+            ET.SubElement(testcase, "system-out").text = (
+                f"requests={check['requests']} bytes={check['bytes']}"
+            )
+        ET.ElementTree(testsuite).write(path, encoding="utf-8", xml_declaration=True)
+
+    def write_baseline(self, path, thresholds=None):
+        """Store the current endpoints and metrics as the reference for later runs"""
+        with open(path, "w") as f:
+            json.dump({
+                "suite": self.suite,
+                "thresholds": thresholds or DEFAULT_THRESHOLDS,
+                "endpoints": self.endpoints(),
+                "metrics": self.metrics,
+            }, f, indent=2)
+
+    def compare_baseline(self, path, thresholds=None):
+        """Return the list of regressions against a baseline file"""
+        with open(path) as f:
+            baseline = json.load(f)
+        limits = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}), **(thresholds or {})}
+        regressions = []
+
+        def latency_regressed(before, after):
+            return (after > before * limits["latency_ratio"]
+                    and after - before > limits["latency_min_delta_ms"])
+
+        current = self.endpoints()
+        for key, before in baseline.get("endpoints", {}).items():
+            after = current.get(key)
+            if after is None:
+                continue
+            if latency_regressed(before["p50_ms"], after["p50_ms"]):
+                regressions.append(f"{key}: p50 {before['p50_ms']:.1f}ms → {after['p50_ms']:.1f}ms")
+            if before.get("bytes") and after.get("bytes") and after["bytes"] > before["bytes"] * limits["size_ratio"]:
+                regressions.append(f"{key}: payload {before['bytes']} → {after['bytes']} bytes")
+
+        for name, before in baseline.get("metrics", {}).items():
+            after = self.metrics.get(name)
+            if after is None:
+                continue
+            if before["unit"] == "ms":
+                regressed = latency_regressed(before["value"], after["value"])
+            else:
+                regressed = after["value"] > before["value"] * limits["size_ratio"]
+            if regressed:
+                regressions.append(f"{name}: {before['value']:.1f}{before['unit']} → {after['value']:.1f}{after['unit']}")
+
+        return regressions
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1 (iterations, workers...)"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+def positive_float(value):
+    """argparse type for durations and intervals that must be above 0"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}") from None
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value}")
+    return number
+
+def add_report_arguments(parser):
+    """Add the structured output and baseline options to a script's argument parser"""
+    group = parser.add_argument_group("reporting")
+    group.add_argument("--json", metavar="PATH", help="write every check, timing and byte count as JSON")
+    group.add_argument("--junit", metavar="PATH", help="write a JUnit XML report")
+    group.add_argument("--baseline", metavar="PATH",
+                       help="fail if latency or payload size regressed against this baseline file")
+    group.add_argument("--write-baseline", metavar="PATH", help="save this run as a baseline file")
+    group.add_argument("--latency-threshold", type=float, default=None,
+                       help=f"allowed p50 latency ratio (default: {DEFAULT_THRESHOLDS['latency_ratio']})")
+    group.add_argument("--size-threshold", type=float, default=None,
+                       help=f"allowed payload size ratio (default: {DEFAULT_THRESHOLDS['size_ratio']})")
+    return parser
+
+def print_server_metrics(server):
+    """What the server measured per route, next to what the client measured"""
+    if not server["file_read"] and not any(entry["requests"] for entry in server["routes"].values()):
+        return
+    print("\n" + "=" * 60)
+    print("🖥️  SERVER-SIDE METRICS (/api/metrics, delta over this run)")
+    print("=" * 60)
+    for route, entry in sorted(server["routes"].items()):
+        if not entry["requests"]:
+            continue
+        cache = ", ".join(f"{result} {count}" for result, count in sorted(entry["cache"].items())) or "n/a"
+        print(f"{route}: {entry['requests']} requests, {entry['not_found']} 404, {entry['server_errors']} 5xx, "
+              f"{entry['bytes_out'] / 1024:.0f}KB out, cache {cache}")
+        latency, client = entry["latency"], entry.get("client")
+        if latency:
+            line = f"  server mean {latency['mean_ms']:.1f}ms, p50 ≈{latency['p50_ms']:.1f}ms, p95 ≈{latency['p95_ms']:.1f}ms"
+            if client:
+                line += f" | client p50 {client['p50_ms']:.1f}ms ({client['p50_ms'] - latency['p50_ms']:+.1f}ms outside the handler)"
+            print(line)
+    if server["file_read"]:
+        print(f"PDF disk reads: {server['file_read']['count']}, mean {server['file_read']['mean_ms']:.1f}ms")
+
+def print_server_timing(report, slowest=3):
+    """Server time vs outside (network, routing) vs transfer per route, and the slowest requests by ID"""
+    summary = report.server_timing()
+    if not summary:
+        return
+    print("\n" + "=" * 60)
+    print("⏱️  SERVER-TIMING BREAKDOWN (p50 per route, ms)")
+    print("=" * 60)
+    print(f"{'Route':<50}{'n':>5}{'server':>9}{'outside':>9}{'transfer':>10}  phases")
+    for key, entry in summary.items():
+        phases = ", ".join(f"{name} {value:.2f}" for name, value in entry["phases_p50_ms"].items())
+        print(f"{key:<50}{entry['count']:>5}{entry['server_p50_ms']:>9.2f}{entry['outside_p50_ms']:>9.2f}"
+              f"{entry['transfer_p50_ms']:>10.2f}  {phases}")
+
+    timed = [record for record in report.requests if server_timing.breakdown(record)]
+    if timed:
+        print("Slowest requests:")
+        for record in sorted(timed, key=lambda record: record["elapsed"], reverse=True)[:slowest]:
+            print(f"  {endpoint_key(record)} {record['elapsed'] * 1000:.1f}ms: "
+                  f"{server_timing.describe(server_timing.breakdown(record))}")
+
+def finish_report(report, args, success):
+    """Write the requested outputs, apply the baseline gate and return the final status"""
+    print_server_timing(report)
+    if report.collect_server_metrics():
+        print_server_metrics(report.server)
+
+    thresholds = {}
+    if getattr(args, "latency_threshold", None):
+        thresholds["latency_ratio"] = args.latency_threshold
+    if getattr(args, "size_threshold", None):
+        thresholds["size_ratio"] = args.size_threshold
+
+    if getattr(args, "baseline", None):
+        regressions = report.compare_baseline(args.baseline, thresholds)
+        report.regressions = regressions
+        if regressions:
+            print(f"\n📉 PERFORMANCE REGRESSIONS vs {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            success = False
+        else:
+            print(f"\n📈 No regression against baseline {args.baseline}")
+
+    if getattr(args, "write_baseline", None):
+        report.write_baseline(args.write_baseline, {**DEFAULT_THRESHOLDS, **thresholds})
+        print(f"💾 Baseline written to {args.write_baseline}")
+    if getattr(args, "json", None):
+        report.write_json(args.json)
+        print(f"💾 JSON report written to {args.json}")
+    if getattr(args, "junit", None):
+        report.write_junit(args.junit)
+        print(f"💾 JUnit report written to {args.junit}")
+
+    return success
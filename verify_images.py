@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Optimized Image Verification for public/images/procedures
+Checks that every optimized_* image referenced from src/ exists on disk, that
+the responsive set listed in src/lib/optimized-images.json (written by
+optimize-images.js) is complete and current, reports the bytes saved, and can
+time a full or incremental run of the build
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+PUBLIC_DIR = os.path.join(ROOT_DIR, "public")
+IMAGES_DIR = os.path.join(PUBLIC_DIR, "images", "procedures")
+MANIFEST_PATH = os.path.join(SRC_DIR, "lib", "optimized-images.json")
+
+# /images/procedures/optimized_kali_image.webp in JSX, CSS or data files
+REFERENCE_PATTERN = re.compile(r"""/images/procedures/optimized_[^"'`\s)]+""")
+
+SOURCE_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".css", ".json")
+
+def find_references():
+    """Map every referenced optimized_* path to the source files using it"""
+    references = {}
+    for directory, _, files in os.walk(SRC_DIR):
+        for name in files:
+            if not name.endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(directory, name)
+            with open(path, encoding="utf-8") as f:
+                for match in REFERENCE_PATTERN.findall(f.read()):
+                    references.setdefault(match, set()).add(os.path.relpath(path, ROOT_DIR))
+    return references
+
+def check_references(references):
+    """Referenced paths missing from public/"""
+    return {
+        reference: sorted(files)
+        for reference, files in sorted(references.items())
+        if not os.path.exists(os.path.join(PUBLIC_DIR, reference.lstrip("/")))
+    }
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"images": {}}
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def check_manifest(manifest):
+    """Compare the manifest with the files on disk, returning (issues, savings)"""
+    issues = []
+    savings = {"source_bytes": 0, "legacy_bytes": 0, "variants": {}}
+
+    sources = sorted(f for f in os.listdir(IMAGES_DIR) if re.search(r"\.(jpe?g|png)$", f, re.I))
+    for source in sources:
+        entry = manifest["images"].get(source)
+        if entry is None:
+            issues.append(f"{source}: not in the manifest (run `npm run optimize:images`)")
+            continue
+        if entry["sourceHash"] != file_sha256(os.path.join(IMAGES_DIR, source)):
+            issues.append(f"{source}: changed since the last build")
+
+        outputs = [entry["legacy"]] + [variant["file"] for variant in entry["variants"]]
+        missing = [output for output in outputs if not os.path.exists(os.path.join(IMAGES_DIR, output))]
+        if missing:
+            issues.append(f"{source}: missing {', '.join(missing)}")
+            continue
+
+        savings["source_bytes"] += entry["sourceBytes"]
+        savings["legacy_bytes"] += entry["legacyBytes"]
+        for variant in entry["variants"]:
+            key = f"{variant['format']}-{variant['width']}"
+            savings["variants"][key] = savings["variants"].get(key, 0) + variant["bytes"]
+
+    for source in sorted(set(manifest["images"]) - set(sources)):
+        issues.append(f"{source}: in the manifest but no longer in {os.path.relpath(IMAGES_DIR, ROOT_DIR)}")
+
+    return issues, savings
+
+def run_build(force):
+    """Run optimize-images.js and time it, returning (success, seconds)"""
+    command = ["node", "optimize-images.js"] + (["--force"] if force else [])
+    print(f"🔨 {' '.join(command)}")
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True)
+    except FileNotFoundError:
+        print("❌ node not found")
+        return False, 0.0
+    elapsed = time.perf_counter() - start
+
+    output = (result.stdout + result.stderr).strip()
+    if "Cannot find module 'sharp'" in output:
+        print("❌ sharp is not installed: run `npm install` first")
+        return False, elapsed
+    for line in output.splitlines():
+        if line.startswith(("🎯", "❌")):
+            print(f"   {line}")
+    return result.returncode == 0, elapsed
+
+def print_savings(savings):
+    source = savings["source_bytes"]
+    if not source:
+        print("📊 No optimized images in the manifest yet")
+        return
+    legacy = savings["legacy_bytes"]
+    print(f"📊 Originals {source / 1024:.0f}KB → optimized_*.webp {legacy / 1024:.0f}KB "
+          f"({(1 - legacy / source) * 100:.1f}% saved, {(source - legacy) / 1024:.0f}KB)")
+    for key, size in sorted(savings["variants"].items(), key=lambda item: (item[0].split("-")[0], int(item[0].split("-")[1]))):
+        print(f"   {key:<12}{size / 1024:>8.0f}KB ({(1 - size / source) * 100:.1f}% saved)")
+
+def main():
+    """Main verification function"""
+    parser = argparse.ArgumentParser(description="Verify the optimized procedure images")
+    parser.add_argument("--build", action="store_true", help="run optimize-images.js first and time it")
+    parser.add_argument("--force", action="store_true", help="with --build, re-encode every image (cold build)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    args = parser.parse_args()
+
+    print("🖼️  Optimized Image Verification")
+    print("=" * 60)
+
+    results = {}
+    if args.build:
+        success, elapsed = run_build(args.force)
+        results["build"] = {"success": success, "seconds": elapsed, "force": args.force}
+        print(f"⏱️  Build {'(cold) ' if args.force else ''}took {elapsed:.1f}s\n")
+        if not success:
+            print("❌ Build failed")
+
+    references = find_references()
+    missing_references = check_references(references)
+    print(f"🔗 {len(references)} optimized_* references in src/")
+    for reference, files in missing_references.items():
+        print(f"   ❌ {reference} (used in {', '.join(files)})")
+
+    issues, savings = check_manifest(load_manifest())
+    print(f"📇 Manifest: {os.path.relpath(MANIFEST_PATH, ROOT_DIR)}")
+    for issue in issues:
+        print(f"   ⚠️  {issue}")
+    print_savings(savings)
+
+    results.update({
+        "references": len(references),
+        "missing_references": missing_references,
+        "manifest_issues": issues,
+        "savings": savings,
+    })
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 JSON report written to {args.json}")
+
+    # A stale manifest only means the responsive set needs a rebuild; a broken reference breaks a page
+    success = not missing_references and results.get("build", {}).get("success", True)
+    print(f"\n🎯 IMAGES: {'✅ ALL REFERENCES RESOLVED' if success else '❌ FAILED'}")
+    return success
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)